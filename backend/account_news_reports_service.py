@@ -3,6 +3,7 @@ Account-specific news and reports service for querying designated MCP servers
 to find news/reports related to specific symbols in an account's holdings.
 """
 
+import asyncio
 import logging
 import json
 from typing import Dict, List, Any, Optional
@@ -12,6 +13,9 @@ from es_data_client import es_data_client
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight tool calls per account lookup
+MAX_CONCURRENT_SYMBOL_LOOKUPS = 8
+
 
 class AccountNewsReportsService:
     """Service for fetching news and reports for account symbols from designated MCP servers"""
@@ -116,10 +120,10 @@ class AccountNewsReportsService:
     
     async def _get_articles_for_symbols(self, server_id: str, server, symbols: List[str], time_period: int, time_unit: str) -> List[Dict[str, Any]]:
         """Get news and reports for a list of symbols from a specific MCP server"""
-        all_articles = []
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SYMBOL_LOOKUPS)
         
-        for symbol in symbols:
-            try:
+        async def lookup(symbol: str) -> List[Dict[str, Any]]:
+            async with semaphore:
                 self.logger.info(f"Calling news_and_report_lookup_with_symbol_detail for symbol {symbol} on server {server_id}")
                 
                 # Prepare arguments for the tool
@@ -128,13 +132,17 @@ class AccountNewsReportsService:
                     "symbol": symbol
                 }
                 
-                articles = await self._execute_tool_for_symbol(server_id, symbol, arguments)
-                if articles:
-                    all_articles.extend(articles)
-                    
-            except Exception as e:
-                self.logger.warning(f"Error getting articles for symbol {symbol}: {e}")
+                return await self._execute_tool_for_symbol(server_id, symbol, arguments)
+        
+        # Look up all symbols concurrently; gather keeps results in holding order
+        results = await asyncio.gather(*(lookup(symbol) for symbol in symbols), return_exceptions=True)
+        
+        all_articles = []
+        for symbol, articles in zip(symbols, results):
+            if isinstance(articles, Exception):
+                self.logger.warning(f"Error getting articles for symbol {symbol}: {articles}")
                 continue
+            all_articles.extend(articles)
         
         # Sort by relevance/date and remove duplicates
         return self._deduplicate_articles(all_articles)
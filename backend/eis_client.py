@@ -1,18 +1,40 @@
 import os
-import json
+import logging
+import orjson
 import aiohttp
 import asyncio
-import traceback
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Azure OpenAI Configuration
 AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
 AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT")
 AZURE_API_VERSION = os.getenv("AZURE_API_VERSION")
 
+# One session (and connection pool) reused for every Azure OpenAI call, so
+# requests after the first skip the TCP and TLS handshakes
+_session: Optional[aiohttp.ClientSession] = None
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the shared Azure OpenAI HTTP session, creating it on first use"""
+    global _session
+    if _session is None or _session.closed:
+        timeout = aiohttp.ClientTimeout(total=300)  # 5 minute timeout
+        _session = aiohttp.ClientSession(timeout=timeout)
+    return _session
+
+async def close_session():
+    """Close the shared Azure OpenAI HTTP session"""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
 async def get_chat_response_stream(prompt: str, dynamic_tools: list = None):
     """
     A unified function to handle streaming responses that could be text or tool calls.
@@ -33,11 +55,24 @@ async def get_chat_response_stream(prompt: str, dynamic_tools: list = None):
     async for result in _make_openai_request(request_body):
         yield result
 
-async def get_chat_response_stream_with_messages(messages: list, dynamic_tools: list = None):
+# Static parts of a chat request body around the per-turn messages and pre-serialized tools
+_BODY_PREFIX = b'{"messages":'
+_BODY_OPTIONS = b',"stream":true,"temperature":0.7,"max_tokens":2000'
+_BODY_TOOLS = b',"tools":'
+_BODY_SUFFIX = b',"tool_choice":"auto"}'
+
+async def get_chat_response_stream_with_messages(messages: list, dynamic_tools: list = None, tools_json: bytes = None):
     """
     A unified function to handle streaming responses with full conversation history.
     This makes a call to Azure OpenAI with a messages array and dynamic list of tools.
+    tools_json, if given, is the already-serialized tools array and is spliced into the body as-is.
     """
+    if tools_json:
+        body = b"".join([_BODY_PREFIX, orjson.dumps(messages), _BODY_OPTIONS, _BODY_TOOLS, tools_json, _BODY_SUFFIX])
+        async for result in _make_openai_request(body):
+            yield result
+        return
+    
     request_body = {
         "messages": messages,
         "stream": True,
@@ -53,9 +88,39 @@ async def get_chat_response_stream_with_messages(messages: list, dynamic_tools:
     async for result in _make_openai_request(request_body):
         yield result
 
-async def _make_openai_request(request_body: dict):
+async def _iter_sse_events(chunks):
+    """
+    Parse a server-sent events byte stream, yielding each decoded `data:` payload.
+    Stops at the [DONE] sentinel; payloads that are not valid JSON are reported and skipped.
+    """
+    # Append chunks in place and consume complete lines from the front, so each byte is scanned once
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        start = 0
+        while (end := buffer.find(b"\n", start)) >= 0:
+            line = bytes(buffer[start:end]).strip()
+            start = end + 1
+            if not line.startswith(b"data: "):
+                continue
+            data_str = line[len(b"data: "):].strip()
+            if data_str == b"[DONE]":
+                logger.debug("Azure OpenAI stream completed")
+                return
+            if not data_str:  # Skip empty data lines
+                continue
+            try:
+                parsed_data = orjson.loads(data_str)
+            except orjson.JSONDecodeError as json_err:
+                logger.warning(f"Skipping undecodable SSE payload: {json_err} for data: {data_str[:200]!r}")
+                continue
+            yield parsed_data
+        del buffer[:start]
+
+async def _make_openai_request(request_body):
     """
     Shared function to make Azure OpenAI API requests with streaming.
+    request_body is either a dict or an already-serialized JSON body.
     """
     # Construct Azure OpenAI URL
     full_url = f"{AZURE_OPENAI_ENDPOINT}/openai/deployments/{AZURE_OPENAI_DEPLOYMENT}/chat/completions?api-version={AZURE_API_VERSION}"
@@ -66,61 +131,43 @@ async def _make_openai_request(request_body: dict):
     }
 
     try:
-        # Create session with timeout
-        timeout = aiohttp.ClientTimeout(total=300)  # 5 minute timeout
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            print(f"--- CALLING AZURE OPENAI API ---: {full_url}")
-            print(f"--- REQUEST BODY ---: {json.dumps(request_body, indent=2)}")
+        session = _get_session()
+        logger.debug(f"Calling Azure OpenAI API: {full_url}")
+        if not isinstance(request_body, bytes):
+            request_body = orjson.dumps(request_body)
+        logger.debug(f"Request body: {len(request_body)} bytes")
+        
+        async with session.post(url=full_url, headers=headers, data=request_body) as response:
+            logger.debug(f"Azure OpenAI response status: {response.status}")
             
-            async with session.post(url=full_url, headers=headers, json=request_body) as response:
-                print(f"--- RESPONSE STATUS ---: {response.status}")
-                print(f"--- RESPONSE HEADERS ---: {dict(response.headers)}")
-                
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"--- ERROR RESPONSE ---: {error_text}")
-                    yield {"error": f"Azure OpenAI API error {response.status}: {error_text}"}
-                    return
-                
-                response.raise_for_status()
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Azure OpenAI API error {response.status}: {error_text}")
+                yield {"error": f"Azure OpenAI API error {response.status}: {error_text}"}
+                return
+            
+            response.raise_for_status()
 
-                buffer = b""
-                async for chunk in response.content.iter_chunked(1024):
-                    buffer += chunk
-                    while b"\n" in buffer:
-                        line, buffer = buffer.split(b"\n", 1)
-                        line = line.strip()
-                        if line.startswith(b"data: "):
-                            data_str = line[len(b"data: "):].strip()
-                            if data_str == b"[DONE]":
-                                print("--- STREAM COMPLETED ---")
-                                return
-                            if data_str:  # Skip empty data lines
-                                try:
-                                    parsed_data = json.loads(data_str)
-                                    # Log content and tool calls
-                                    choices = parsed_data.get("choices", [])
-                                    if choices:
-                                        delta = choices[0].get("delta", {})
-                                        content = delta.get("content")
-                                        tool_calls = delta.get("tool_calls")
-                                        
-                                        if content:
-                                            print(f"--- BACKEND PARSED CONTENT ---: '{content}'")
-                                        if tool_calls:
-                                            print(f"--- BACKEND PARSED TOOL CALLS ---: {tool_calls}")
-                                    
-                                    yield parsed_data
-                                except json.JSONDecodeError as json_err:
-                                    print(f"--- JSON DECODE ERROR ---: {json_err} for data: {data_str}")
-                                    continue
+            debug = logger.isEnabledFor(logging.DEBUG)
+            async for parsed_data in _iter_sse_events(response.content.iter_chunked(1024)):
+                # Per-token logging is debug-only; skip the lookups entirely otherwise
+                choices = parsed_data.get("choices", []) if debug else None
+                if choices:
+                    delta = choices[0].get("delta", {})
+                    content = delta.get("content")
+                    tool_calls = delta.get("tool_calls")
+                    
+                    if content:
+                        logger.debug(f"Parsed content: {content!r}")
+                    if tool_calls:
+                        logger.debug(f"Parsed tool calls: {tool_calls}")
+                
+                yield parsed_data
     except aiohttp.ClientError as e:
-        print(f"--- AIOHTTP CLIENT ERROR ---: {e}")
-        traceback.print_exc()
+        logger.error(f"Azure OpenAI connection error: {e}", exc_info=True)
         yield {"error": f"Connection error: {e}"}
     except Exception as e:
-        print(f"--- UNEXPECTED ERROR ---: {e}")
-        traceback.print_exc()
+        logger.error(f"Unexpected error calling Azure OpenAI: {e}", exc_info=True)
         yield {"error": "Sorry, an error occurred while processing your request."}
 
 async def perform_semantic_search(query: str, index: str, field_with_semantic_text: str):
@@ -5,8 +5,8 @@ This is separate from MCP and provides direct ES access for the financial analys
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
-from elasticsearch import AsyncElasticsearch
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from elasticsearch import AsyncElasticsearch, NotFoundError
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +14,42 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 
+# Fields read from account and holding documents; everything else is left out of responses
+_ACCOUNT_FIELDS = ["account_holder_name", "state", "account_type", "risk_profile", "total_portfolio_value"]
+_POSITION_FIELDS = ["quantity", "purchase_price", "current_price"]
+
+
+def _position_details(account_id: str, symbol: str, holding: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive cost, value and unrealized P&L for a holding document"""
+    quantity = holding.get("quantity", 0)
+    purchase_price = holding.get("purchase_price", 0)
+    current_price = holding.get("current_price", purchase_price)  # Fallback to purchase price if no current price
+    
+    total_cost = quantity * purchase_price
+    current_value = quantity * current_price
+    unrealized_pnl = current_value - total_cost
+    unrealized_pnl_pct = (unrealized_pnl / total_cost * 100) if total_cost > 0 else 0
+    
+    return {
+        "account_id": account_id,
+        "symbol": symbol,
+        "quantity": quantity,
+        "purchase_price": purchase_price,
+        "current_price": current_price,
+        "total_cost": total_cost,
+        "current_value": current_value,
+        "unrealized_pnl": unrealized_pnl,
+        "unrealized_pnl_pct": unrealized_pnl_pct
+    }
+
+
+def _recent_query(date_field: str, since_days: Optional[int]) -> Dict[str, Any]:
+    """Filter-context query for documents from the last since_days days, or all documents when None"""
+    if since_days is None:
+        return {"match_all": {}}
+    return {"constant_score": {"filter": {"range": {date_field: {"gte": f"now-{since_days}d/d"}}}}}
+
+
 class ESDataClient:
     """Elasticsearch client for dashboard data access"""
     
@@ -84,7 +120,8 @@ class ESDataClient:
             # Get account basic info
             account_response = await self.client.get(
                 index="financial_accounts",
-                id=account_id
+                id=account_id,
+                source_includes=_ACCOUNT_FIELDS
             )
             account_data = account_response["_source"]
             
@@ -92,7 +129,8 @@ class ESDataClient:
             holdings_response = await self.client.search(
                 index="financial_holdings",
                 body={
-                    "query": {"term": {"account_id": account_id}},
+                    "query": {"constant_score": {"filter": {"term": {"account_id": account_id}}}},
+                    "_source": ["symbol", "quantity", "purchase_price"],
                     "size": 100
                 }
             )
@@ -106,7 +144,8 @@ class ESDataClient:
                 news_response = await self.client.search(
                     index="financial_news",
                     body={
-                        "query": {"terms": {"symbol": symbols}},
+                        "query": {"constant_score": {"filter": {"terms": {"symbol": symbols}}}},
+                        "_source": ["id", "title", "symbol", "published_date"],
                         "size": 10,
                         "sort": [{"published_date": {"order": "desc"}}]
                     }
@@ -149,12 +188,12 @@ class ESDataClient:
             logger.error(f"Error fetching account {account_id}: {e}")
             return None
     
-    async def get_all_accounts(self) -> List[Dict[str, Any]]:
-        """Get all accounts for listing/selection"""
+    async def get_all_accounts(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Get up to limit accounts for listing/selection"""
         try:
             response = await self.client.search(
                 index="financial_accounts",
-                body={"query": {"match_all": {}}, "size": 1000}
+                body={"query": {"match_all": {}}, "size": limit}
             )
             
             return [
@@ -172,7 +211,7 @@ class ESDataClient:
             return []
     
     async def get_article_content(self, article_id: str) -> Optional[str]:
-        """Get news article content"""
+        """Get news article content, or None if the article doesn't exist (other ES errors are raised)"""
         try:
             response = await self.client.get(
                 index="financial_news",
@@ -180,12 +219,14 @@ class ESDataClient:
             )
             return response["_source"].get("content", "Content not available")
             
+        except NotFoundError:
+            return None
         except Exception as e:
             logger.error(f"Error fetching article {article_id}: {e}")
-            return None
+            raise
     
     async def get_report_content(self, report_id: str) -> Optional[str]:
-        """Get financial report content"""
+        """Get financial report content, or None if the report doesn't exist (other ES errors are raised)"""
         try:
             response = await self.client.get(
                 index="financial_reports",
@@ -193,18 +234,20 @@ class ESDataClient:
             )
             return response["_source"].get("content", "Content not available")
             
+        except NotFoundError:
+            return None
         except Exception as e:
             logger.error(f"Error fetching report {report_id}: {e}")
-            return None
+            raise
     
-    async def get_all_news(self) -> List[Dict[str, Any]]:
-        """Get all news articles for the news list page"""
+    async def get_all_news(self, limit: int = 1000, since_days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the newest news articles for the news list page, optionally only from the last since_days days"""
         try:
             response = await self.client.search(
                 index="financial_news",
                 body={
-                    "query": {"match_all": {}}, 
-                    "size": 1000,
+                    "query": _recent_query("published_date", since_days), 
+                    "size": limit,
                     "sort": [{"published_date": {"order": "desc"}}]
                 }
             )
@@ -228,15 +271,15 @@ class ESDataClient:
             logger.error(f"Error fetching all news: {e}")
             return []
     
-    async def get_all_reports(self) -> List[Dict[str, Any]]:
-        """Get all reports for the reports list page"""
+    async def get_all_reports(self, limit: int = 1000, since_days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the newest reports for the reports list page, optionally only from the last since_days days"""
         try:
             logger.info("🔍 ES Client: Searching financial_reports index")
             response = await self.client.search(
                 index="financial_reports",
                 body={
-                    "query": {"match_all": {}}, 
-                    "size": 1000,
+                    "query": _recent_query("report_date", since_days), 
+                    "size": limit,
                     "sort": [{"report_date": {"order": "desc"}}]
                 }
             )
@@ -270,45 +313,64 @@ class ESDataClient:
                 body={
                     "query": {
                         "bool": {
-                            "must": [
+                            "filter": [
                                 {"term": {"account_id": account_id}},
                                 {"term": {"symbol": symbol}}
                             ]
                         }
                     },
+                    "_source": _POSITION_FIELDS,
                     "size": 1
                 }
             )
             
             if not response["hits"]["hits"]:
                 return None
-                
-            holding = response["hits"]["hits"][0]["_source"]
-            quantity = holding.get("quantity", 0)
-            purchase_price = holding.get("purchase_price", 0)
-            current_price = holding.get("current_price", purchase_price)  # Fallback to purchase price if no current price
             
-            total_cost = quantity * purchase_price
-            current_value = quantity * current_price
-            unrealized_pnl = current_value - total_cost
-            unrealized_pnl_pct = (unrealized_pnl / total_cost * 100) if total_cost > 0 else 0
-            
-            return {
-                "account_id": account_id,
-                "symbol": symbol,
-                "quantity": quantity,
-                "purchase_price": purchase_price,
-                "current_price": current_price,
-                "total_cost": total_cost,
-                "current_value": current_value,
-                "unrealized_pnl": unrealized_pnl,
-                "unrealized_pnl_pct": unrealized_pnl_pct
-            }
+            return _position_details(account_id, symbol, response["hits"]["hits"][0]["_source"])
             
         except Exception as e:
             logger.error(f"Error fetching position details for {account_id}/{symbol}: {e}")
             return None
     
+    async def get_position_details_bulk(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Get position details for many (account_id, symbol) pairs in a single multi-search request"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        
+        searches = []
+        for account_id, symbol in keys:
+            searches.append({"index": "financial_holdings"})
+            searches.append({
+                "query": {
+                    "bool": {
+                        "filter": [
+                            {"term": {"account_id": account_id}},
+                            {"term": {"symbol": symbol}}
+                        ]
+                    }
+                },
+                "_source": _POSITION_FIELDS,
+                "size": 1
+            })
+        
+        try:
+            response = await self.client.msearch(body=searches)
+        except Exception as e:
+            logger.error(f"Error fetching position details for {len(keys)} positions: {e}")
+            return {}
+        
+        # Responses come back in request order; failed or empty searches are simply left out
+        details = {}
+        for (account_id, symbol), result in zip(keys, response["responses"]):
+            hits = result.get("hits", {}).get("hits")
+            if hits:
+                details[(account_id, symbol)] = _position_details(account_id, symbol, hits[0]["_source"])
+            elif "error" in result:
+                logger.error(f"Error fetching position details for {account_id}/{symbol}: {result['error']}")
+        return details
+    
     async def close(self):
         """Close the ES client connection"""
         if self.client:
@@ -2,19 +2,23 @@ import os
 import logging
 import json
 import asyncio
+import inspect
 import time
-from typing import List, Dict, Any, Optional
+import uuid
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Literal
 import httpx
+import orjson
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 from otel_config import setup_telemetry
-from eis_client import get_chat_response_stream, get_chat_response_stream_with_messages
-from mcp_client import mcp_manager, MCPServer, MCPTransportType, MCPClientError, MCPConnectionError, MCPToolExecutionError
+from eis_client import get_chat_response_stream, get_chat_response_stream_with_messages, close_session as close_eis_session
+from mcp_client import mcp_manager, mcp_comms_logger, MCPServer, MCPTransportType, MCPClientError, MCPConnectionError, MCPToolExecutionError
 from mcp_config import config_manager
 from conversation_manager import conversation_manager
 from es_data_client import es_data_client
@@ -23,19 +27,24 @@ from negative_news_alerts_service import negative_news_alerts_service
 from account_news_reports_service import account_news_reports_service
 from action_item_service import action_item_service
 from email_generation_service import email_generation_service
+from response_cache import response_cache, cached, DocumentNotFound
 
-# Simple logging status management
-LOG_MCP_COMMUNICATIONS = os.getenv("LOG_MCP_COMMUNICATIONS", "false").lower() == "true"
+# Simple logging status management, backed by the mcp_comms logger level
+_cached_logging_status = None
 
 def get_logging_status():
     """Returns the current MCP logging status."""
-    return {"enabled": LOG_MCP_COMMUNICATIONS}
+    global _cached_logging_status
+    if _cached_logging_status is None:
+        _cached_logging_status = {"enabled": mcp_comms_logger.isEnabledFor(logging.DEBUG)}
+    return _cached_logging_status
 
 def update_logging_status(status: bool):
     """Updates the MCP logging status."""
-    global LOG_MCP_COMMUNICATIONS
-    LOG_MCP_COMMUNICATIONS = status
-    return {"enabled": LOG_MCP_COMMUNICATIONS}
+    global _cached_logging_status
+    mcp_comms_logger.setLevel(logging.DEBUG if status else logging.WARNING)
+    _cached_logging_status = {"enabled": status}
+    return _cached_logging_status
 
 load_dotenv()
 
@@ -49,7 +58,56 @@ class EmailDraftRequest(BaseModel):
     time_period: Optional[int] = 48
     time_unit: Optional[str] = "hours"
 
+class TimeWindowParams(BaseModel):
+    time_period: int = Field(48, gt=0)
+    time_unit: Literal["minutes", "hours", "days"] = "hours"
+
+class ChatQuery(BaseModel):
+    query: str = ""
+    session_id: Optional[str] = None  # Optional session ID for conversation persistence
+
+class ArticleSummaryRequest(BaseModel):
+    article_content: str = ""
+    symbol: Optional[str] = ""
+    account_id: Optional[str] = ""
+
+class ServerConfigIn(BaseModel):
+    # Field names match MCPServer so a validated config can be splatted into it
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+    
+    id: str = Field(min_length=1)
+    name: str = "Unnamed Server"
+    url: Optional[str] = None
+    api_key: Optional[str] = Field(None, alias="apiKey")
+    transport: MCPTransportType = MCPTransportType.HTTP  # Validated at parse time (422 on unknown values)
+    conversation_field: Optional[str] = Field(None, alias="conversationField")
+    conversation_location: str = Field("response", alias="conversationLocation")
+    use_for_main_page: bool = Field(False, alias="useForMainPage")
+
+class LoggingStatus(BaseModel):
+    enabled: bool = False
+
+class ArticleSummaryItem(BaseModel):
+    article_content: str
+    symbol: str = ""
+
+# Larger batches are rejected with 422 by request validation
+MAX_BATCH_ARTICLES = int(os.getenv("MAX_BATCH_ARTICLES", "20"))
+# Upper bound on in-flight LLM summaries per batch request
+MAX_CONCURRENT_SUMMARIES = int(os.getenv("MAX_CONCURRENT_SUMMARIES", "4"))
+
+class ArticleSummaryBatchRequest(BaseModel):
+    account_id: str = ""
+    items: List[ArticleSummaryItem] = Field(max_length=MAX_BATCH_ARTICLES)
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson (fastapi.responses.ORJSONResponse is deprecated)"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 app = FastAPI(
+    default_response_class=OrjsonResponse,
     title="Portfolio-Pilot-AI",
     description="An AI-powered insights dashboard for financial analysts.",
     version="1.0.0",
@@ -63,16 +121,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# --- In-memory store ---
-impact_summary_global = "No analysis performed yet."
+# Distinguishes config versions across process restarts in ETags
+CONFIG_BOOT_ID = uuid.uuid4().hex[:8]
 
-def get_all_tool_definitions() -> List[Dict[str, Any]]:
-    """Gathers all enabled tool definitions from MCP servers."""
-    all_defs = []
+# --- Shared state ---
+# The impact summary is persistent response-cache state (Redis when configured) so
+# every worker sees the same value and cached articles never evict it; reads are
+# cached per worker for 1s.
+IMPACT_SUMMARY_KEY = "pp:impact_summary"
+IMPACT_SUMMARY_DEFAULT = "No analysis performed yet."
+IMPACT_SUMMARY_LOCAL_TTL = 1.0
+_impact_summary_local = (0.0, IMPACT_SUMMARY_DEFAULT)
+
+async def get_impact_summary() -> str:
+    """Get the current impact summary."""
+    global _impact_summary_local
+    expires_at, summary = _impact_summary_local
+    if expires_at > time.monotonic():
+        return summary
     
-    # Get all enabled MCP servers and their tools
+    value = await response_cache.get_persistent(IMPACT_SUMMARY_KEY)
+    summary = value.decode() if value is not None else IMPACT_SUMMARY_DEFAULT
+    _impact_summary_local = (time.monotonic() + IMPACT_SUMMARY_LOCAL_TTL, summary)
+    return summary
+
+async def set_impact_summary(summary: str) -> None:
+    """Store the impact summary for all workers."""
+    global _impact_summary_local
+    await response_cache.set_persistent(IMPACT_SUMMARY_KEY, summary.encode())
+    _impact_summary_local = (time.monotonic() + IMPACT_SUMMARY_LOCAL_TTL, summary)
+
+# Tool definitions and their serialized JSON, rebuilt only when the enabled-server mapping changes
+_tool_definitions_cache = (None, (), None)
+
+def _refresh_tool_definitions():
+    """Rebuild the cached tool definitions if the enabled servers changed."""
+    global _tool_definitions_cache
     enabled_servers = config_manager.get_enabled_servers()
+    if _tool_definitions_cache[0] is enabled_servers:
+        return _tool_definitions_cache
     
+    all_defs = []
     for server_id, server in enabled_servers.items():
         logger.debug(f"Processing tools for server {server_id}: {server.name}")
         
@@ -88,7 +177,16 @@ def get_all_tool_definitions() -> List[Dict[str, Any]]:
             })
     
     logger.info(f"Collected {len(all_defs)} tool definitions from {len(enabled_servers)} MCP servers")
-    return all_defs
+    _tool_definitions_cache = (enabled_servers, tuple(all_defs), orjson.dumps(all_defs) if all_defs else None)
+    return _tool_definitions_cache
+
+def get_all_tool_definitions() -> List[Dict[str, Any]]:
+    """Gathers all enabled tool definitions from MCP servers."""
+    return list(_refresh_tool_definitions()[1])
+
+def get_all_tool_definitions_json() -> Optional[bytes]:
+    """Returns all enabled tool definitions as a pre-serialized JSON array, or None if there are none."""
+    return _refresh_tool_definitions()[2]
 
 
 @app.on_event("startup")
@@ -96,25 +194,35 @@ async def startup_event():
     """Initialize MCP servers on startup"""
     logger.info("Starting Portfolio-Pilot-AI with MCP client manager")
     
+    try:
+        await response_cache.connect()
+    except Exception as e:
+        logger.error(f"Failed to connect response cache, continuing without Redis: {e}")
+        response_cache.redis = None
+    app.state.response_cache = response_cache
+    
     try:
         # Load all configured servers
         all_servers = config_manager.get_all_servers()
         logger.info(f"Found {len(all_servers)} configured MCP servers")
         
-        # Initialize enabled servers in the manager
-        for server_id, server in all_servers.items():
-            if server.enabled:
-                try:
-                    logger.info(f"Initializing MCP server: {server_id} ({server.name})")
-                    await mcp_manager.add_server(server)
-                    logger.info(f"Successfully initialized server: {server_id}")
-                except Exception as e:
-                    logger.error(f"Failed to initialize server {server_id}: {e}")
-                    # Mark server as error status in config
-                    server.connection_status = "error"
-                    config_manager.update_server(server)
+        # Initialize enabled servers in the manager concurrently
+        enabled_servers = [server for server in all_servers.values() if server.enabled]
+        logger.info(f"Initializing {len(enabled_servers)} enabled MCP servers: {[server.id for server in enabled_servers]}")
+        errors = await mcp_manager.add_servers(enabled_servers)
+        
+        failed_servers = []
+        for server in enabled_servers:
+            if server.id in errors:
+                logger.error(f"Failed to initialize server {server.id}: {errors[server.id]}")
+                # Mark server as error status in config
+                server.connection_status = "error"
+                failed_servers.append(server)
             else:
-                logger.debug(f"Skipping disabled server: {server_id}")
+                logger.info(f"Successfully initialized server: {server.id}")
+        
+        # Persist all error statuses with a single config write
+        config_manager.add_servers(failed_servers)
         
         logger.info("MCP client manager initialization complete")
         
@@ -128,13 +236,18 @@ async def shutdown_event():
     logger.info("Shutting down application")
     
     try:
-        # Disconnect all MCP clients
-        for server_id in list(mcp_manager.clients.keys()):
-            await mcp_manager.remove_server(server_id)
+        # Disconnect all MCP clients and close their shared connection pool
+        await mcp_manager.close()
         
         # Close ES data client
         await es_data_client.close()
         
+        # Close the shared Azure OpenAI session
+        await close_eis_session()
+        
+        # Close response cache
+        await response_cache.close()
+        
         logger.info("Application shutdown complete")
         
     except Exception as e:
@@ -143,23 +256,33 @@ async def shutdown_event():
 
 # --- API endpoints ---
 @app.get("/metrics/overview")
-async def get_metrics_overview(include_news: bool = False, include_reports: bool = False):
-    """Get overview metrics for the financial dashboard"""
+async def get_metrics_overview(include_news: bool = False, include_reports: bool = False, nowait: bool = False):
+    """
+    Get overview metrics for the financial dashboard.
+    With nowait=true, uncached news/reports summaries come back as
+    {"status": "pending", "job_id": ...} to poll via /metrics/overview/jobs/{job_id}.
+    """
     try:
         # Get base metrics from ES
         metrics = await es_data_client.get_metrics_overview()
-        metrics["impact_summary"] = impact_summary_global
+        metrics["impact_summary"] = await get_impact_summary()
         
         # Only include news summary if requested (e.g., after "Start Day" is clicked)
         if include_news:
-            news_summary = await main_page_data_service.get_news_summary()
+            if nowait:
+                news_summary = await main_page_data_service.get_summary_or_job("news")
+            else:
+                news_summary = await main_page_data_service.get_news_summary()
             metrics["news_summary"] = news_summary
         else:
             metrics["news_summary"] = None
         
         # Only include reports summary if requested
         if include_reports:
-            reports_summary = await main_page_data_service.get_reports_summary()
+            if nowait:
+                reports_summary = await main_page_data_service.get_summary_or_job("reports")
+            else:
+                reports_summary = await main_page_data_service.get_reports_summary()
             metrics["reports_summary"] = reports_summary
         else:
             metrics["reports_summary"] = None
@@ -172,7 +295,7 @@ async def get_metrics_overview(include_news: bool = False, include_reports: bool
             "total_aum": 0,
             "total_news": 0,
             "total_reports": 0,
-            "impact_summary": impact_summary_global,
+            "impact_summary": IMPACT_SUMMARY_DEFAULT,
             "news_summary": {
                 "status": "error",
                 "message": "Error loading news summary",
@@ -185,6 +308,14 @@ async def get_metrics_overview(include_news: bool = False, include_reports: bool
             } if include_reports else None
         }
 
+@app.get("/metrics/overview/jobs/{job_id}")
+async def get_metrics_summary_job(job_id: str):
+    """Poll a background news/reports summary refresh started with nowait=true"""
+    result = main_page_data_service.get_job(job_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return result
+
 @app.get("/account/{account_id}")
 async def get_account_details(account_id: str):
     """Get detailed account information for the drilldown page"""
@@ -214,9 +345,8 @@ async def get_account_news_reports(account_id: str, time_period: int = 72, time_
 async def start_day():
     """Trigger the daily analysis workflow"""
     try:
-        global impact_summary_global
         # This could trigger a more sophisticated analysis workflow
-        impact_summary_global = "Daily analysis completed - market conditions favorable, no significant alerts."
+        await set_impact_summary("Daily analysis completed - market conditions favorable, no significant alerts.")
         logger.info("Daily analysis workflow triggered")
         return {"status": "success", "message": "Daily analysis completed"}
     except Exception as e:
@@ -263,32 +393,39 @@ async def draft_email(request: EmailDraftRequest):
         raise HTTPException(status_code=500, detail="Error drafting email. Please try again.")
 
 @app.get("/article/{article_id}")
+@cached(key=lambda article_id: f"article:{article_id}", ttl=3600)
 async def get_article_content(article_id: str):
     """Get news article content"""
     try:
         content = await es_data_client.get_article_content(article_id)
-        if content:
-            return {"content": content}
-        else:
-            raise HTTPException(status_code=404, detail="Article not found")
+        if content is None:
+            raise DocumentNotFound("Article not found")
+        return {"content": content}
+    except HTTPException:
+        raise
     except Exception as e:
+        # Elasticsearch unreachable or failing; not a miss, so nothing is cached
         logger.error(f"Error fetching article {article_id}: {e}")
-        raise HTTPException(status_code=500, detail="Error fetching article")
+        raise HTTPException(status_code=502, detail="Error fetching article")
 
 @app.get("/report/{report_id}")
+@cached(key=lambda report_id: f"report:{report_id}", ttl=3600)
 async def get_report_content(report_id: str):
     """Get financial report content"""
     try:
         content = await es_data_client.get_report_content(report_id)
-        if content:
-            return {"content": content}
-        else:
-            raise HTTPException(status_code=404, detail="Report not found")
+        if content is None:
+            raise DocumentNotFound("Report not found")
+        return {"content": content}
+    except HTTPException:
+        raise
     except Exception as e:
+        # Elasticsearch unreachable or failing; not a miss, so nothing is cached
         logger.error(f"Error fetching report {report_id}: {e}")
-        raise HTTPException(status_code=500, detail="Error fetching report")
+        raise HTTPException(status_code=502, detail="Error fetching report")
 
 @app.get("/article/full/{document_id}")
+@cached(key=lambda document_id, index="financial_news": f"article_full:{index}:{document_id}", ttl=3600)
 async def get_full_article(document_id: str, index: str = "financial_news"):
     """Get full article/report content from ES using MCP server"""
     try:
@@ -322,9 +459,13 @@ async def get_full_article(document_id: str, index: str = "financial_news"):
                 if isinstance(content, dict) and "text" in content:
                     try:
                         data = json.loads(content["text"])
-                        logger.info(f"Retrieved full {content_type} data: {json.dumps(data, indent=2)}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("Retrieved full %s data: %s", content_type, orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
                         
                         # Extract the content from ES response
+                        if isinstance(data.get("result"), dict) and data["result"].get("found") is False:
+                            # Elasticsearch confirmed the id doesn't exist, so the miss can be cached
+                            raise DocumentNotFound(f"{content_type.title()} not found")
                         if "result" in data and "_source" in data["result"]:
                             source = data["result"]["_source"]
                             
@@ -351,7 +492,8 @@ async def get_full_article(document_id: str, index: str = "financial_news"):
                         raise HTTPException(status_code=500, detail=f"Error parsing {content_type} data")
             elif result["type"] == "error":
                 logger.error(f"Error retrieving {content_type} {document_id}: {result.get('error', 'Unknown error')}")
-                raise HTTPException(status_code=404, detail=f"{content_type.title()} not found")
+                # A tool error isn't a confirmed miss (the server or ES may be down), so report it uncached
+                raise HTTPException(status_code=502, detail=f"Error retrieving {content_type}")
         
         # If we get here, no valid result was returned
         raise HTTPException(status_code=404, detail=f"{content_type.title()} not found")
@@ -363,83 +505,108 @@ async def get_full_article(document_id: str, index: str = "financial_news"):
         raise HTTPException(status_code=500, detail="Error fetching article")
 
 @app.get("/accounts")
-async def get_all_accounts():
-    """Get all accounts for the accounts list page"""
+async def get_all_accounts(limit: int = 1000):
+    """Get accounts for the accounts list page"""
     try:
-        accounts = await es_data_client.get_all_accounts()
+        accounts = await es_data_client.get_all_accounts(limit)
         return {"accounts": accounts}
     except Exception as e:
         logger.error(f"Error fetching all accounts: {e}")
         raise HTTPException(status_code=500, detail="Error fetching accounts")
 
 @app.get("/news")
-async def get_all_news():
-    """Get all news articles for the news list page"""
+async def get_all_news(limit: int = 1000, since_days: Optional[int] = None):
+    """Get the newest news articles for the news list page"""
     try:
-        news = await es_data_client.get_all_news()
+        news = await es_data_client.get_all_news(limit, since_days)
         return {"news": news}
     except Exception as e:
         logger.error(f"Error fetching all news: {e}")
         raise HTTPException(status_code=500, detail="Error fetching news")
 
 @app.get("/reports")
-async def get_all_reports():
-    """Get all reports for the reports list page"""
+async def get_all_reports(limit: int = 1000, since_days: Optional[int] = None):
+    """Get the newest reports for the reports list page"""
     try:
-        logger.info("🔍 Backend: Starting to fetch all reports from ES")
-        reports = await es_data_client.get_all_reports()
-        logger.info(f"🔍 Backend: Found {len(reports)} reports")
-        if len(reports) > 0:
-            logger.info(f"🔍 Backend: Sample report fields: {list(reports[0].keys()) if reports else 'No reports'}")
+        reports = await es_data_client.get_all_reports(limit, since_days)
+        logger.debug(f"Found {len(reports)} reports")
         return {"reports": reports}
     except Exception as e:
-        logger.error(f"❌ Backend: Error fetching all reports: {e}", exc_info=True)
+        logger.error(f"Error fetching all reports: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error fetching reports")
 
 @app.get("/alerts/negative-news")
-async def get_negative_news_alerts(time_period: int = 48, time_unit: str = "hours"):
+async def get_negative_news_alerts(params: TimeWindowParams = Depends()):
     """Get negative news alerts for accounts with positions in negative sentiment news/reports"""
     try:
-        # Validate time_unit
-        valid_units = ["minutes", "hours", "days"]
-        if time_unit not in valid_units:
-            raise HTTPException(status_code=400, detail=f"Invalid time_unit. Must be one of: {valid_units}")
-        
-        # Validate time_period
-        if time_period <= 0:
-            raise HTTPException(status_code=400, detail="time_period must be greater than 0")
-        
-        logger.info(f"Getting negative news alerts for {time_period} {time_unit}")
-        alerts = await negative_news_alerts_service.get_negative_news_alerts(time_period, time_unit)
+        logger.info(f"Getting negative news alerts for {params.time_period} {params.time_unit}")
+        alerts = await negative_news_alerts_service.get_negative_news_alerts(params.time_period, params.time_unit)
         return alerts
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error fetching negative news alerts: {e}")
         raise HTTPException(status_code=500, detail="Error fetching negative news alerts")
 
 @app.get("/action-item")
-async def get_action_item(time_period: int = 48, time_unit: str = "hours"):
+async def get_action_item(params: TimeWindowParams = Depends()):
     """Get action item analysis for top accounts with negative news"""
     try:
-        # Validate time_unit
-        valid_units = ["minutes", "hours", "days"]
-        if time_unit not in valid_units:
-            raise HTTPException(status_code=400, detail=f"Invalid time_unit. Must be one of: {valid_units}")
-        
-        # Validate time_period
-        if time_period <= 0:
-            raise HTTPException(status_code=400, detail="time_period must be greater than 0")
-        
-        logger.info(f"Getting action item analysis for {time_period} {time_unit}")
-        action_item = await action_item_service.get_action_item_analysis(time_period, time_unit)
+        logger.info(f"Getting action item analysis for {params.time_period} {params.time_unit}")
+        action_item = await action_item_service.get_action_item_analysis(params.time_period, params.time_unit)
         return action_item
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error fetching action item analysis: {e}")
         raise HTTPException(status_code=500, detail="Error fetching action item analysis")
 
+_SYSTEM_PROMPT_ARTICLE_SUMMARY = """You are a professional financial analyst providing concise, actionable summaries of news articles. 
+
+Focus on:
+1. Key financial implications and market impact
+2. Specific effects on the mentioned company/symbol
+3. Potential portfolio implications for investors
+4. Risk factors and opportunities
+5. Timeline and likelihood of impacts
+
+Provide a clear, structured summary in 3-4 paragraphs that a financial advisor could use when speaking with clients."""
+
+# Account context for article summaries: account_id -> (expires_at, account_data, holdings_by_symbol), LRU-ordered
+ACCOUNT_CONTEXT_TTL = 60
+ACCOUNT_CONTEXT_MAX_ENTRIES = int(os.getenv("ACCOUNT_CONTEXT_MAX_ENTRIES", "256"))
+_account_context_cache: "OrderedDict[str, tuple]" = OrderedDict()
+# In-flight lookups per account, so concurrent misses share one ES call without blocking other accounts
+_account_context_inflight: Dict[str, asyncio.Task] = {}
+
+async def _load_account_context(account_id: str):
+    """Fetch account details from ES and store them with a symbol -> holding index."""
+    try:
+        account_data = await es_data_client.get_account_details(account_id)
+        holdings_by_symbol = {}
+        if account_data and "holdings" in account_data:
+            for holding in account_data["holdings"]:
+                # Keep the first holding per symbol, matching the old linear scan
+                holdings_by_symbol.setdefault(holding.get("symbol"), holding)
+        
+        _account_context_cache[account_id] = (time.monotonic() + ACCOUNT_CONTEXT_TTL, account_data, holdings_by_symbol)
+        _account_context_cache.move_to_end(account_id)
+        while len(_account_context_cache) > ACCOUNT_CONTEXT_MAX_ENTRIES:
+            _account_context_cache.popitem(last=False)
+        return account_data, holdings_by_symbol
+    finally:
+        _account_context_inflight.pop(account_id, None)
+
+async def get_account_context(account_id: str):
+    """Get account details and a symbol -> holding index, cached for ACCOUNT_CONTEXT_TTL seconds."""
+    entry = _account_context_cache.get(account_id)
+    if entry and entry[0] > time.monotonic():
+        _account_context_cache.move_to_end(account_id)
+        return entry[1], entry[2]
+    
+    task = _account_context_inflight.get(account_id)
+    if task is None:
+        task = asyncio.create_task(_load_account_context(account_id))
+        _account_context_inflight[account_id] = task
+    # Shield so one cancelled request doesn't cancel the lookup other callers are waiting on
+    return await asyncio.shield(task)
+
 async def article_summarization_generator(article_content: str, symbol: str = "", account_id: str = ""):
     """
     Generate a streaming summary of an article with focus on account/symbol relevance.
@@ -451,14 +618,10 @@ async def article_summarization_generator(article_content: str, symbol: str = ""
         # Add account context if provided
         if account_id:
             try:
-                account_data = await es_data_client.get_account_details(account_id)
+                account_data, holdings_by_symbol = await get_account_context(account_id)
                 if account_data and "holdings" in account_data:
                     # Find relevant holding for the symbol
-                    relevant_holding = None
-                    for holding in account_data["holdings"]:
-                        if holding.get("symbol") == symbol:
-                            relevant_holding = holding
-                            break
+                    relevant_holding = holdings_by_symbol.get(symbol)
                     
                     if relevant_holding:
                         context_parts.append(f"Account Context: The account {account_data.get('account_name', account_id)} holds {relevant_holding.get('total_quantity', 0)} shares of {symbol} ({relevant_holding.get('company_name', '')}) worth ${relevant_holding.get('total_current_value', 0):,.2f} in the {relevant_holding.get('sector', 'unknown')} sector.")
@@ -468,31 +631,22 @@ async def article_summarization_generator(article_content: str, symbol: str = ""
                 logger.warning(f"Could not fetch account context for {account_id}: {e}")
         
         # Build the summarization prompt
-        system_prompt = """You are a professional financial analyst providing concise, actionable summaries of news articles. 
-
-Focus on:
-1. Key financial implications and market impact
-2. Specific effects on the mentioned company/symbol
-3. Potential portfolio implications for investors
-4. Risk factors and opportunities
-5. Timeline and likelihood of impacts
-
-Provide a clear, structured summary in 3-4 paragraphs that a financial advisor could use when speaking with clients."""
-        
-        context_text = "\n".join(context_parts) if context_parts else ""
-        
-        user_prompt = f"""Please summarize this financial article with focus on implications for {symbol if symbol else 'relevant investments'}:
-
-{context_text}
-
-Article Content:
-{article_content}
-
-Provide a professional summary focusing on financial relevance, market implications, and potential impact on investors holding {symbol if symbol else 'related positions'}."""
+        user_prompt = "".join([
+            "Please summarize this financial article with focus on implications for ",
+            symbol or "relevant investments",
+            ":\n\n",
+            "\n".join(context_parts),
+            "\n\nArticle Content:\n",
+            article_content,
+            "\n\nProvide a professional summary focusing on financial relevance, market implications, "
+            "and potential impact on investors holding ",
+            symbol or "related positions",
+            ".",
+        ])
 
         # Create message for single-turn summarization
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": _SYSTEM_PROMPT_ARTICLE_SUMMARY},
             {"role": "user", "content": user_prompt}
         ]
         
@@ -517,11 +671,90 @@ Provide a professional summary focusing on financial relevance, market implicati
         logger.error(f"Error in article summarization: {e}")
         yield f"Error generating summary: {str(e)}"
 
+async def article_summarization_batch(account_id: str, items: List[ArticleSummaryItem]) -> List[str]:
+    """
+    Summarize several articles for one account concurrently, fetching the account context once.
+    """
+    if account_id:
+        try:
+            # Warm the account context cache so every summary reuses a single ES lookup
+            await get_account_context(account_id)
+        except Exception as e:
+            logger.warning(f"Could not fetch account context for {account_id}: {e}")
+    
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+    
+    async def summarize(item: ArticleSummaryItem) -> str:
+        async with semaphore:
+            chunks = []
+            async for chunk in article_summarization_generator(item.article_content, item.symbol, account_id):
+                chunks.append(chunk)
+            return "".join(chunks)
+    
+    return await asyncio.gather(*(summarize(item) for item in items))
+
+async def execute_chat_tool_call(index: int, session_id: str, enabled_servers, function_name: str, function_args: Dict[str, Any]):
+    """
+    Execute one LLM tool call on the first enabled MCP server that provides it.
+    Returns (index, function_name, result).
+    """
+    logger.info(f"Executing tool call: {function_name}({function_args})")
+    
+    for server_id, server in enabled_servers.items():
+        if function_name not in server.tools:
+            continue
+        
+        logger.debug(f"Executing MCP tool {function_name} on server {server_id}")
+        result = None
+        try:
+            server_dict = server.to_dict()
+            
+            # Prepare arguments with conversation context
+            enhanced_args = conversation_manager.prepare_tool_arguments(
+                session_id, server_id, server_dict, function_args
+            )
+            
+            # Use the MCP client with streaming support
+            tool_results = mcp_manager.execute_tool(server_id, function_name, enhanced_args)
+            try:
+                async for tool_result in tool_results:
+                    if tool_result["type"] == "error":
+                        result = f"Error calling MCP tool {function_name}: {tool_result['error']}"
+                        logger.error(f"MCP tool error: {tool_result['error']}")
+                        break
+                    elif tool_result["type"] == "tool_complete":
+                        # Extract and store conversation ID if server supports it
+                        conversation_id = conversation_manager.extract_conversation_id(
+                            server_id, server_dict, tool_result["raw_response"]
+                        )
+                        if conversation_id:
+                            conversation_manager.store_server_conversation_id(
+                                session_id, server_id, conversation_id
+                            )
+                        break
+                    elif result is None:
+                        # Take first result for now
+                        result = tool_result["content"]
+                        logger.info(f"MCP tool {function_name} executed successfully on server {server_id}")
+                        
+                        # Only servers with conversation persistence need the full response
+                        if not server_dict.get("conversation_field"):
+                            break
+            finally:
+                await tool_results.aclose()
+        except Exception as e:
+            logger.error(f"Error executing MCP tool {function_name} on server {server_id}: {e}")
+            result = f"Error calling MCP tool {function_name}: {e}"
+        return index, function_name, result
+    
+    logger.warning(f"Tool {function_name} not found in any enabled MCP server")
+    return index, function_name, f"Tool {function_name} not found in any enabled MCP server"
+
 async def chat_stream_generator(prompt: str, session_id: Optional[str] = None):
     """
     Multi-turn conversation generator with hybrid conversation persistence.
     """
-    print(f"--- USER PROMPT ---: {prompt}")
+    logger.debug(f"User prompt ({len(prompt)} chars)")
     
     # Handle conversation session
     if session_id:
@@ -542,19 +775,19 @@ async def chat_stream_generator(prompt: str, session_id: Optional[str] = None):
     
     yield f"Session ID: {session_id}\n\n"
     
-    dynamic_tools = get_all_tool_definitions()
+    tools_json = get_all_tool_definitions_json()
     max_turns = 5  # Prevent infinite loops
     turn = 0
     
     while turn < max_turns:
         turn += 1
-        print(f"--- TURN {turn} ---")
+        logger.debug(f"Chat turn {turn}")
         
         tool_calls = {}  # Use dict to accumulate by index
-        assistant_response = ""
+        response_chunks = []
 
         # Make LLM call with current conversation history
-        async for data in get_chat_response_stream_with_messages(messages, dynamic_tools=dynamic_tools):
+        async for data in get_chat_response_stream_with_messages(messages, tools_json=tools_json):
             if data.get("error"):
                 yield f"Error: {data['error']}"
                 return
@@ -571,28 +804,33 @@ async def chat_stream_generator(prompt: str, session_id: Optional[str] = None):
                 for tool_call in delta["tool_calls"]:
                     index = tool_call.get("index", 0)
                     if index not in tool_calls:
-                        tool_calls[index] = {"name": "", "arguments": ""}
+                        tool_calls[index] = {"name": "", "arguments": []}
                     
                     function_data = tool_call.get("function", {})
                     if "name" in function_data:
                         tool_calls[index]["name"] = function_data["name"]
                     if "arguments" in function_data:
-                        tool_calls[index]["arguments"] += function_data["arguments"]
+                        tool_calls[index]["arguments"].append(function_data["arguments"])
             
             content = delta.get("content")
             if content:
-                assistant_response += content
+                response_chunks.append(content)
                 yield content
         
-        print(f"--- ASSISTANT RESPONSE TURN {turn} ---: {assistant_response}")
+        # Join streamed fragments once instead of concatenating per delta
+        assistant_response = "".join(response_chunks)
+        for tc in tool_calls.values():
+            tc["arguments"] = "".join(tc["arguments"])
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Assistant response turn {turn} len={len(assistant_response)}")
 
         # If no tool calls, we have the final answer
         if not tool_calls:
-            print(f"--- FINAL ANSWER REACHED IN {turn} TURNS ---")
+            logger.debug(f"Final answer reached in {turn} turns")
             break
         
         # Execute tools and build tool results for next turn
-        tool_results = []
         enabled_servers = config_manager.get_enabled_servers()
         
         # Add assistant message with tool calls to conversation
@@ -609,6 +847,8 @@ async def chat_stream_generator(prompt: str, session_id: Optional[str] = None):
         messages.append(assistant_message)
         conversation_manager.add_message(session_id, assistant_message)
 
+        # Run tool calls concurrently and stream each result as soon as it completes
+        tasks = []
         for i, tool_call in tool_calls.items():
             function_name = tool_call.get("name")
             
@@ -628,143 +868,216 @@ async def chat_stream_generator(prompt: str, session_id: Optional[str] = None):
                 logger.error(f"Failed to parse tool arguments '{args_str}': {e}")
                 function_args = {}
             
-            logger.info(f"Executing tool call: {function_name}({function_args})")
-            
-            result = None
-            
-            # Check MCP servers for the tool
-            tool_found = False
-            for server_id, server in enabled_servers.items():
-                if function_name in server.tools:
-                    logger.debug(f"Executing MCP tool {function_name} on server {server_id}")
-                    tool_found = True
-                    
-                    try:
-                        # Prepare arguments with conversation context
-                        enhanced_args = conversation_manager.prepare_tool_arguments(
-                            session_id, server_id, server.to_dict(), function_args
-                        )
-                        
-                        # Use the MCP client with streaming support
-                        async for tool_result in mcp_manager.execute_tool(server_id, function_name, enhanced_args):
-                            if tool_result["type"] == "error":
-                                result = f"Error calling MCP tool {function_name}: {tool_result['error']}"
-                                logger.error(f"MCP tool error: {tool_result['error']}")
-                            else:
-                                result = tool_result["content"]
-                                logger.info(f"MCP tool {function_name} executed successfully on server {server_id}")
-                                
-                                # Extract and store conversation ID if server supports it
-                                raw_response = tool_result.get("raw_response", {})
-                                conversation_id = conversation_manager.extract_conversation_id(
-                                    server_id, server.to_dict(), raw_response
-                                )
-                                if conversation_id:
-                                    conversation_manager.store_server_conversation_id(
-                                        session_id, server_id, conversation_id
-                                    )
-                            break  # Take first result for now
-                    except Exception as e:
-                        logger.error(f"Error executing MCP tool {function_name} on server {server_id}: {e}")
-                        result = f"Error calling MCP tool {function_name}: {e}"
-                    break
-            
-            if not tool_found:
-                logger.warning(f"Tool {function_name} not found in any enabled MCP server")
-                result = f"Tool {function_name} not found in any enabled MCP server"
-            
-            if result is not None:
-                logger.debug(f"Tool result for {function_name}: {result}")
-                tool_results.append({"tool_name": function_name, "result": result})
+            tasks.append(asyncio.create_task(
+                execute_chat_tool_call(i, session_id, enabled_servers, function_name, function_args)
+            ))
+        
+        tool_messages = {}
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                i, function_name, result = await next_result
+                if result is None:
+                    continue
                 
-                # Add tool result to conversation history
-                tool_message = {
+                logger.debug(f"Tool result for {function_name}: {result}")
+                tool_messages[i] = {
                     "role": "tool",
                     "tool_call_id": f"call_{i}",
                     "content": str(result)
                 }
-                messages.append(tool_message)
-                conversation_manager.add_message(session_id, tool_message)
-
-        # Show tool results to user in structured format
-        if tool_results:
-            tool_results_data = {
-                "turn": turn,
-                "tool_results": [
-                    {
-                        "tool_name": tr["tool_name"],
-                        "result": tr["result"],
-                        "timestamp": time.time()
-                    }
-                    for tr in tool_results
-                ]
-            }
-            yield f"\n\n```json-tool-results\n{json.dumps(tool_results_data, indent=2)}\n```\n\n"
+                
+                # Show each tool result to the user in structured format as it arrives
+                tool_results_data = {
+                    "turn": turn,
+                    "tool_results": [
+                        {
+                            "index": i,
+                            "tool_name": function_name,
+                            "result": result,
+                            "timestamp": time.time()
+                        }
+                    ]
+                }
+                yield f"\n\n```json-tool-results\n{json.dumps(tool_results_data, indent=2)}\n```\n\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        # Add tool results to conversation history in call order for the next turn
+        for i in sorted(tool_messages):
+            messages.append(tool_messages[i])
+            conversation_manager.add_message(session_id, tool_messages[i])
+
+# StreamingResponse iterates sync generators in a threadpool; keep the streaming generators async
+assert inspect.isasyncgenfunction(article_summarization_generator)
+assert inspect.isasyncgenfunction(chat_stream_generator)
+
+async def coalesce(agen, min_bytes: int = 65536, max_delay: float = 0.05):
+    """
+    Re-chunk a text stream so each send carries at least min_bytes characters,
+    or whatever arrived within max_delay seconds of the first buffered chunk.
+    """
+    loop = asyncio.get_running_loop()
+    buffer = []
+    buffered = 0
+    deadline = None
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(agen.__anext__())
+            
+            timeout = max(0.0, deadline - loop.time()) if buffer else None
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                # Flush what we have; the pending read carries over to the next round
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+                continue
+            
+            task, pending = pending, None
+            try:
+                chunk = task.result()
+            except StopAsyncIteration:
+                break
+            
+            if not buffer:
+                deadline = loop.time() + max_delay
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= min_bytes:
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+        
+        if buffer:
+            yield "".join(buffer)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+        await agen.aclose()
 
 @app.post("/chat/query")
-async def chat_query(query: Dict[str, str]):
-    prompt = query.get("query", "")
-    session_id = query.get("session_id")  # Optional session ID for conversation persistence
-    return StreamingResponse(chat_stream_generator(prompt, session_id), media_type="text/plain")
+async def chat_query(query: ChatQuery, lowlatency: bool = False):
+    stream = chat_stream_generator(query.query, query.session_id)
+    return StreamingResponse(stream if lowlatency else coalesce(stream), media_type="text/plain")
 
 @app.post("/article/summarize")
-async def summarize_article(request: Dict[str, str]):
+async def summarize_article(request: ArticleSummaryRequest, lowlatency: bool = False):
     """Summarize an article with focus on account/symbol relevance"""
-    article_content = request.get("article_content", "")
-    symbol = request.get("symbol", "")
-    account_id = request.get("account_id", "")
+    article_content = request.article_content
+    symbol = request.symbol or ""
+    account_id = request.account_id or ""
     
     if not article_content:
         raise HTTPException(status_code=400, detail="Article content is required")
     
+    stream = article_summarization_generator(article_content, symbol, account_id)
+    return StreamingResponse(
+        stream if lowlatency else coalesce(stream), 
+        media_type="text/plain"
+    )
+
+# Upper bound on raw article bodies accepted by /article/summarize-stream
+MAX_ARTICLE_BYTES = int(os.getenv("MAX_ARTICLE_BYTES", str(1024 * 1024)))
+
+@app.post("/article/summarize-stream")
+async def summarize_article_stream(request: Request, symbol: str = "", account_id: str = "", lowlatency: bool = False):
+    """Summarize an article sent as a raw text body, read incrementally with a size cap"""
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_ARTICLE_BYTES:
+        raise HTTPException(status_code=413, detail=f"Article exceeds {MAX_ARTICLE_BYTES} bytes")
+    
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_ARTICLE_BYTES:
+            raise HTTPException(status_code=413, detail=f"Article exceeds {MAX_ARTICLE_BYTES} bytes")
+    
+    article_content = body.decode("utf-8", errors="replace")
+    if not article_content.strip():
+        raise HTTPException(status_code=400, detail="Article content is required")
+    
+    stream = article_summarization_generator(article_content, symbol, account_id)
     return StreamingResponse(
-        article_summarization_generator(article_content, symbol, account_id), 
+        stream if lowlatency else coalesce(stream), 
         media_type="text/plain"
     )
 
+@app.post("/article/summarize-batch")
+async def summarize_articles_batch(request: ArticleSummaryBatchRequest):
+    """Summarize multiple articles for the same account in one request"""
+    if not request.items or any(not item.article_content for item in request.items):
+        raise HTTPException(status_code=400, detail="Article content is required for every item")
+    
+    summaries = await article_summarization_batch(request.account_id, request.items)
+    return {
+        "summaries": [
+            {"symbol": item.symbol, "summary": summary}
+            for item, summary in zip(request.items, summaries)
+        ]
+    }
+
 # --- Settings Endpoints ---
 
+def config_etag() -> str:
+    """ETag for responses derived from the MCP config; the boot id guards against counter resets on restart."""
+    return f'"{CONFIG_BOOT_ID}-{config_manager.version}"'
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this ETag."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
 @app.get("/settings")
-async def get_current_settings():
+async def get_current_settings(request: Request):
     """Get current MCP server settings (without API keys)"""
+    etag = config_etag()
+    cached_response = not_modified(request, etag)
+    if cached_response:
+        return cached_response
+    
     safe_config = config_manager.get_safe_config()
     # Return just the servers part to match frontend expectations
-    return safe_config.get("servers", {})
+    return OrjsonResponse(
+        safe_config.get("servers", {}),
+        headers={"ETag": etag, "X-Config-Version": str(config_manager.version)}
+    )
 
-@app.post("/settings")
+@app.post("/settings", status_code=204)
 async def update_current_settings(new_settings: Dict[str, Any]):
     """Update MCP server settings"""
-    try:
-        # This endpoint could be used for bulk updates
-        # For now, we'll return the current settings
-        logger.info("Settings update requested (not implemented for bulk updates)")
-        return config_manager.get_safe_config()
-    except Exception as e:
-        logger.error(f"Error updating settings: {e}")
-        raise HTTPException(status_code=400, detail=f"Error updating settings: {e}")
+    # This endpoint could be used for bulk updates; for now it is a no-op
+    logger.info("Settings update requested (not implemented for bulk updates)")
+    return Response(status_code=204)
 
 @app.get("/settings/logging")
-async def get_logging_config():
-    return get_logging_status()
+async def get_logging_config(request: Request):
+    status = get_logging_status()
+    etag = f'"logging-{int(status["enabled"])}"'
+    cached_response = not_modified(request, etag)
+    if cached_response:
+        return cached_response
+    return OrjsonResponse(status, headers={"ETag": etag})
 
 @app.put("/settings/logging")
-async def update_logging_config(status: Dict[str, bool]):
-    return update_logging_status(status.get("enabled", False))
+async def update_logging_config(status: LoggingStatus):
+    return update_logging_status(status.enabled)
 
 @app.post("/servers")
-async def register_external_server(server_config: Dict[str, Any]):
+async def register_external_server(server_config: ServerConfigIn):
     """Registers a new external MCP server using the clean HTTP-based client."""
-    server_id = server_config.get("id")
-    if not server_id:
-        raise HTTPException(status_code=400, detail="Server ID is required.")
-    
-    url = server_config.get("url")
-    api_key = server_config.get("apiKey")
-    name = server_config.get("name", "Unnamed Server")
-    transport = server_config.get("transport", "http")
-    conversation_field = server_config.get("conversationField")
-    conversation_location = server_config.get("conversationLocation", "response")
-    use_for_main_page = server_config.get("useForMainPage", False)
+    server_id = server_config.id
+    url = server_config.url
+    conversation_field = server_config.conversation_field
+    conversation_location = server_config.conversation_location
+    use_for_main_page = server_config.use_for_main_page
     
     logger.info(f"Registering new MCP server: {server_id} at {url}")
     if conversation_field:
@@ -774,30 +1087,18 @@ async def register_external_server(server_config: Dict[str, Any]):
     
     try:
         # Create MCPServer instance
-        server = MCPServer(
-            id=server_id,
-            name=name,
-            url=url,
-            api_key=api_key,
-            transport=MCPTransportType(transport),
-            enabled=True,
-            conversation_field=conversation_field,
-            conversation_location=conversation_location,
-            use_for_main_page=use_for_main_page
-        )
+        server = MCPServer(**server_config.model_dump(), enabled=True)
         
         # Add server to manager (this will test connection and discover tools)
         await mcp_manager.add_server(server)
         
-        # Save to persistent configuration
-        config_manager.add_server(server)
+        # Save to persistent configuration without blocking the event loop on disk I/O
+        await asyncio.to_thread(config_manager.add_server, server)
         
         logger.info(f"Successfully registered MCP server: {server_id} with {len(server.tools)} tools")
         
         # Return server config without API key
-        result = server.to_dict()
-        result.pop("api_key", None)
-        return result
+        return server.to_safe_dict()
         
     except MCPConnectionError as e:
         logger.error(f"Connection error registering server {server_id}: {e}")
@@ -809,18 +1110,88 @@ async def register_external_server(server_config: Dict[str, Any]):
         logger.error(f"Unexpected error registering server {server_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {e}")
 
+@app.post("/servers/bulk")
+async def register_external_servers_bulk(server_configs: List[ServerConfigIn]):
+    """Registers several MCP servers concurrently and persists them with one config write."""
+    servers = [MCPServer(**cfg.model_dump(), enabled=True) for cfg in server_configs]
+    logger.info(f"Bulk registering {len(servers)} MCP servers")
+    
+    failures = await mcp_manager.add_servers(servers)
+    
+    registered = []
+    errors = {}
+    for server in servers:
+        if server.id in failures:
+            logger.error(f"Error registering server {server.id}: {failures[server.id]}")
+            errors[server.id] = str(failures[server.id])
+        else:
+            registered.append(server)
+    
+    await asyncio.to_thread(config_manager.add_servers, registered)
+    
+    return {
+        "registered": [server.to_safe_dict() for server in registered],
+        "errors": errors
+    }
+
 @app.delete("/servers/{server_id}")
 async def unregister_external_server(server_id: str):
-    try:
-        # Remove from MCP manager
-        await mcp_manager.remove_server(server_id)
-        # Remove from config
-        config_manager.remove_server(server_id)
-        return {"message": f"Server {server_id} removed successfully."}
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error removing server: {e}")
+    # Close the live client and rewrite the config concurrently
+    results = await asyncio.gather(
+        mcp_manager.remove_server(server_id),
+        asyncio.to_thread(config_manager.remove_server, server_id),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, ValueError):
+            raise HTTPException(status_code=404, detail=str(result))
+    for result in results:
+        if isinstance(result, Exception):
+            raise HTTPException(status_code=500, detail=f"Error removing server: {result}")
+    return {"message": f"Server {server_id} removed successfully."}
+
+async def refresh_one_server(server: MCPServer) -> MCPServer:
+    """Rediscover an MCP server's tools (config is not written)."""
+    logger.info(f"Refreshing tools for MCP server: {server.id} ({server.name})")
+    
+    # Reuses the live pooled connection when possible, otherwise reconnects
+    await mcp_manager.refresh_server(server)
+    return server
+
+@app.post("/servers/refresh-all")
+async def refresh_all_server_tools():
+    """Refresh/rediscover tools for every enabled MCP server concurrently"""
+    # Disabled servers aren't connected in the manager (see startup), so leave them alone
+    all_servers = {
+        server_id: server
+        for server_id, server in config_manager.get_all_servers().items()
+        if server.enabled
+    }
+    results = await asyncio.gather(
+        *(refresh_one_server(server) for server in all_servers.values()),
+        return_exceptions=True
+    )
+    
+    refreshed = {}
+    errors = {}
+    for server_id, result in zip(all_servers, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error refreshing tools for server {server_id}: {result}")
+            errors[server_id] = str(result)
+        else:
+            refreshed[server_id] = result
+    
+    # Config writes share one file, so persist them in a single worker thread call
+    def persist():
+        for server in refreshed.values():
+            config_manager.update_server(server)
+    await asyncio.to_thread(persist)
+    
+    logger.info(f"Refreshed tools for {len(refreshed)}/{len(all_servers)} MCP servers")
+    return {
+        "refreshed": {server_id: len(server.tools) for server_id, server in refreshed.items()},
+        "errors": errors
+    }
 
 @app.post("/servers/{server_id}/refresh-tools")
 async def refresh_server_tools(server_id: str):
@@ -831,22 +1202,15 @@ async def refresh_server_tools(server_id: str):
         if server_id not in all_servers:
             raise HTTPException(status_code=404, detail=f"Server {server_id} not found")
         
-        server = all_servers[server_id]
-        logger.info(f"Refreshing tools for MCP server: {server_id} ({server.name})")
-        
-        # Remove and re-add the server to refresh tools
-        await mcp_manager.remove_server(server_id)
-        await mcp_manager.add_server(server)
+        server = await refresh_one_server(all_servers[server_id])
         
         # Update the config with refreshed tools
-        config_manager.update_server(server)
+        await asyncio.to_thread(config_manager.update_server, server)
         
         logger.info(f"Successfully refreshed tools for server: {server_id} - found {len(server.tools)} tools")
         
         # Return updated server config without API key
-        result = server.to_dict()
-        result.pop("api_key", None)
-        return result
+        return server.to_safe_dict()
         
     except HTTPException:
         raise
@@ -858,21 +1222,17 @@ async def refresh_server_tools(server_id: str):
         raise HTTPException(status_code=500, detail=f"Error refreshing server tools: {e}")
 
 @app.get("/tools")
-async def get_available_tools():
+async def get_available_tools(request: Request):
     """Get all available tools from MCP servers"""
-    tools = []
-    enabled_servers = config_manager.get_enabled_servers()
+    etag = config_etag()
+    cached_response = not_modified(request, etag)
+    if cached_response:
+        return cached_response
     
-    for server_id, server in enabled_servers.items():
-        for tool_name, tool in server.tools.items():
-            tools.append({
-                "name": tool_name,
-                "description": tool.description,
-                "server": server.name,
-                "server_id": server_id
-            })
-    
-    return {
-        "server_name": "MCP Servers",
-        "tools": tools
-    }
\ No newline at end of file
+    return OrjsonResponse(
+        {
+            "server_name": "MCP Servers",
+            "tools": config_manager.tools_snapshot()
+        },
+        headers={"ETag": etag, "X-Config-Version": str(config_manager.version)}
+    )
\ No newline at end of file
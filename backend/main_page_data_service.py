@@ -3,22 +3,214 @@ Main page data service for querying designated MCP servers
 to enhance dashboard content with additional data like news summaries.
 """
 
+import asyncio
 import logging
-import json
-from typing import Dict, List, Any, Optional
+import orjson
+import re
+import time
+import uuid
+from itertools import islice
+from typing import Dict, List, Any, Optional, Tuple
 from mcp_config import config_manager
 from mcp_client import mcp_manager
 
 logger = logging.getLogger(__name__)
 
+# Elasticsearch highlight markers stripped from titles
+_EM_RE = re.compile(r"</?em>")
+
+
+def _trunc(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with an ellipsis"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+# Result parsers are plain synchronous functions over dicts and strings so the
+# CPU-bound part of each strategy stays separate from the async tool plumbing
+def _highlight_item(i: int, result_item: Dict[str, Any], title_prefix: str, default_index: str) -> Dict[str, Any]:
+    """Build one display item from an ES MCP search result (highlights format)"""
+    # Extract highlights as summary
+    highlights = result_item.get("highlights") or ()
+    full_summary = " ".join(highlights) if highlights else "No summary available"
+    
+    # Create a more descriptive title from the first highlight or use a generic one
+    if highlights and len(clean_highlight := _EM_RE.sub("", highlights[0])) > 20:
+        title = _trunc(clean_highlight, 60)
+    else:
+        title = f"{title_prefix} {i+1}"
+    
+    return {
+        "title": title,
+        "symbol": "",  # Not available in highlights format
+        "published_date": "",  # Not available in highlights format
+        "summary": _trunc(full_summary, 100),  # Short version for display
+        "summary_full": full_summary,  # Full version for expansion
+        "document_id": result_item.get("id", ""),  # ES document ID for full document retrieval
+        "index": result_item.get("index", default_index)  # ES index name
+    }
+
+
+def _hit_item(hit: Dict[str, Any], index: str, summary_limit: int) -> Dict[str, Any]:
+    """Build one display item from a standard Elasticsearch hit"""
+    source = hit.get("_source", {})
+    body = source.get("summary") or source.get("content") or ""
+    return {
+        "title": source.get("title", "No title"),
+        "symbol": source.get("symbol", ""),
+        "published_date": source.get("published_date", ""),
+        "summary": _trunc(body, summary_limit) if body else "No summary available",
+        "summary_full": body or "No summary available",
+        "document_id": hit.get("_id", ""),
+        "index": index
+    }
+
+
+def _parse_highlight_results(results: List[Dict[str, Any]], title_prefix: str, default_index: str) -> List[Dict[str, Any]]:
+    """Build display items from the top 10 ES MCP search results (highlights format)"""
+    return [
+        _highlight_item(i, result_item, title_prefix, default_index)
+        for i, result_item in enumerate(islice(results, 10))
+    ]
+
+
+def _parse_es_hits(hits: List[Dict[str, Any]], index: str, summary_limit: int) -> List[Dict[str, Any]]:
+    """Build display items from the top 10 hits of a standard Elasticsearch search response"""
+    return [_hit_item(hit, index, summary_limit) for hit in islice(hits, 10)]
+
+
+# Static tool arguments for each news/report strategy. The first ES|QL query only sorts
+# recent documents; the others cover indexes without published_date or recent data
+_NEWS_ESQL_QUERIES = [
+    "FROM financial_news | WHERE published_date > NOW() - 7 days | SORT published_date DESC | LIMIT 10 | KEEP title, symbol, published_date, summary",
+    "FROM financial_news | SORT @timestamp DESC | LIMIT 10 | KEEP title, symbol, published_date, summary",
+    "FROM financial_news | LIMIT 10 | KEEP title, symbol, published_date, summary, content"
+]
+
+_NEWS_NL_SEARCH_ARGS = {
+    "query": "latest financial news stories published in the last 7 days",
+    "index": "financial_news",
+    "size": 10,
+    "include_source": True
+}
+
+_NEWS_RELEVANCE_SEARCH_ARGS = {
+    "term": "financial news",
+    "index": "financial_news",
+    "size": 10
+}
+
+_REPORTS_ESQL_QUERIES = [
+    "FROM financial_reports | WHERE published_date > NOW() - 30 days | SORT published_date DESC | LIMIT 10 | KEEP title, symbol, published_date, summary",
+    "FROM financial_reports | SORT @timestamp DESC | LIMIT 10 | KEEP title, symbol, published_date, summary",
+    "FROM financial_reports | LIMIT 10 | KEEP title, symbol, published_date, summary, content"
+]
+
+_REPORTS_NL_SEARCH_ARGS = {
+    "query": "latest financial reports and analysis published in the last 30 days",
+    "index": "financial_reports",
+    "size": 10,
+    "include_source": True
+}
+
+_REPORTS_RELEVANCE_SEARCH_ARGS = {
+    "term": "financial reports analysis",
+    "index": "financial_reports",
+    "size": 10
+}
+
 
 class MainPageDataService:
     """Service for fetching additional data from designated MCP servers for the main page"""
     
-    def __init__(self):
+    def __init__(self, ttl_seconds: float = 60, max_concurrent_tool_calls: int = 8):
         self.logger = logging.getLogger(f"{__name__}.MainPageDataService")
+        # Summary results keyed by (kind, config version); one lock per key so
+        # concurrent cold-cache callers share a single upstream fetch
+        self._cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+        self._locks: Dict[Tuple[str, int], asyncio.Lock] = {}
+        self._ttl_seconds = ttl_seconds
+        # Background refreshes for callers that poll instead of waiting, by job id and by kind
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self._job_ids: Dict[str, str] = {}
+        # Strategy lists keyed by (kind, tool names), shared by servers exposing the same tools
+        self._strategy_cache: Dict[Tuple[str, frozenset], List[Tuple[str, Any]]] = {}
+        # Bounds in-flight MCP tool calls across racing servers, strategies and ES|QL fallbacks
+        self._tool_call_semaphore = asyncio.Semaphore(max_concurrent_tool_calls)
+    
+    async def _cached(self, kind: str, fetch) -> Dict[str, Any]:
+        """Return a fresh cached result for kind, or fetch it once for all waiting callers"""
+        result = self._fresh(kind)
+        if result is not None:
+            return result
+        
+        key = (kind, config_manager.version)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            result = self._fresh(kind)
+            if result is not None:
+                return result
+            
+            result = await fetch()
+            if result.get("status") != "error":
+                # Drop entries from older config versions along with the stale one
+                self._cache = {k: v for k, v in self._cache.items() if k[0] != kind}
+                self._cache[key] = (time.monotonic(), result)
+            return result
+    
+    def _fresh(self, kind: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for kind if it is still fresh"""
+        entry = self._cache.get((kind, config_manager.version))
+        if entry and time.monotonic() - entry[0] < self._ttl_seconds:
+            return entry[1]
+        return None
+    
+    async def get_summary_or_job(self, kind: str) -> Dict[str, Any]:
+        """
+        Return the cached news/reports summary, or start a background refresh and
+        return {"status": "pending", "job_id": ...} to poll with get_job().
+        """
+        result = self._fresh(kind)
+        if result is not None:
+            return result
+        
+        # Share one in-flight job between all pollers of the same kind
+        job_id = self._job_ids.get(kind)
+        if job_id is None or self._jobs[job_id].done():
+            fetch = self._fetch_news_summary if kind == "news" else self._fetch_reports_summary
+            job_id = uuid.uuid4().hex
+            task = asyncio.create_task(self._cached(kind, fetch))
+            task.add_done_callback(lambda _, job_id=job_id: self._expire_job(kind, job_id))
+            self._jobs[job_id] = task
+            self._job_ids[kind] = job_id
+        
+        return {"status": "pending", "job_id": job_id}
+    
+    def _expire_job(self, kind: str, job_id: str) -> None:
+        """Keep a finished job pollable for ttl_seconds, then forget it"""
+        if self._job_ids.get(kind) == job_id:
+            del self._job_ids[kind]
+        asyncio.get_running_loop().call_later(self._ttl_seconds, self._jobs.pop, job_id, None)
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the result of a background refresh, a pending marker, or None for unknown jobs"""
+        task = self._jobs.get(job_id)
+        if task is None:
+            return None
+        if not task.done():
+            return {"status": "pending", "job_id": job_id}
+        if task.cancelled() or task.exception() is not None:
+            return {"status": "error", "message": "Background refresh failed"}
+        return task.result()
     
     async def get_news_summary(self) -> Dict[str, Any]:
+        """Get top 10 latest news stories from designated MCP servers (cached for ttl_seconds)"""
+        return await self._cached("news", self._fetch_news_summary)
+    
+    async def get_reports_summary(self) -> Dict[str, Any]:
+        """Get top 10 latest financial reports from designated MCP servers (cached for ttl_seconds)"""
+        return await self._cached("reports", self._fetch_reports_summary)
+    
+    async def _fetch_news_summary(self) -> Dict[str, Any]:
         """Get top 10 latest news stories from designated MCP servers"""
         try:
             # Get servers designated for main page data
@@ -33,20 +225,14 @@ class MainPageDataService:
             
             self.logger.info(f"Found {len(main_page_servers)} servers designated for main page data")
             
-            # Try to get news from each designated server
-            for server_id, server in main_page_servers.items():
-                try:
-                    # Try different approaches to get news data
-                    news_stories = await self._get_news_from_server(server_id, server)
-                    if news_stories:
-                        return {
-                            "status": "success",
-                            "server_used": server.name,
-                            "news_stories": news_stories[:10]  # Top 10
-                        }
-                except Exception as e:
-                    self.logger.warning(f"Failed to get news from server {server_id}: {e}")
-                    continue
+            # Query all designated servers concurrently, preferring them in configured order
+            server, news_stories = await self._first_from_servers(main_page_servers, self._get_news_from_server, "news")
+            if news_stories:
+                return {
+                    "status": "success",
+                    "server_used": server.name,
+                    "news_stories": news_stories[:10]  # Top 10
+                }
             
             # If we get here, no servers successfully provided news
             return {
@@ -63,7 +249,7 @@ class MainPageDataService:
                 "news_stories": []
             }
     
-    async def get_reports_summary(self) -> Dict[str, Any]:
+    async def _fetch_reports_summary(self) -> Dict[str, Any]:
         """Get top 10 latest financial reports from designated MCP servers"""
         try:
             # Get servers designated for main page data
@@ -78,20 +264,14 @@ class MainPageDataService:
             
             self.logger.info(f"Found {len(main_page_servers)} servers designated for main page data")
             
-            # Try to get reports from each designated server
-            for server_id, server in main_page_servers.items():
-                try:
-                    # Try different approaches to get reports data
-                    reports = await self._get_reports_from_server(server_id, server)
-                    if reports:
-                        return {
-                            "status": "success",
-                            "server_used": server.name,
-                            "reports": reports[:10]  # Top 10
-                        }
-                except Exception as e:
-                    self.logger.warning(f"Failed to get reports from server {server_id}: {e}")
-                    continue
+            # Query all designated servers concurrently, preferring them in configured order
+            server, reports = await self._first_from_servers(main_page_servers, self._get_reports_from_server, "reports")
+            if reports:
+                return {
+                    "status": "success",
+                    "server_used": server.name,
+                    "reports": reports[:10]  # Top 10
+                }
             
             # If we get here, no servers successfully provided reports
             return {
@@ -108,471 +288,270 @@ class MainPageDataService:
                 "reports": []
             }
     
-    async def _get_reports_from_server(self, server_id: str, server) -> List[Dict[str, Any]]:
-        """Try to get reports data from a specific MCP server"""
-        reports = []
+    async def _first_from_servers(self, servers, fetch, kind: str) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        Run fetch(server_id, server) on all servers concurrently and return the first
+        non-empty result in server priority order, cancelling lower-priority calls.
+        """
+        tasks = [
+            (server, asyncio.create_task(fetch(server_id, server)))
+            for server_id, server in servers.items()
+        ]
+        try:
+            for server, task in tasks:
+                try:
+                    items = await task
+                except Exception as e:
+                    self.logger.warning(f"Failed to get {kind} from server {server.id}: {e}")
+                    continue
+                if items:
+                    return server, items
+            return None, []
+        finally:
+            for _, task in tasks:
+                task.cancel()
+    
+    async def _race_strategies(self, server_id: str, strategies: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run all strategies concurrently and return the first non-empty result,
+        cancelling the rest. Priority order only breaks ties between strategies
+        that finish together.
+        """
+        tasks = {
+            asyncio.create_task(fetch(server_id)): (priority, tool_name)
+            for priority, (tool_name, fetch) in enumerate(strategies)
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: tasks[t][0]):
+                    try:
+                        items = task.result()
+                    except Exception as e:
+                        self.logger.warning(f"{tasks[task][1]} failed on {server_id}: {e}")
+                        continue
+                    if items:
+                        return items
+            return []
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _run_esql(self, server_id: str, query: str) -> List[List[Any]]:
+        """Run a single ES|QL query and return its row values (empty if it failed)"""
+        self.logger.info(f"Trying ES|QL query: {query}")
+        try:
+            data = await self._call_tool_json(server_id, "execute_esql", {"query": query})
+            if data is not None:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Parsed ES|QL data: %s", orjson.dumps(data).decode())
+                
+                if "result" in data and "values" in data["result"]:
+                    self.logger.debug("ES|QL columns: %s", data["result"].get("columns", []))
+                    values = data["result"].get("values", [])
+                    self.logger.debug("ES|QL values count: %d", len(values))
+                    return values
+                    
+        except Exception as e:
+            self.logger.warning(f"ES|QL query failed: {query} - {e}")
         
-        # Check what tools this server has available for reports
-        available_tools = server.tools.keys()
+        return []
+    
+    async def _call_tool_json(self, server_id: str, tool_name: str, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run a tool and return its decoded JSON result, or None if the call failed or was not a JSON object"""
+        async with self._tool_call_semaphore:
+            result = await mcp_manager.call_tool_once(server_id, tool_name, arguments, decode_json=True)
+        if result["type"] == "tool_result" and isinstance(result["content"], dict):
+            return result["content"]
+        if result["type"] == "error":
+            self.logger.warning(f"Could not get a JSON result from {tool_name} on {server_id}: {result['error']}")
+        return None
+    
+    async def _first_esql_rows(self, server_id: str, queries: List[str]) -> List[List[Any]]:
+        """
+        Run fallback ES|QL queries concurrently and return the rows of the
+        highest-priority one that came back non-empty, cancelling the rest.
+        """
+        tasks = [asyncio.create_task(self._run_esql(server_id, query)) for query in queries]
+        try:
+            # Queries are in priority order, so a faster fallback never beats an earlier query with rows
+            for task in tasks:
+                rows = await task
+                if rows:
+                    return rows
+            return []
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _strategies_for(self, kind: str, server_id: str, server) -> List[Tuple[str, Any]]:
+        """Get the news/reports strategies a server's tools support, cached per tool set"""
+        # Check what tools this server has available
+        available_tools = frozenset(server.tools)
         self.logger.debug(f"Server {server_id} has tools: {list(available_tools)}")
         
-        # Try different strategies based on available tools
-        
-        # Strategy 1: Use execute_esql if available (more reliable for ES MCP)
-        if "execute_esql" in available_tools:
-            try:
-                reports = await self._get_reports_via_esql(server_id)
-                if reports:
-                    return reports
-            except Exception as e:
-                self.logger.warning(f"execute_esql failed on {server_id}: {e}")
-        
-        # Strategy 2: Use nl_search if available  
-        if "nl_search" in available_tools:
-            try:
-                reports = await self._get_reports_via_nl_search(server_id)
-                if reports:
-                    return reports
-            except Exception as e:
-                self.logger.warning(f"nl_search failed on {server_id}: {e}")
-        
-        # Strategy 3: Use relevance_search if available
-        if "relevance_search" in available_tools:
-            try:
-                reports = await self._get_reports_via_relevance_search(server_id)
-                if reports:
-                    return reports
-            except Exception as e:
-                self.logger.warning(f"relevance_search failed on {server_id}: {e}")
+        key = (kind, available_tools)
+        strategies = self._strategy_cache.get(key)
+        if strategies is None:
+            # Strategies in priority order (execute_esql is more reliable for ES MCP)
+            if kind == "news":
+                candidates = (
+                    ("execute_esql", self._get_news_via_esql),
+                    ("nl_search", self._get_news_via_nl_search),
+                    ("relevance_search", self._get_news_via_relevance_search),
+                )
+            else:
+                candidates = (
+                    ("execute_esql", self._get_reports_via_esql),
+                    ("nl_search", self._get_reports_via_nl_search),
+                    ("relevance_search", self._get_reports_via_relevance_search),
+                )
+            strategies = [(tool_name, fetch) for tool_name, fetch in candidates if tool_name in available_tools]
+            self._strategy_cache[key] = strategies
+        return strategies
+    
+    async def _get_reports_from_server(self, server_id: str, server) -> List[Dict[str, Any]]:
+        """Try to get reports data from a specific MCP server"""
+        strategies = self._strategies_for("reports", server_id, server)
         
-        return reports
+        return await self._race_strategies(server_id, strategies)
     
     async def _get_reports_via_nl_search(self, server_id: str) -> List[Dict[str, Any]]:
         """Get reports using natural language search"""
-        arguments = {
-            "query": "latest financial reports and analysis published in the last 30 days",
-            "index": "financial_reports",
-            "size": 10,
-            "include_source": True
-        }
-        
         reports = []
-        async for result in mcp_manager.execute_tool(server_id, "nl_search", arguments):
-            if result["type"] == "tool_result":
-                content = result["content"]
-                if isinstance(content, dict) and "text" in content:
-                    # Parse the JSON response
-                    try:
-                        data = json.loads(content["text"])
-                        self.logger.info(f"Parsed nl_search reports data: {json.dumps(data, indent=2)}")
-                        
-                        # Handle ES MCP server response format
-                        if "result" in data and "results" in data["result"]:
-                            results = data["result"]["results"]
-                            for i, result_item in enumerate(results[:10]):  # Top 10
-                                # Extract highlights as summary
-                                highlights = result_item.get("highlights", [])
-                                full_summary = " ".join(highlights) if highlights else "No summary available"
-                                short_summary = full_summary[:100] + "..." if len(full_summary) > 100 else full_summary
-                                
-                                # Create a more descriptive title from highlights or use a generic one
-                                title = f"Financial Report {i+1}"
-                                if highlights:
-                                    # Try to extract a title-like phrase from the first highlight
-                                    first_highlight = highlights[0]
-                                    # Remove HTML tags and take first part
-                                    clean_highlight = first_highlight.replace('<em>', '').replace('</em>', '')
-                                    if len(clean_highlight) > 20:
-                                        title = clean_highlight[:60] + "..." if len(clean_highlight) > 60 else clean_highlight
-                                
-                                reports.append({
-                                    "title": title,
-                                    "symbol": "",  # Not available in highlights format
-                                    "published_date": "",  # Not available in highlights format  
-                                    "summary": short_summary,  # Short version for display
-                                    "summary_full": full_summary,  # Full version for expansion
-                                    "document_id": result_item.get("id", ""),  # ES document ID for full report retrieval
-                                    "index": result_item.get("index", "financial_reports")  # ES index name
-                                })
-                            
-                            if reports:
-                                self.logger.info(f"Successfully parsed {len(reports)} reports from nl_search")
-                                return reports
-                        # Fallback to standard Elasticsearch format
-                        elif "result" in data and "hits" in data["result"]:
-                            hits = data["result"]["hits"]["hits"]
-                            for hit in hits[:10]:  # Top 10
-                                source = hit.get("_source", {})
-                                reports.append({
-                                    "title": source.get("title", "No title"),
-                                    "symbol": source.get("symbol", ""),
-                                    "published_date": source.get("published_date", ""),
-                                    "summary": source.get("summary", source.get("content", ""))[:100] + "..." if source.get("summary", source.get("content", "")) else "No summary available",
-                                    "summary_full": source.get("summary", source.get("content", "")) or "No summary available",
-                                    "document_id": hit.get("_id", ""),
-                                    "index": "financial_reports"
-                                })
-                    except json.JSONDecodeError:
-                        self.logger.warning(f"Could not parse nl_search reports response as JSON")
-                break
+        data = await self._call_tool_json(server_id, "nl_search", _REPORTS_NL_SEARCH_ARGS)
+        if data is not None:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Parsed nl_search reports data: %s", orjson.dumps(data).decode())
+            
+            # Handle ES MCP server response format
+            if "result" in data and "results" in data["result"]:
+                results = data["result"]["results"] or ()
+                reports = _parse_highlight_results(results, "Financial Report", "financial_reports")
+                
+                if reports:
+                    self.logger.info(f"Successfully parsed {len(reports)} reports from nl_search")
+                    return reports
+            # Fallback to standard Elasticsearch format
+            elif "result" in data and "hits" in data["result"]:
+                hits = data["result"]["hits"]["hits"]
+                reports = _parse_es_hits(hits, "financial_reports", 100)
         
         return reports
     
     async def _get_reports_via_esql(self, server_id: str) -> List[Dict[str, Any]]:
         """Get reports using ES|QL query"""
-        # Try different ES|QL queries to get reports data
-        queries = [
-            "FROM financial_reports | SORT published_date DESC | LIMIT 10 | KEEP title, symbol, published_date, summary",
-            "FROM financial_reports | SORT @timestamp DESC | LIMIT 10 | KEEP title, symbol, published_date, summary", 
-            "FROM financial_reports | LIMIT 10 | KEEP title, symbol, published_date, summary, content"
-        ]
-        
-        for query in queries:
-            self.logger.info(f"Trying ES|QL reports query: {query}")
-            arguments = {"query": query}
-            
-            reports = []
-            try:
-                async for result in mcp_manager.execute_tool(server_id, "execute_esql", arguments):
-                    if result["type"] == "tool_result":
-                        content = result["content"]
-                        self.logger.info(f"ES|QL reports result content: {content}")
-                        
-                        if isinstance(content, dict) and "text" in content:
-                            try:
-                                data = json.loads(content["text"])
-                                self.logger.info(f"Parsed ES|QL reports data: {json.dumps(data, indent=2)}")
-                                
-                                if "result" in data and "values" in data["result"]:
-                                    columns = data["result"].get("columns", [])
-                                    values = data["result"].get("values", [])
-                                    self.logger.info(f"ES|QL reports columns: {columns}")
-                                    self.logger.info(f"ES|QL reports values count: {len(values)}")
-                                    
-                                    # Map columns to values
-                                    for row in values:
-                                        if len(row) >= 3:  # At least title, symbol, date
-                                            full_summary = str(row[3]) if len(row) > 3 and row[3] else (str(row[4]) if len(row) > 4 and row[4] else "No summary available")
-                                            short_summary = full_summary[:100] + "..." if len(full_summary) > 100 else full_summary
-                                            
-                                            reports.append({
-                                                "title": str(row[0])[:100] if len(row) > 0 and row[0] else "Financial Report",
-                                                "symbol": str(row[1]) if len(row) > 1 and row[1] else "",
-                                                "published_date": str(row[2]) if len(row) > 2 and row[2] else "",
-                                                "summary": short_summary,
-                                                "summary_full": full_summary,
-                                                "document_id": str(row[0])[:50] if len(row) > 0 and row[0] else "",  # Use title as temp ID
-                                                "index": "financial_reports"
-                                            })
-                                    
-                                    if reports:
-                                        self.logger.info(f"Successfully parsed {len(reports)} reports from ES|QL")
-                                        return reports
-                                        
-                            except json.JSONDecodeError as e:
-                                self.logger.warning(f"Could not parse execute_esql reports response as JSON: {e}")
-                        break
-                        
-            except Exception as e:
-                self.logger.warning(f"ES|QL reports query failed: {query} - {e}")
-                continue
+        reports = []
+        append = reports.append
+        for row in await self._first_esql_rows(server_id, _REPORTS_ESQL_QUERIES):
+            if len(row) >= 3:  # At least title, symbol, date
+                full_summary = str(row[3]) if len(row) > 3 and row[3] else (str(row[4]) if len(row) > 4 and row[4] else "No summary available")
+                short_summary = _trunc(full_summary, 100)
+                
+                append({
+                    "title": _trunc(str(row[0]), 100) if len(row) > 0 and row[0] else "Financial Report",
+                    "symbol": str(row[1]) if len(row) > 1 and row[1] else "",
+                    "published_date": str(row[2]) if len(row) > 2 and row[2] else "",
+                    "summary": short_summary,
+                    "summary_full": full_summary,
+                    "document_id": str(row[0])[:50] if len(row) > 0 and row[0] else "",  # Use title as temp ID
+                    "index": "financial_reports"
+                })
         
+        if reports:
+            self.logger.info(f"Successfully parsed {len(reports)} reports from ES|QL")
         return reports
     
     async def _get_reports_via_relevance_search(self, server_id: str) -> List[Dict[str, Any]]:
         """Get reports using relevance search"""
-        arguments = {
-            "term": "financial reports analysis",
-            "index": "financial_reports",
-            "size": 10
-        }
-        
         reports = []
-        async for result in mcp_manager.execute_tool(server_id, "relevance_search", arguments):
-            if result["type"] == "tool_result":
-                content = result["content"]
-                if isinstance(content, dict) and "text" in content:
-                    try:
-                        data = json.loads(content["text"])
-                        self.logger.info(f"Parsed relevance_search reports data: {json.dumps(data, indent=2)}")
-                        
-                        # Handle ES MCP server response format (same as nl_search)
-                        if "result" in data and "results" in data["result"]:
-                            results = data["result"]["results"]
-                            for i, result_item in enumerate(results[:10]):  # Top 10
-                                # Extract highlights as summary
-                                highlights = result_item.get("highlights", [])
-                                full_summary = " ".join(highlights) if highlights else "No summary available"
-                                short_summary = full_summary[:100] + "..." if len(full_summary) > 100 else full_summary
-                                
-                                # Create a more descriptive title from highlights or use a generic one
-                                title = f"Financial Report {i+1}"
-                                if highlights:
-                                    # Try to extract a title-like phrase from the first highlight
-                                    first_highlight = highlights[0]
-                                    # Remove HTML tags and take first part
-                                    clean_highlight = first_highlight.replace('<em>', '').replace('</em>', '')
-                                    if len(clean_highlight) > 20:
-                                        title = clean_highlight[:60] + "..." if len(clean_highlight) > 60 else clean_highlight
-                                
-                                reports.append({
-                                    "title": title,
-                                    "symbol": "",  # Not available in highlights format
-                                    "published_date": "",  # Not available in highlights format  
-                                    "summary": short_summary,  # Short version for display
-                                    "summary_full": full_summary,  # Full version for expansion
-                                    "document_id": result_item.get("id", ""),  # ES document ID for full report retrieval
-                                    "index": result_item.get("index", "financial_reports")  # ES index name
-                                })
-                            
-                            if reports:
-                                self.logger.info(f"Successfully parsed {len(reports)} reports from relevance_search")
-                                return reports
-                        # Fallback to standard Elasticsearch format
-                        elif "result" in data and "hits" in data["result"]:
-                            hits = data["result"]["hits"]["hits"]
-                            for hit in hits:
-                                source = hit.get("_source", {})
-                                reports.append({
-                                    "title": source.get("title", "No title"),
-                                    "symbol": source.get("symbol", ""),
-                                    "published_date": source.get("published_date", ""),
-                                    "summary": (source.get("summary", source.get("content", ""))[:100] + "...") if source.get("summary", source.get("content", "")) else "No summary available",
-                                    "summary_full": source.get("summary", source.get("content", "")) or "No summary available",
-                                    "document_id": hit.get("_id", ""),
-                                    "index": "financial_reports"
-                                })
-                    except json.JSONDecodeError:
-                        self.logger.warning(f"Could not parse relevance_search reports response as JSON")
-                break
+        data = await self._call_tool_json(server_id, "relevance_search", _REPORTS_RELEVANCE_SEARCH_ARGS)
+        if data is not None:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Parsed relevance_search reports data: %s", orjson.dumps(data).decode())
+            
+            # Handle ES MCP server response format (same as nl_search)
+            if "result" in data and "results" in data["result"]:
+                results = data["result"]["results"] or ()
+                reports = _parse_highlight_results(results, "Financial Report", "financial_reports")
+                
+                if reports:
+                    self.logger.info(f"Successfully parsed {len(reports)} reports from relevance_search")
+                    return reports
+            # Fallback to standard Elasticsearch format
+            elif "result" in data and "hits" in data["result"]:
+                hits = data["result"]["hits"]["hits"]
+                reports = _parse_es_hits(hits, "financial_reports", 100)
         
         return reports
     
     async def _get_news_from_server(self, server_id: str, server) -> List[Dict[str, Any]]:
         """Try to get news data from a specific MCP server"""
-        news_stories = []
-        
-        # Check what tools this server has available for news
-        available_tools = server.tools.keys()
-        self.logger.debug(f"Server {server_id} has tools: {list(available_tools)}")
-        
-        # Try different strategies based on available tools
+        strategies = self._strategies_for("news", server_id, server)
         
-        # Strategy 1: Use execute_esql if available (more reliable for ES MCP)
-        if "execute_esql" in available_tools:
-            try:
-                news_stories = await self._get_news_via_esql(server_id)
-                if news_stories:
-                    return news_stories
-            except Exception as e:
-                self.logger.warning(f"execute_esql failed on {server_id}: {e}")
-        
-        # Strategy 2: Use nl_search if available  
-        if "nl_search" in available_tools:
-            try:
-                news_stories = await self._get_news_via_nl_search(server_id)
-                if news_stories:
-                    return news_stories
-            except Exception as e:
-                self.logger.warning(f"nl_search failed on {server_id}: {e}")
-        
-        # Strategy 3: Use relevance_search if available
-        if "relevance_search" in available_tools:
-            try:
-                news_stories = await self._get_news_via_relevance_search(server_id)
-                if news_stories:
-                    return news_stories
-            except Exception as e:
-                self.logger.warning(f"relevance_search failed on {server_id}: {e}")
-        
-        return news_stories
+        return await self._race_strategies(server_id, strategies)
     
     async def _get_news_via_nl_search(self, server_id: str) -> List[Dict[str, Any]]:
         """Get news using natural language search"""
-        arguments = {
-            "query": "latest financial news stories published in the last 7 days",
-            "index": "financial_news",
-            "size": 10,
-            "include_source": True
-        }
-        
         news_stories = []
-        async for result in mcp_manager.execute_tool(server_id, "nl_search", arguments):
-            if result["type"] == "tool_result":
-                content = result["content"]
-                if isinstance(content, dict) and "text" in content:
-                    # Parse the JSON response
-                    try:
-                        data = json.loads(content["text"])
-                        self.logger.info(f"Parsed nl_search data: {json.dumps(data, indent=2)}")
-                        
-                        # Handle ES MCP server response format
-                        if "result" in data and "results" in data["result"]:
-                            results = data["result"]["results"]
-                            for i, result_item in enumerate(results[:10]):  # Top 10
-                                # Extract highlights as summary
-                                highlights = result_item.get("highlights", [])
-                                full_summary = " ".join(highlights) if highlights else "No summary available"
-                                short_summary = full_summary[:100] + "..." if len(full_summary) > 100 else full_summary
-                                
-                                # Create a more descriptive title from highlights or use a generic one
-                                title = f"Financial News Story {i+1}"
-                                if highlights:
-                                    # Try to extract a title-like phrase from the first highlight
-                                    first_highlight = highlights[0]
-                                    # Remove HTML tags and take first part
-                                    clean_highlight = first_highlight.replace('<em>', '').replace('</em>', '')
-                                    if len(clean_highlight) > 20:
-                                        title = clean_highlight[:60] + "..." if len(clean_highlight) > 60 else clean_highlight
-                                
-                                news_stories.append({
-                                    "title": title,
-                                    "symbol": "",  # Not available in highlights format
-                                    "published_date": "",  # Not available in highlights format  
-                                    "summary": short_summary,  # Short version for display
-                                    "summary_full": full_summary,  # Full version for expansion
-                                    "document_id": result_item.get("id", ""),  # ES document ID for full article retrieval
-                                    "index": result_item.get("index", "financial_news")  # ES index name
-                                })
-                            
-                            if news_stories:
-                                self.logger.info(f"Successfully parsed {len(news_stories)} news stories from nl_search")
-                                return news_stories
-                        # Fallback to standard Elasticsearch format
-                        elif "result" in data and "hits" in data["result"]:
-                            hits = data["result"]["hits"]["hits"]
-                            for hit in hits[:10]:  # Top 10
-                                source = hit.get("_source", {})
-                                news_stories.append({
-                                    "title": source.get("title", "No title"),
-                                    "symbol": source.get("symbol", ""),
-                                    "published_date": source.get("published_date", ""),
-                                    "summary": source.get("summary", source.get("content", ""))[:200] + "..." if source.get("summary", source.get("content", "")) else "No summary available"
-                                })
-                    except json.JSONDecodeError:
-                        self.logger.warning(f"Could not parse nl_search response as JSON")
-                break
+        data = await self._call_tool_json(server_id, "nl_search", _NEWS_NL_SEARCH_ARGS)
+        if data is not None:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Parsed nl_search data: %s", orjson.dumps(data).decode())
+            
+            # Handle ES MCP server response format
+            if "result" in data and "results" in data["result"]:
+                results = data["result"]["results"] or ()
+                news_stories = _parse_highlight_results(results, "Financial News Story", "financial_news")
+                
+                if news_stories:
+                    self.logger.info(f"Successfully parsed {len(news_stories)} news stories from nl_search")
+                    return news_stories
+            # Fallback to standard Elasticsearch format
+            elif "result" in data and "hits" in data["result"]:
+                hits = data["result"]["hits"]["hits"]
+                news_stories = _parse_es_hits(hits, "financial_news", 200)
         
         return news_stories
     
     async def _get_news_via_esql(self, server_id: str) -> List[Dict[str, Any]]:
         """Get news using ES|QL query"""
-        # Try different ES|QL queries to get news data
-        queries = [
-            "FROM financial_news | SORT published_date DESC | LIMIT 10 | KEEP title, symbol, published_date, summary",
-            "FROM financial_news | SORT @timestamp DESC | LIMIT 10 | KEEP title, symbol, published_date, summary", 
-            "FROM financial_news | LIMIT 10 | KEEP title, symbol, published_date, summary, content"
-        ]
-        
-        for query in queries:
-            self.logger.info(f"Trying ES|QL query: {query}")
-            arguments = {"query": query}
-            
-            news_stories = []
-            try:
-                async for result in mcp_manager.execute_tool(server_id, "execute_esql", arguments):
-                    if result["type"] == "tool_result":
-                        content = result["content"]
-                        self.logger.info(f"ES|QL result content: {content}")
-                        
-                        if isinstance(content, dict) and "text" in content:
-                            try:
-                                data = json.loads(content["text"])
-                                self.logger.info(f"Parsed ES|QL data: {json.dumps(data, indent=2)}")
-                                
-                                if "result" in data and "values" in data["result"]:
-                                    columns = data["result"].get("columns", [])
-                                    values = data["result"].get("values", [])
-                                    self.logger.info(f"ES|QL columns: {columns}")
-                                    self.logger.info(f"ES|QL values count: {len(values)}")
-                                    
-                                    # Map columns to values
-                                    for row in values:
-                                        if len(row) >= 3:  # At least title, symbol, date
-                                            news_stories.append({
-                                                "title": str(row[0])[:100] if len(row) > 0 and row[0] else "Financial News",
-                                                "symbol": str(row[1]) if len(row) > 1 and row[1] else "",
-                                                "published_date": str(row[2]) if len(row) > 2 and row[2] else "",
-                                                "summary": (str(row[3])[:200] + "...") if len(row) > 3 and row[3] else (str(row[4])[:200] + "..." if len(row) > 4 and row[4] else "No summary available")
-                                            })
-                                    
-                                    if news_stories:
-                                        self.logger.info(f"Successfully parsed {len(news_stories)} news stories from ES|QL")
-                                        return news_stories
-                                        
-                            except json.JSONDecodeError as e:
-                                self.logger.warning(f"Could not parse execute_esql response as JSON: {e}")
-                        break
-                        
-            except Exception as e:
-                self.logger.warning(f"ES|QL query failed: {query} - {e}")
-                continue
+        news_stories = []
+        append = news_stories.append
+        for row in await self._first_esql_rows(server_id, _NEWS_ESQL_QUERIES):
+            if len(row) >= 3:  # At least title, symbol, date
+                append({
+                    "title": _trunc(str(row[0]), 100) if len(row) > 0 and row[0] else "Financial News",
+                    "symbol": str(row[1]) if len(row) > 1 and row[1] else "",
+                    "published_date": str(row[2]) if len(row) > 2 and row[2] else "",
+                    "summary": _trunc(str(row[3]), 200) if len(row) > 3 and row[3] else (_trunc(str(row[4]), 200) if len(row) > 4 and row[4] else "No summary available")
+                })
         
+        if news_stories:
+            self.logger.info(f"Successfully parsed {len(news_stories)} news stories from ES|QL")
         return news_stories
     
     async def _get_news_via_relevance_search(self, server_id: str) -> List[Dict[str, Any]]:
         """Get news using relevance search"""
-        arguments = {
-            "term": "financial news",
-            "index": "financial_news",
-            "size": 10
-        }
-        
         news_stories = []
-        async for result in mcp_manager.execute_tool(server_id, "relevance_search", arguments):
-            if result["type"] == "tool_result":
-                content = result["content"]
-                if isinstance(content, dict) and "text" in content:
-                    try:
-                        data = json.loads(content["text"])
-                        self.logger.info(f"Parsed relevance_search data: {json.dumps(data, indent=2)}")
-                        
-                        # Handle ES MCP server response format (same as nl_search)
-                        if "result" in data and "results" in data["result"]:
-                            results = data["result"]["results"]
-                            for i, result_item in enumerate(results[:10]):  # Top 10
-                                # Extract highlights as summary
-                                highlights = result_item.get("highlights", [])
-                                full_summary = " ".join(highlights) if highlights else "No summary available"
-                                short_summary = full_summary[:100] + "..." if len(full_summary) > 100 else full_summary
-                                
-                                # Create a more descriptive title from highlights or use a generic one
-                                title = f"Financial News Story {i+1}"
-                                if highlights:
-                                    # Try to extract a title-like phrase from the first highlight
-                                    first_highlight = highlights[0]
-                                    # Remove HTML tags and take first part
-                                    clean_highlight = first_highlight.replace('<em>', '').replace('</em>', '')
-                                    if len(clean_highlight) > 20:
-                                        title = clean_highlight[:60] + "..." if len(clean_highlight) > 60 else clean_highlight
-                                
-                                news_stories.append({
-                                    "title": title,
-                                    "symbol": "",  # Not available in highlights format
-                                    "published_date": "",  # Not available in highlights format  
-                                    "summary": short_summary,  # Short version for display
-                                    "summary_full": full_summary,  # Full version for expansion
-                                    "document_id": result_item.get("id", ""),  # ES document ID for full article retrieval
-                                    "index": result_item.get("index", "financial_news")  # ES index name
-                                })
-                            
-                            if news_stories:
-                                self.logger.info(f"Successfully parsed {len(news_stories)} news stories from relevance_search")
-                                return news_stories
-                        # Fallback to standard Elasticsearch format
-                        elif "result" in data and "hits" in data["result"]:
-                            hits = data["result"]["hits"]["hits"]
-                            for hit in hits:
-                                source = hit.get("_source", {})
-                                news_stories.append({
-                                    "title": source.get("title", "No title"),
-                                    "symbol": source.get("symbol", ""),
-                                    "published_date": source.get("published_date", ""),
-                                    "summary": (source.get("summary", source.get("content", ""))[:200] + "...") if source.get("summary", source.get("content", "")) else "No summary available"
-                                })
-                    except json.JSONDecodeError:
-                        self.logger.warning(f"Could not parse relevance_search response as JSON")
-                break
+        data = await self._call_tool_json(server_id, "relevance_search", _NEWS_RELEVANCE_SEARCH_ARGS)
+        if data is not None:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Parsed relevance_search data: %s", orjson.dumps(data).decode())
+            
+            # Handle ES MCP server response format (same as nl_search)
+            if "result" in data and "results" in data["result"]:
+                results = data["result"]["results"] or ()
+                news_stories = _parse_highlight_results(results, "Financial News Story", "financial_news")
+                
+                if news_stories:
+                    self.logger.info(f"Successfully parsed {len(news_stories)} news stories from relevance_search")
+                    return news_stories
+            # Fallback to standard Elasticsearch format
+            elif "result" in data and "hits" in data["result"]:
+                hits = data["result"]["hits"]["hits"]
+                news_stories = _parse_es_hits(hits, "financial_news", 200)
         
         return news_stories
 
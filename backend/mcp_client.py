@@ -3,18 +3,145 @@ Clean HTTP-based MCP client implementation following the standard MCP protocol.
 Based on the mcp-remote package approach and MCP specification.
 """
 
-import json
+import os
 import logging
 import asyncio
 import uuid
-from typing import Dict, List, Any, Optional, AsyncGenerator
-from dataclasses import dataclass, asdict
+import itertools
+import hashlib
+import re
+from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from collections import deque
 import httpx
+import orjson
 import time
 
 logger = logging.getLogger(__name__)
 
+# Connection pool limits for each MCP server's persistent HTTP client
+MCP_CLIENT_MAX_CONNECTIONS = int(os.getenv("MCP_CLIENT_MAX_CONNECTIONS", "100"))
+MCP_CLIENT_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("MCP_CLIENT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+MCP_CLIENT_KEEPALIVE_EXPIRY = 30.0
+
+USER_AGENT = "Portfolio-Pilot-AI/1.0"
+
+# HTTP error bodies are truncated to this many characters in logs and exceptions
+MAX_ERROR_BODY_CHARS = 2000
+
+# Parameters of the MCP initialize handshake
+INITIALIZE_PARAMS = {
+    "clientInfo": {
+        "name": "Portfolio-Pilot-AI",
+        "version": "1.0.0"
+    },
+    "protocolVersion": "2025-06-18",
+    "capabilities": {
+        "tools": {},
+        "logging": {}
+    }
+}
+
+# Top-level response fields copied onto every tool_result as conversation_meta
+CONVERSATION_META_FIELDS = ("runId", "conversationId", "sessionId")
+
+# Raw MCP traffic is logged here at DEBUG; the level is toggled from the settings API
+mcp_comms_logger = logging.getLogger("mcp_comms")
+mcp_comms_logger.setLevel(
+    logging.DEBUG if os.getenv("LOG_MCP_COMMUNICATIONS", "false").lower() == "true" else logging.WARNING
+)
+
+
+class _LazyJson:
+    """Pretty-prints an object as JSON only when a log record is actually formatted"""
+    __slots__ = ("obj",)
+    
+    def __init__(self, obj: Any):
+        self.obj = obj
+    
+    def __str__(self) -> str:
+        return orjson.dumps(self.obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+_CONVERSATION_KEY_RE = re.compile(r"conversation|session|context|id", re.IGNORECASE)
+
+
+def _log_conversation_fields(obj: Any) -> None:
+    """Log every key that looks like a conversation/session identifier, at any depth"""
+    # Iterative walk carrying path parts as tuples; paths are only joined for matches
+    matches = []
+    stack = deque([(obj, ())])
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                key_path = path + (f".{key}" if path else str(key),)
+                if _CONVERSATION_KEY_RE.search(str(key)):
+                    matches.append((key_path, value))
+                stack.append((value, key_path))
+        elif isinstance(node, list):
+            for i, item in enumerate(node):
+                stack.append((item, path + (f"[{i}]",)))
+    
+    if matches:
+        mcp_comms_logger.debug(
+            "*** POTENTIAL CONVERSATION FIELDS ***\n%s",
+            "\n".join(f"{''.join(key_path)} = {value}" for key_path, value in matches)
+        )
+
+
+def _decode_json_result(response: Dict[str, Any]) -> Any:
+    """Decode a tool result: structuredContent if present, else its text content items joined and parsed once"""
+    structured = response.get("structuredContent") if isinstance(response, dict) else None
+    if structured is None:
+        text = "".join(
+            item["text"] for item in response.get("content", [])
+            if isinstance(item, dict) and "text" in item
+        )
+        structured = orjson.loads(text)
+    return structured
+
+
+# Serialized JSON-RPC bodies for calls whose params never change (initialize, ping,
+# tools/list, initialized), keyed by (method, is_request). Request bodies stop just before the id.
+_STATIC_BODIES: Dict[Tuple[str, bool], bytes] = {}
+
+
+def _jsonrpc_body(method: str, params: Dict[str, Any], request_id: Optional[int] = None) -> bytes:
+    """Serialize a JSON-RPC request (or notification when request_id is None)"""
+    static = not params or params is INITIALIZE_PARAMS
+    is_request = request_id is not None
+    body = _STATIC_BODIES.get((method, is_request)) if static else None
+    if body is None:
+        body = orjson.dumps({"jsonrpc": "2.0", "method": method, "params": params})
+        if is_request:
+            body = body[:-1] + b',"id":'
+        if static:
+            _STATIC_BODIES[(method, is_request)] = body
+    if is_request:
+        return body + orjson.dumps(request_id) + b"}"
+    return body
+
+
+def create_http_client(timeout: float = 30) -> httpx.AsyncClient:
+    """Create a pooled HTTP/2 client for MCP JSON-RPC traffic (auth is added per request)"""
+    return httpx.AsyncClient(
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": USER_AGENT
+        },
+        timeout=httpx.Timeout(timeout),
+        limits=httpx.Limits(
+            max_connections=MCP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=MCP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=MCP_CLIENT_KEEPALIVE_EXPIRY
+        ),
+        http2=True,
+        follow_redirects=True
+    )
+
 
 class MCPTransportType(Enum):
     HTTP = "http"
@@ -23,19 +150,26 @@ class MCPTransportType(Enum):
     SSE_FIRST = "sse-first"
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPTool:
     """Represents an MCP tool with its metadata"""
     name: str
     description: str
     parameters: Dict[str, Any]
     enabled: bool = True
+    # Precomputed /tools entry, filled in by MCPServer.build_tool_reprs(); never persisted
+    _api_repr: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            "name": self.name,
+            "description": self.description,
+            "parameters": self.parameters,
+            "enabled": self.enabled,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPServer:
     """Represents an MCP server configuration"""
     id: str
@@ -52,18 +186,67 @@ class MCPServer:
     conversation_location: str = "response"   # Where to find/send conversation ID: "response" or "params"
     # Main page data settings
     use_for_main_page: bool = False          # Whether to use this server for main page data enhancement
+    # Cached to_dict() output, reset on any field assignment
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.tools is None:
             self.tools = {}
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # Any field assignment (status updates, enabling, replacing tools) invalidates to_dict()
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+    
     def to_dict(self) -> Dict[str, Any]:
-        result = asdict(self)
-        # Convert tools to dict format
-        result['tools'] = {name: tool.to_dict() for name, tool in self.tools.items()}
-        # Convert enum to string for JSON serialization
-        result['transport'] = self.transport.value if isinstance(self.transport, MCPTransportType) else self.transport
+        """Serialize for config storage; built once per field change, callers get their own copy"""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "id": self.id,
+                "name": self.name,
+                "url": self.url,
+                "api_key": self.api_key,
+                # Convert enum to string for JSON serialization
+                "transport": self.transport.value if isinstance(self.transport, MCPTransportType) else self.transport,
+                "enabled": self.enabled,
+                "tools": {name: tool.to_dict() for name, tool in self.tools.items()},
+                "last_connected": self.last_connected,
+                "connection_status": self.connection_status,
+                "conversation_field": self.conversation_field,
+                "conversation_location": self.conversation_location,
+                "use_for_main_page": self.use_for_main_page,
+            }
+        # Copy the outer and per-tool dicts so callers can store or edit the result freely
+        result = dict(self._dict_cache)
+        result["tools"] = {name: dict(tool) for name, tool in result["tools"].items()}
         return result
+    
+    def build_tool_reprs(self) -> None:
+        """Precompute each tool's /tools entry; to_dict() leaves it out so it is never persisted"""
+        for name, tool in self.tools.items():
+            tool._api_repr = {
+                "name": name,
+                "description": tool.description,
+                "server": self.name,
+                "server_id": self.id
+            }
+    
+    def to_safe_dict(self) -> Dict[str, Any]:
+        """Like to_dict() but built from an allowlist, so the API key is never included"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "url": self.url,
+            "transport": self.transport.value if isinstance(self.transport, MCPTransportType) else self.transport,
+            "enabled": self.enabled,
+            "tools": {name: tool.to_dict() for name, tool in self.tools.items()},
+            "last_connected": self.last_connected,
+            "connection_status": self.connection_status,
+            "conversation_field": self.conversation_field,
+            "conversation_location": self.conversation_location,
+            "use_for_main_page": self.use_for_main_page,
+        }
 
 
 class MCPClientError(Exception):
@@ -87,16 +270,23 @@ class MCPClient:
     Supports JSON-RPC 2.0 over HTTP with proper error handling and logging.
     """
     
-    def __init__(self, server: MCPServer, timeout: int = 30):
+    def __init__(self, server: MCPServer, timeout: int = 30, http_client: Optional[httpx.AsyncClient] = None):
         self.server = server
         self.timeout = timeout
         self.session_id = str(uuid.uuid4())
-        self.http_client = None
+        # JSON-RPC ids only need to be unique per client, so a counter will do
+        self._request_ids = itertools.count(1)
+        # (digest of the last tools/list result, tools dict built from it)
+        self._tools_fingerprint: Optional[Tuple[bytes, Dict[str, MCPTool]]] = None
+        # A client passed in (the manager's shared pool) is borrowed and never closed here
+        self.http_client = http_client
+        self._owns_http_client = http_client is None
+        # Per-server headers (authentication) sent with every request
+        self.request_headers: Dict[str, str] = (
+            {"Authorization": f"ApiKey {server.api_key}"} if server.api_key else {}
+        )
         self.logger = logging.getLogger(f"mcp_client.{server.id}")
         
-        # Configure extensive logging
-        self.logger.setLevel(logging.DEBUG)
-        
     async def __aenter__(self):
         """Async context manager entry"""
         await self.connect()
@@ -106,88 +296,80 @@ class MCPClient:
         """Async context manager exit"""
         await self.disconnect()
         
-    async def connect(self) -> None:
-        """Establish connection to the MCP server"""
+    async def connect(self, discover_tools: bool = False) -> None:
+        """Establish connection to the MCP server, optionally discovering tools during the handshake"""
         try:
-            self.logger.info(f"Connecting to MCP server: {self.server.url}")
-            
-            # Create HTTP client with proper headers
-            headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "User-Agent": "Portfolio-Pilot-AI/1.0"
-            }
-            
-            if self.server.api_key:
-                headers["Authorization"] = f"ApiKey {self.server.api_key}"
-                self.logger.debug(f"Added API key authentication for server {self.server.id}")
+            self.logger.info("Connecting to MCP server: %s", self.server.url)
             
-            self.http_client = httpx.AsyncClient(
-                headers=headers,
-                timeout=self.timeout,
-                follow_redirects=True
-            )
+            if self._owns_http_client:
+                # Drop any previous client so reconnects don't leak connection pools
+                if self.http_client:
+                    await self.http_client.aclose()
+                self.http_client = create_http_client(self.timeout)
             
             # Test connection with initialize request
-            await self._initialize_session()
+            await self._initialize_session(discover_tools=discover_tools)
             
             self.server.connection_status = "connected"
             self.server.last_connected = time.time()
-            self.logger.info(f"Successfully connected to MCP server: {self.server.name}")
+            self.logger.info("Successfully connected to MCP server: %s", self.server.name)
             
         except Exception as e:
             self.server.connection_status = "error"
-            self.logger.error(f"Failed to connect to MCP server {self.server.id}: {e}")
+            self.logger.error("Failed to connect to MCP server %s: %s", self.server.id, e)
             raise MCPConnectionError(f"Failed to connect to {self.server.url}: {e}")
     
     async def disconnect(self) -> None:
         """Close connection to the MCP server"""
         if self.http_client:
-            await self.http_client.aclose()
-            self.http_client = None
+            if self._owns_http_client:
+                await self.http_client.aclose()
+                self.http_client = None
             self.server.connection_status = "disconnected"
-            self.logger.info(f"Disconnected from MCP server: {self.server.name}")
+            self.logger.info("Disconnected from MCP server: %s", self.server.name)
     
-    async def _initialize_session(self) -> None:
+    async def _initialize_session(self, discover_tools: bool = False) -> None:
         """Initialize the MCP session"""
-        self.logger.debug(f"Initializing MCP session for server {self.server.id}")
+        self.logger.debug("Initializing MCP session for server %s", self.server.id)
         
         # Send initialize request following MCP protocol
         response = await self._send_jsonrpc_request(
             method="initialize",
-            params={
-                "clientInfo": {
-                    "name": "Portfolio-Pilot-AI",
-                    "version": "1.0.0"
-                },
-                "protocolVersion": "2025-06-18",
-                "capabilities": {
-                    "tools": {},
-                    "logging": {}
-                }
-            }
+            params=INITIALIZE_PARAMS
         )
         
-        self.logger.debug(f"Initialize response: {response}")
+        self.logger.debug("Initialize response: %s", response)
         
-        # Send initialized notification
-        await self._send_jsonrpc_notification(
+        # Send initialized notification, overlapping it with tool discovery when requested
+        notification = self._send_jsonrpc_notification(
             method="initialized",
             params={}
         )
+        if discover_tools:
+            await asyncio.gather(notification, self.discover_tools())
+        else:
+            await notification
         
-        self.logger.info(f"MCP session initialized for server {self.server.id}")
+        self.logger.info("MCP session initialized for server %s", self.server.id)
     
     async def discover_tools(self) -> Dict[str, MCPTool]:
         """Discover available tools from the MCP server"""
         try:
-            self.logger.info(f"Discovering tools for server {self.server.id}")
+            self.logger.info("Discovering tools for server %s", self.server.id)
             
             response = await self._send_jsonrpc_request(
                 method="tools/list",
                 params={}
             )
             
+            # Skip rebuilding MCPTool objects when the advertised tool list hasn't changed
+            fingerprint = hashlib.blake2b(orjson.dumps(response.get("tools", [])), digest_size=8).digest()
+            if self._tools_fingerprint is not None:
+                last_fingerprint, last_tools = self._tools_fingerprint
+                if fingerprint == last_fingerprint and self.server.tools is last_tools:
+                    self.logger.debug("Tool list unchanged for server %s", self.server.id)
+                    return last_tools
+            
             tools = {}
             if "tools" in response:
                 for tool_data in response["tools"]:
@@ -200,68 +382,94 @@ class MCPClient:
                     tools[tool.name] = tool
                     
             self.server.tools = tools
-            self.logger.info(f"Discovered {len(tools)} tools for server {self.server.id}: {list(tools.keys())}")
+            self._tools_fingerprint = (fingerprint, tools)
+            self.logger.info("Discovered %s tools for server %s: %s", len(tools), self.server.id, list(tools.keys()))
             
             return tools
             
         except Exception as e:
-            self.logger.error(f"Failed to discover tools for server {self.server.id}: {e}")
+            self.logger.error("Failed to discover tools for server %s: %s", self.server.id, e)
             raise MCPClientError(f"Tool discovery failed: {e}")
     
-    async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> AsyncGenerator[Dict[str, Any], None]:
-        """Execute a tool with streaming response"""
-        try:
-            self.logger.info(f"Executing tool '{tool_name}' with arguments: {arguments}")
-            
-            # Validate tool exists
-            if tool_name not in self.server.tools:
-                raise MCPToolExecutionError(f"Tool '{tool_name}' not found in server {self.server.id}")
-            
-            # Send tool execution request
-            response = await self._send_jsonrpc_request(
-                method="tools/call",
-                params={
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            )
-            
-            # Enhanced logging for ES MCP response analysis
-            self.logger.info(f"=== FULL ES MCP RESPONSE FOR {tool_name} ===")
-            self.logger.info(f"Response type: {type(response)}")
-            self.logger.info(f"Response keys: {list(response.keys()) if isinstance(response, dict) else 'Not a dict'}")
-            self.logger.info(f"Full response: {json.dumps(response, indent=2, default=str)}")
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate and execute a tool call, returning the raw tools/call result"""
+        self.logger.info("Executing tool '%s' with arguments: %s", tool_name, arguments)
+        
+        # Validate tool exists
+        if self.server.tools.get(tool_name) is None:
+            raise MCPToolExecutionError(f"Tool '{tool_name}' not found in server {self.server.id}")
+        
+        # Send tool execution request
+        response = await self._send_jsonrpc_request(
+            method="tools/call",
+            params={
+                "name": tool_name,
+                "arguments": arguments
+            }
+        )
+        
+        # Enhanced logging for ES MCP response analysis
+        if mcp_comms_logger.isEnabledFor(logging.DEBUG):
+            mcp_comms_logger.debug("=== FULL ES MCP RESPONSE FOR %s ===", tool_name)
+            mcp_comms_logger.debug("Response type: %s", type(response))
+            mcp_comms_logger.debug("Response keys: %s", list(response.keys()) if isinstance(response, dict) else 'Not a dict')
+            mcp_comms_logger.debug("Full response: %s", _LazyJson(response))
             
             # Check for conversation-related fields
             if isinstance(response, dict):
                 for key in response.keys():
                     if 'conversation' in key.lower() or 'session' in key.lower() or 'context' in key.lower():
-                        self.logger.info(f"*** FOUND CONVERSATION-RELATED FIELD: {key} = {response[key]} ***")
+                        mcp_comms_logger.debug("*** FOUND CONVERSATION-RELATED FIELD: %s = %s ***", key, response[key])
+                mcp_comms_logger.debug("Content items: %d", len(response.get("content", ())))
+            
+            mcp_comms_logger.debug("=== END ES MCP RESPONSE ===")
+        
+        self.logger.info("Successfully executed tool '%s' on server %s", tool_name, self.server.id)
+        return response
+    
+    def _conversation_meta(self, response: Any) -> Dict[str, Any]:
+        """Pick top-level conversation/session id fields out of a tool response"""
+        if not isinstance(response, dict):
+            return {}
+        fields = CONVERSATION_META_FIELDS
+        if self.server.conversation_field:
+            fields += (self.server.conversation_field,)
+        return {field: response[field] for field in fields if field in response}
+    
+    async def execute_tool(self, tool_name: str, arguments: Dict[str, Any], decode_json: bool = False) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Execute a tool with streaming response.
+        Yields one tool_result per content item, then a tool_complete event with
+        the full raw response (for conversation ID extraction).
+        With decode_json, yields a single tool_result whose content is the decoded
+        JSON result: structuredContent when the server provides it, otherwise the
+        text content items joined and parsed once.
+        """
+        try:
+            response = await self.call_tool(tool_name, arguments)
             
-            self.logger.info("=== END ES MCP RESPONSE ===")
+            # Items carry only the well-known conversation fields; the full response
+            # follows once in the terminal tool_complete event
+            base = {"type": "tool_result", "tool_name": tool_name, "conversation_meta": self._conversation_meta(response)}
             
+            if decode_json:
+                yield {**base, "content": _decode_json_result(response)}
             # Handle streaming response
-            if "content" in response:
-                for i, content_item in enumerate(response["content"]):
-                    self.logger.info(f"Content item {i}: {type(content_item)} = {content_item}")
-                    yield {
-                        "type": "tool_result",
-                        "content": content_item,
-                        "tool_name": tool_name,
-                        "raw_response": response  # Include raw response for conversation ID extraction
-                    }
+            elif "content" in response:
+                debug = self.logger.isEnabledFor(logging.DEBUG)
+                count = 0
+                for count, content_item in enumerate(response["content"], 1):
+                    if debug:
+                        self.logger.debug("Content item %d type=%s", count, type(content_item).__name__)
+                    yield {**base, "content": content_item}
+                self.logger.info("Yielded %d content items for %s", count, tool_name)
             else:
-                yield {
-                    "type": "tool_result",
-                    "content": response,
-                    "tool_name": tool_name,
-                    "raw_response": response
-                }
-                
-            self.logger.info(f"Successfully executed tool '{tool_name}' on server {self.server.id}")
+                yield {**base, "content": response}
+            
+            yield {"type": "tool_complete", "tool_name": tool_name, "raw_response": response}
             
         except Exception as e:
-            self.logger.error(f"Failed to execute tool '{tool_name}' on server {self.server.id}: {e}")
+            self.logger.error("Failed to execute tool '%s' on server %s: %s", tool_name, self.server.id, e)
             yield {
                 "type": "error",
                 "error": str(e),
@@ -270,89 +478,77 @@ class MCPClient:
     
     async def _send_jsonrpc_request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Send a JSON-RPC request to the MCP server"""
-        request_id = str(uuid.uuid4())
-        
-        payload = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method,
-            "params": params
-        }
+        request_id = next(self._request_ids)
+        body = _jsonrpc_body(method, params, request_id)
         
-        self.logger.debug(f"Sending JSON-RPC request: {json.dumps(payload, indent=2)}")
+        if mcp_comms_logger.isEnabledFor(logging.DEBUG):
+            mcp_comms_logger.debug("Sending JSON-RPC request: %s", body.decode())
         
         try:
+            # Client default headers already declare application/json
             response = await self.http_client.post(
                 self.server.url,
-                json=payload
+                content=body,
+                headers=self.request_headers
             )
             
-            self.logger.debug(f"HTTP response status: {response.status_code}")
-            self.logger.debug(f"HTTP response headers: {dict(response.headers)}")
+            self.logger.debug("HTTP response status: %s", response.status_code)
+            self.logger.debug("HTTP response headers: %s", response.headers)
             
             response.raise_for_status()
             
-            response_data = response.json()
+            response_data = orjson.loads(response.content)
             
             # Enhanced logging for ES MCP analysis
-            self.logger.info(f"=== RAW JSON-RPC RESPONSE FROM ES MCP ===")
-            self.logger.info(f"Full response: {json.dumps(response_data, indent=2, default=str)}")
-            
-            # Look for conversation/session/context fields at all levels
-            def scan_for_conversation_fields(obj, path=""):
-                if isinstance(obj, dict):
-                    for key, value in obj.items():
-                        current_path = f"{path}.{key}" if path else key
-                        if any(keyword in key.lower() for keyword in ['conversation', 'session', 'context', 'id']):
-                            self.logger.info(f"*** POTENTIAL CONVERSATION FIELD: {current_path} = {value} ***")
-                        scan_for_conversation_fields(value, current_path)
-                elif isinstance(obj, list):
-                    for i, item in enumerate(obj):
-                        scan_for_conversation_fields(item, f"{path}[{i}]")
-            
-            scan_for_conversation_fields(response_data)
-            self.logger.info("=== END RAW JSON-RPC RESPONSE ===")
-            
-            if "error" in response_data:
-                error_msg = response_data["error"]["message"]
-                self.logger.error(f"JSON-RPC error: {error_msg}")
+            if mcp_comms_logger.isEnabledFor(logging.DEBUG):
+                mcp_comms_logger.debug("=== RAW JSON-RPC RESPONSE FROM ES MCP ===")
+                mcp_comms_logger.debug("Full response: %s", _LazyJson(response_data))
+                
+                # Look for conversation/session/context fields at all levels
+                _log_conversation_fields(response_data)
+                mcp_comms_logger.debug("=== END RAW JSON-RPC RESPONSE ===")
+            
+            error = response_data.get("error")
+            if error is not None:
+                error_msg = error.get("message", error) if isinstance(error, dict) else error
+                self.logger.error("JSON-RPC error: %s", error_msg)
                 raise MCPClientError(f"Server error: {error_msg}")
             
             return response_data.get("result", {})
             
         except httpx.HTTPStatusError as e:
-            self.logger.error(f"HTTP error: {e.response.status_code} - {e.response.text}")
-            raise MCPConnectionError(f"HTTP error {e.response.status_code}: {e.response.text}")
+            # Decode the (possibly large) error body once, and only keep the start of it
+            error_text = e.response.text[:MAX_ERROR_BODY_CHARS]
+            self.logger.error("HTTP error: %s - %s", e.response.status_code, error_text)
+            raise MCPConnectionError(f"HTTP error {e.response.status_code}: {error_text}")
         except httpx.RequestError as e:
-            self.logger.error(f"Request error: {e}")
+            self.logger.error("Request error: %s", e)
             raise MCPConnectionError(f"Request failed: {e}")
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON decode error: {e}")
+        except orjson.JSONDecodeError as e:
+            self.logger.error("JSON decode error: %s", e)
             raise MCPClientError(f"Invalid JSON response: {e}")
     
     async def _send_jsonrpc_notification(self, method: str, params: Dict[str, Any]) -> None:
         """Send a JSON-RPC notification (no response expected)"""
-        payload = {
-            "jsonrpc": "2.0",
-            "method": method,
-            "params": params
-        }
+        body = _jsonrpc_body(method, params)
         
-        self.logger.debug(f"Sending JSON-RPC notification: {json.dumps(payload, indent=2)}")
+        if mcp_comms_logger.isEnabledFor(logging.DEBUG):
+            mcp_comms_logger.debug("Sending JSON-RPC notification: %s", body.decode())
         
         try:
             response = await self.http_client.post(
                 self.server.url,
-                json=payload
+                content=body,
+                headers=self.request_headers
             )
             
-            self.logger.debug(f"Notification response status: {response.status_code}")
+            self.logger.debug("Notification response status: %s", response.status_code)
             response.raise_for_status()
             
         except httpx.HTTPStatusError as e:
-            self.logger.warning(f"Notification HTTP error: {e.response.status_code} - {e.response.text}")
+            self.logger.warning("Notification HTTP error: %s - %s", e.response.status_code, e.response.text)
         except httpx.RequestError as e:
-            self.logger.warning(f"Notification request error: {e}")
+            self.logger.warning("Notification request error: %s", e)
     
     async def health_check(self) -> bool:
         """Check if the server is healthy"""
@@ -364,7 +560,7 @@ class MCPClient:
             )
             return True
         except Exception as e:
-            self.logger.warning(f"Health check failed for server {self.server.id}: {e}")
+            self.logger.warning("Health check failed for server %s: %s", self.server.id, e)
             return False
 
 
@@ -377,28 +573,85 @@ class MCPClientManager:
         self.clients: Dict[str, MCPClient] = {}
         self.servers: Dict[str, MCPServer] = {}
         self.logger = logging.getLogger("mcp_client_manager")
+        # One connection pool shared by every server's client, created on first use
+        self._shared_http: Optional[httpx.AsyncClient] = None
+    
+    def _http_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        if self._shared_http is None:
+            self._shared_http = create_http_client()
+        return self._shared_http
+    
+    async def close(self) -> None:
+        """Disconnect all servers and close the shared HTTP client"""
+        for server_id in list(self.clients.keys()):
+            await self.remove_server(server_id)
+        if self._shared_http is not None:
+            await self._shared_http.aclose()
+            self._shared_http = None
         
     async def add_server(self, server: MCPServer) -> None:
         """Add a new MCP server"""
-        self.logger.info(f"Adding MCP server: {server.id} ({server.name})")
+        self.logger.info("Adding MCP server: %s (%s)", server.id, server.name)
         
-        # Create client for the server
-        client = MCPClient(server)
+        # Create client for the server on the shared connection pool
+        client = MCPClient(server, http_client=self._http_client())
         
         try:
-            # Test connection and discover tools
-            async with client:
-                await client.discover_tools()
+            # Test connection and discover tools, keeping the connection open for tool calls
+            await client.connect(discover_tools=True)
+            server.build_tool_reprs()
                 
             self.servers[server.id] = server
             self.clients[server.id] = client
             
-            self.logger.info(f"Successfully added MCP server: {server.id}")
+            self.logger.info("Successfully added MCP server: %s", server.id)
             
         except Exception as e:
-            self.logger.error(f"Failed to add MCP server {server.id}: {e}")
+            self.logger.error("Failed to add MCP server %s: %s", server.id, e)
+            await client.disconnect()
             raise
     
+    async def add_servers(self, servers: List[MCPServer]) -> Dict[str, Exception]:
+        """
+        Add several MCP servers concurrently, so connection and tool discovery
+        round trips overlap. Returns the exception for each server that failed;
+        one failure never cancels the others.
+        """
+        # gather rather than TaskGroup, which needs Python 3.11 (README lists 3.10+)
+        results = await asyncio.gather(
+            *(self.add_server(server) for server in servers),
+            return_exceptions=True
+        )
+        return {
+            server.id: result
+            for server, result in zip(servers, results)
+            if isinstance(result, Exception)
+        }
+    
+    async def refresh_server(self, server: MCPServer) -> None:
+        """Rediscover a server's tools, reusing its initialized session when the endpoint is unchanged"""
+        client = self.clients.get(server.id)
+        # The pool is shared, so connections stay warm either way; reuse only saves the
+        # initialize handshake, and only a session that actually completed it can skip it
+        if (client is not None and client.http_client is not None
+                and client.server.connection_status == "connected"
+                and client.server.url == server.url and client.server.api_key == server.api_key):
+            # Adopt the latest config object but keep the live connection state
+            server.connection_status = client.server.connection_status
+            server.last_connected = client.server.last_connected
+            client.server = server
+            self.servers[server.id] = server
+            try:
+                await client.discover_tools()
+                server.build_tool_reprs()
+                return
+            except MCPClientError as e:
+                self.logger.warning("Rediscovery over existing connection failed for %s, reconnecting: %s", server.id, e)
+        
+        await self.remove_server(server.id)
+        await self.add_server(server)
+    
     async def remove_server(self, server_id: str) -> None:
         """Remove an MCP server"""
         if server_id in self.clients:
@@ -409,9 +662,9 @@ class MCPClientManager:
         if server_id in self.servers:
             del self.servers[server_id]
             
-        self.logger.info(f"Removed MCP server: {server_id}")
+        self.logger.info("Removed MCP server: %s", server_id)
     
-    async def execute_tool(self, server_id: str, tool_name: str, arguments: Dict[str, Any]) -> AsyncGenerator[Dict[str, Any], None]:
+    async def execute_tool(self, server_id: str, tool_name: str, arguments: Dict[str, Any], decode_json: bool = False) -> AsyncGenerator[Dict[str, Any], None]:
         """Execute a tool on a specific server"""
         if server_id not in self.clients:
             raise MCPClientError(f"Server {server_id} not found")
@@ -422,9 +675,33 @@ class MCPClientManager:
         if client.server.connection_status != "connected":
             await client.connect()
             
-        async for result in client.execute_tool(tool_name, arguments):
+        async for result in client.execute_tool(tool_name, arguments, decode_json):
             yield result
     
+    async def call_tool_once(self, server_id: str, tool_name: str, arguments: Dict[str, Any], decode_json: bool = False) -> Dict[str, Any]:
+        """
+        Execute a tool on a specific server and return its single result without streaming:
+        a tool_result whose content is the full response (or its decoded JSON with decode_json),
+        or an error.
+        """
+        if server_id not in self.clients:
+            raise MCPClientError(f"Server {server_id} not found")
+            
+        client = self.clients[server_id]
+        
+        # Ensure connection is active
+        if client.server.connection_status != "connected":
+            await client.connect()
+        
+        try:
+            response = await client.call_tool(tool_name, arguments)
+            content = _decode_json_result(response) if decode_json else response
+        except Exception as e:
+            logger.error("Failed to execute tool '%s' on server %s: %s", tool_name, server_id, e)
+            return {"type": "error", "error": str(e), "tool_name": tool_name}
+        
+        return {"type": "tool_result", "tool_name": tool_name, "content": content}
+    
     async def get_all_tools(self) -> Dict[str, List[MCPTool]]:
         """Get all tools from all enabled servers"""
         all_tools = {}
@@ -436,13 +713,14 @@ class MCPClientManager:
         return all_tools
     
     async def health_check_all(self) -> Dict[str, bool]:
-        """Check health of all servers"""
-        results = {}
+        """Check health of all servers concurrently"""
+        server_ids = list(self.clients.keys())
+        results = await asyncio.gather(
+            *(self.clients[server_id].health_check() for server_id in server_ids),
+            return_exceptions=True
+        )
         
-        for server_id, client in self.clients.items():
-            results[server_id] = await client.health_check()
-            
-        return results
+        return {server_id: result is True for server_id, result in zip(server_ids, results)}
     
     def get_server_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all servers"""
@@ -3,28 +3,239 @@ JSON-based configuration storage for MCP servers.
 Handles persistent storage of server configurations with security considerations.
 """
 
-import json
 import os
+import mmap
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, List, Any, Optional, Mapping, Iterable, Union
+from types import MappingProxyType
 from pathlib import Path
 from dataclasses import asdict
 import time
 
+import orjson
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+
 from mcp_client import MCPServer, MCPTool, MCPTransportType
 
 logger = logging.getLogger(__name__)
 
 CONFIG_FILE = Path(__file__).parent / "mcp_servers.json"
 
+# Exports are pretty-printed with sorted keys for people to read and diff; routine saves are compact
+_EXPORT_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+
+# Transport enum members by stored value; a dict hit instead of Enum's value lookup per server
+_TRANSPORTS = {transport.value: transport for transport in MCPTransportType}
+
+# Below one page a plain read() is cheaper than setting up a mapping
+_MMAP_MIN_BYTES = mmap.PAGESIZE
+
+
+class _ToolEntry(TypedDict):
+    name: str
+    description: str
+    parameters: Dict[str, Any]
+    enabled: NotRequired[bool]
+
+
+class _ServerEntry(TypedDict):
+    id: str
+    name: str
+    url: str
+    api_key: NotRequired[Optional[str]]
+    transport: NotRequired[MCPTransportType]
+    enabled: NotRequired[bool]
+    tools: NotRequired[Dict[str, _ToolEntry]]
+    last_connected: NotRequired[Optional[float]]
+    connection_status: NotRequired[str]
+    conversation_field: NotRequired[Optional[str]]
+    conversation_location: NotRequired[str]
+    use_for_main_page: NotRequired[bool]
+
+
+class _ConfigFile(TypedDict):
+    servers: Dict[str, _ServerEntry]
+
+
+# Shape of mcp_servers.json, compiled once into a pydantic-core validator
+_CONFIG_VALIDATOR = TypeAdapter(_ConfigFile)
+
+
+def _is_valid_config(config: Any) -> bool:
+    """Check config against the expected shape without building an error report"""
+    try:
+        _CONFIG_VALIDATOR.validate_python(config)
+        return True
+    except ValidationError:
+        return False
+
+
+def _validate_config(config: Any) -> None:
+    """Raise ValueError listing every problem if config does not match the expected shape"""
+    try:
+        _CONFIG_VALIDATOR.validate_python(config)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or '<root>'}: {error['msg']}"
+            for error in e.errors(include_url=False)
+        )
+        raise ValueError(f"Invalid configuration format: {problems}") from e
+
+
+def _load_json_file(path: Union[str, Path]) -> Any:
+    """Parse a JSON file, mmapping it instead of copying it into a buffer when it is large"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        if size < _MMAP_MIN_BYTES:
+            with os.fdopen(os.dup(fd), 'rb') as f:
+                return orjson.loads(f.read())
+        with mmap.mmap(fd, size, prot=mmap.PROT_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            # The view must be released before the mapping can close
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+    finally:
+        os.close(fd)
+
+
+# Written on first start; kept as serialized bytes so each default write starts from a fresh copy
+_DEFAULT_CONFIG_TEMPLATE = orjson.dumps({
+    "version": "1.0",
+    "servers": {
+        "local": {
+            "id": "local", 
+            "name": "Portfolio-Pilot-AI (Local)",
+            "url": "http://localhost:8000",
+            "api_key": None,
+            "transport": "http",
+            "enabled": False,  # Disable by default to avoid circular dependency
+            "tools": {
+                "get_high_value_holdings_by_sector": {
+                    "name": "get_high_value_holdings_by_sector",
+                    "description": "Get high value holdings by sector",
+                    "enabled": True,
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "sector": {"type": "string"}
+                        },
+                        "required": ["sector"]
+                    }
+                },
+                "get_accounts_by_state": {
+                    "name": "get_accounts_by_state",
+                    "description": "Get accounts by state",
+                    "enabled": True,
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "state": {"type": "string"}
+                        },
+                        "required": ["state"]
+                    }
+                },
+                "list_recent_news": {
+                    "name": "list_recent_news",
+                    "description": "List the most recent financial news, newest first",
+                    "enabled": True,
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "limit": {"type": "integer", "default": 20},
+                            "since_days": {"type": "integer", "default": 7}
+                        },
+                        "required": ["limit"]
+                    }
+                },
+                "list_recent_reports": {
+                    "name": "list_recent_reports",
+                    "description": "List the most recent financial reports, newest first",
+                    "enabled": True,
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "limit": {"type": "integer", "default": 20},
+                            "since_days": {"type": "integer", "default": 7}
+                        },
+                        "required": ["limit"]
+                    }
+                },
+                "list_accounts": {
+                    "name": "list_accounts",
+                    "description": "List accounts, up to limit",
+                    "enabled": True,
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "limit": {"type": "integer", "default": 20}
+                        },
+                        "required": ["limit"]
+                    }
+                },
+                "get_account_details_by_id": {
+                    "name": "get_account_details_by_id",
+                    "description": "Get account details by ID",
+                    "enabled": True,
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "account_id": {"type": "string"}
+                        },
+                        "required": ["account_id"]
+                    }
+                },
+                "get_news_by_asset": {
+                    "name": "get_news_by_asset",
+                    "description": "Get news by asset symbol",
+                    "enabled": True,
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "symbol": {"type": "string"}
+                        },
+                        "required": ["symbol"]
+                    }
+                }
+            },
+            "last_connected": None,
+            "connection_status": "unknown"
+        }
+    }
+})
+
 
 class MCPConfigManager:
     """Manages persistent configuration for MCP servers"""
     
     def __init__(self, config_file: Optional[Path] = None):
         self.config_file = config_file or CONFIG_FILE
+        # Plain string paths for the load/save syscalls, resolved once
+        self._config_path = os.fspath(self.config_file)
+        self._tmp_path = os.fspath(self.config_file.with_suffix('.json.tmp'))
         self.logger = logging.getLogger("mcp_config_manager")
         
+        # Enabled servers and redacted config, rebuilt lazily after any config write
+        self._enabled_cache: Optional[Mapping[str, MCPServer]] = None
+        self._safe_config_cache: Optional[Dict[str, Any]] = None
+        self._tools_cache: Optional[List[Dict[str, Any]]] = None
+        
+        # Parsed config file, reused until the file's mtime changes
+        self._config_cache: Optional[Dict[str, Any]] = None
+        self._config_mtime_ns = 0
+        # Whether the cached config passed schema validation; if so servers are built without per-entry guards
+        self._config_valid = False
+        
+        # Bumped on every config write; lets HTTP clients revalidate cached responses cheaply
+        self.version = 0
+        
+        # Writers run in worker threads while readers stay on the event loop. The cached config is
+        # never mutated in place: writers edit a copy under this lock, save it, then swap it in.
+        self._lock = threading.RLock()
+        
         # Ensure config directory exists
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
         
@@ -32,189 +243,150 @@ class MCPConfigManager:
         if not self.config_file.exists():
             self._create_default_config()
     
-    def _create_default_config(self) -> None:
-        """Create default configuration with local server"""
+    def _create_default_config(self) -> Dict[str, Any]:
+        """Create default configuration with local server and return it"""
         self.logger.info("Creating default MCP configuration")
         
-        default_config = {
-            "version": "1.0",
-            "created_at": time.time(),
-            "servers": {
-                "local": {
-                    "id": "local", 
-                    "name": "Portfolio-Pilot-AI (Local)",
-                    "url": "http://localhost:8000",
-                    "api_key": None,
-                    "transport": "http",
-                    "enabled": False,  # Disable by default to avoid circular dependency
-                    "tools": {
-                        "get_high_value_holdings_by_sector": {
-                            "name": "get_high_value_holdings_by_sector",
-                            "description": "Get high value holdings by sector",
-                            "enabled": True,
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "sector": {"type": "string"}
-                                },
-                                "required": ["sector"]
-                            }
-                        },
-                        "get_accounts_by_state": {
-                            "name": "get_accounts_by_state",
-                            "description": "Get accounts by state",
-                            "enabled": True,
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "state": {"type": "string"}
-                                },
-                                "required": ["state"]
-                            }
-                        },
-                        "get_all_news": {
-                            "name": "get_all_news",
-                            "description": "Get all financial news",
-                            "enabled": True,
-                            "parameters": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        },
-                        "get_all_reports": {
-                            "name": "get_all_reports",
-                            "description": "Get all financial reports",
-                            "enabled": True,
-                            "parameters": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        },
-                        "get_all_accounts": {
-                            "name": "get_all_accounts",
-                            "description": "Get all accounts",
-                            "enabled": True,
-                            "parameters": {
-                                "type": "object",
-                                "properties": {}
-                            }
-                        },
-                        "get_account_details_by_id": {
-                            "name": "get_account_details_by_id",
-                            "description": "Get account details by ID",
-                            "enabled": True,
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "account_id": {"type": "string"}
-                                },
-                                "required": ["account_id"]
-                            }
-                        },
-                        "get_news_by_asset": {
-                            "name": "get_news_by_asset",
-                            "description": "Get news by asset symbol",
-                            "enabled": True,
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "symbol": {"type": "string"}
-                                },
-                                "required": ["symbol"]
-                            }
-                        }
-                    },
-                    "last_connected": None,
-                    "connection_status": "unknown"
-                }
-            }
-        }
+        default_config = orjson.loads(_DEFAULT_CONFIG_TEMPLATE)
+        default_config["created_at"] = time.time()
         
-        self._save_config(default_config)
+        # Recreated on the next start if lost, so skip the fsync
+        self._save_config(default_config, durable=False)
         self.logger.info("Default MCP configuration created")
+        return default_config
+    
+    def _invalidate_caches(self) -> None:
+        """Drop derived caches; server membership, enabled flags or settings may have changed"""
+        self._enabled_cache = None
+        self._safe_config_cache = None
+        self._tools_cache = None
+        self.version += 1
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from JSON file"""
-        try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
+        """Load configuration from JSON file, reusing the parsed copy while the file is unchanged"""
+        with self._lock:
+            try:
+                mtime_ns = os.stat(self._config_path).st_mtime_ns
+                if self._config_cache is not None and mtime_ns == self._config_mtime_ns:
+                    return self._config_cache
                 
-            self.logger.debug(f"Loaded MCP configuration from {self.config_file}")
-            return config
-            
-        except FileNotFoundError:
-            self.logger.warning(f"Config file not found: {self.config_file}")
-            self._create_default_config()
-            return self._load_config()
-            
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Invalid JSON in config file: {e}")
-            # Backup corrupted config and create new one
-            backup_file = self.config_file.with_suffix('.json.backup')
-            self.config_file.rename(backup_file)
-            self.logger.info(f"Backed up corrupted config to {backup_file}")
-            self._create_default_config()
-            return self._load_config()
-            
-        except Exception as e:
-            self.logger.error(f"Error loading config: {e}")
-            raise
-    
-    def _save_config(self, config: Dict[str, Any]) -> None:
-        """Save configuration to JSON file"""
-        try:
-            # Create backup of existing config
-            if self.config_file.exists():
+                config = _load_json_file(self._config_path)
+                
+                # File was edited outside this process
+                if self._config_cache is not None:
+                    self.logger.info(f"MCP configuration changed on disk, reloading {self.config_file}")
+                    self._invalidate_caches()
+                
+                self._config_cache = config
+                self._config_mtime_ns = mtime_ns
+                self._config_valid = _is_valid_config(config)
+                self.logger.debug(f"Loaded MCP configuration from {self.config_file}")
+                return config
+                
+            except FileNotFoundError:
+                self.logger.warning(f"Config file not found: {self.config_file}")
+                return self._create_default_config()
+                
+            except orjson.JSONDecodeError as e:
+                self.logger.error(f"Invalid JSON in config file: {e}")
+                # Backup corrupted config and create new one
                 backup_file = self.config_file.with_suffix('.json.backup')
                 self.config_file.rename(backup_file)
-            
-            # Update timestamp
-            config["updated_at"] = time.time()
-            
-            # Save with proper formatting
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2, sort_keys=True)
-            
-            self.logger.debug(f"Saved MCP configuration to {self.config_file}")
-            
-        except Exception as e:
-            self.logger.error(f"Error saving config: {e}")
-            raise
+                self.logger.info(f"Backed up corrupted config to {backup_file}")
+                return self._create_default_config()
+                
+            except Exception as e:
+                self.logger.error(f"Error loading config: {e}")
+                raise
     
-    def get_all_servers(self) -> Dict[str, MCPServer]:
-        """Get all configured MCP servers"""
-        config = self._load_config()
-        servers = {}
-        
-        for server_id, server_data in config.get("servers", {}).items():
+    def _save_config(self, config: Dict[str, Any], durable: bool = True) -> None:
+        """
+        Save configuration to JSON file atomically (write a temp file, then replace).
+        With durable, the temp file is fsynced first so the new config survives a crash.
+        """
+        with self._lock:
             try:
-                # Convert tools data to MCPTool objects
-                tools = {}
-                for tool_name, tool_data in server_data.get("tools", {}).items():
-                    tools[tool_name] = MCPTool(
-                        name=tool_data["name"],
-                        description=tool_data["description"],
-                        parameters=tool_data["parameters"],
-                        enabled=tool_data.get("enabled", True)
-                    )
+                self._invalidate_caches()
+                
+                # Update timestamp
+                config["updated_at"] = time.time()
                 
-                server = MCPServer(
-                    id=server_data["id"],
-                    name=server_data["name"],
-                    url=server_data["url"],
-                    api_key=server_data.get("api_key"),
-                    transport=MCPTransportType(server_data.get("transport", "http")),
-                    enabled=server_data.get("enabled", True),
-                    tools=tools,
-                    last_connected=server_data.get("last_connected"),
-                    connection_status=server_data.get("connection_status", "unknown"),
-                    conversation_field=server_data.get("conversation_field"),
-                    conversation_location=server_data.get("conversation_location", "response"),
-                    use_for_main_page=server_data.get("use_for_main_page", False)
-                )
+                # Readers never see a partial file; a backup is only taken when a corrupt config is found
+                with open(self._tmp_path, 'wb') as f:
+                    f.write(orjson.dumps(config))
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(self._tmp_path, self._config_path)
                 
-                servers[server_id] = server
+                self._config_cache = config
+                self._config_mtime_ns = os.stat(self._config_path).st_mtime_ns
+                self._config_valid = _is_valid_config(config)
+                
+                self.logger.debug(f"Saved MCP configuration to {self.config_file}")
                 
+            except Exception as e:
+                # Writers only ever save a copy, so the cached config is still what is on disk
+                self.logger.error(f"Error saving config: {e}")
+                raise
+    
+    def _config_for_update(self) -> Dict[str, Any]:
+        """Get a private deep copy of the current config for a writer to change; call with the lock held"""
+        return orjson.loads(orjson.dumps(self._load_config()))
+    
+    def _build_tools(self, server_data: Dict[str, Any]) -> Dict[str, MCPTool]:
+        """Convert a server entry's stored tools data to MCPTool objects"""
+        tool = MCPTool
+        return {
+            tool_name: tool(
+                name=tool_data["name"],
+                description=tool_data["description"],
+                parameters=tool_data["parameters"],
+                enabled=tool_data.get("enabled", True)
+            )
+            for tool_name, tool_data in server_data.get("tools", {}).items()
+        }
+    
+    def _build_server(self, server_data: Dict[str, Any]) -> MCPServer:
+        """Build an MCPServer (and its MCPTools) from its stored config entry"""
+        get = server_data.get
+        server = MCPServer(
+            id=server_data["id"],
+            name=server_data["name"],
+            url=server_data["url"],
+            api_key=get("api_key"),
+            transport=_TRANSPORTS[get("transport", "http")],
+            enabled=get("enabled", True),
+            tools=self._build_tools(server_data),
+            last_connected=get("last_connected"),
+            connection_status=get("connection_status", "unknown"),
+            conversation_field=get("conversation_field"),
+            conversation_location=get("conversation_location", "response"),
+            use_for_main_page=get("use_for_main_page", False)
+        )
+        server.build_tool_reprs()
+        return server
+    
+    def _build_servers(self, enabled_only: bool = False) -> Dict[str, MCPServer]:
+        """Build MCPServers from the config, skipping disabled entries before construction if enabled_only"""
+        config = self._load_config()
+        
+        # Fast path: the whole file was validated on load, so no entry can fail to build
+        if self._config_valid:
+            servers = {
+                server_id: self._build_server(server_data)
+                for server_id, server_data in config["servers"].items()
+                if not enabled_only or server_data.get("enabled", True)
+            }
+            self.logger.debug(f"Loaded {len(servers)} MCP servers from config")
+            return servers
+        
+        servers = {}
+        for server_id, server_data in config.get("servers", {}).items():
+            try:
+                if enabled_only and not server_data.get("enabled", True):
+                    continue
+                servers[server_id] = self._build_server(server_data)
             except Exception as e:
                 self.logger.error(f"Error parsing server config for {server_id}: {e}")
                 continue
@@ -222,63 +394,101 @@ class MCPConfigManager:
         self.logger.debug(f"Loaded {len(servers)} MCP servers from config")
         return servers
     
+    def get_all_servers(self) -> Dict[str, MCPServer]:
+        """Get all configured MCP servers"""
+        return self._build_servers()
+    
     def get_server(self, server_id: str) -> Optional[MCPServer]:
-        """Get a specific MCP server by ID"""
-        servers = self.get_all_servers()
-        return servers.get(server_id)
+        """Get a specific MCP server by ID, building only that server"""
+        server_data = self._load_config().get("servers", {}).get(server_id)
+        if server_data is None:
+            return None
+        try:
+            return self._build_server(server_data)
+        except Exception as e:
+            self.logger.error(f"Error parsing server config for {server_id}: {e}")
+            return None
     
     def add_server(self, server: MCPServer) -> None:
         """Add a new MCP server to configuration"""
-        config = self._load_config()
-        
-        # Convert server to dict format
-        server_dict = server.to_dict()
-        
-        # Add to config
-        config["servers"][server.id] = server_dict
-        
-        # Save config
-        self._save_config(config)
+        with self._lock:
+            config = self._config_for_update()
+            
+            # Convert server to dict format
+            server_dict = server.to_dict()
+            
+            # Add to config
+            config["servers"][server.id] = server_dict
+            
+            # Save config
+            self._save_config(config)
         
         self.logger.info(f"Added MCP server to config: {server.id} ({server.name})")
     
+    def add_servers(self, servers: Iterable[MCPServer]) -> None:
+        """Add several MCP servers to configuration with a single write"""
+        with self._lock:
+            config = self._config_for_update()
+            
+            added = []
+            for server in servers:
+                config["servers"][server.id] = server.to_dict()
+                added.append(server.id)
+            
+            if not added:
+                return
+            
+            # Save config once for the whole batch
+            self._save_config(config)
+        
+        self.logger.info(f"Added {len(added)} MCP servers to config: {added}")
+    
     def update_server(self, server: MCPServer) -> None:
         """Update an existing MCP server in configuration"""
-        config = self._load_config()
-        
-        if server.id not in config["servers"]:
-            raise ValueError(f"Server {server.id} not found in configuration")
-        
-        # Convert server to dict format
-        server_dict = server.to_dict()
-        
-        # Update config
-        config["servers"][server.id] = server_dict
-        
-        # Save config
-        self._save_config(config)
+        with self._lock:
+            config = self._config_for_update()
+            
+            if server.id not in config["servers"]:
+                raise ValueError(f"Server {server.id} not found in configuration")
+            
+            # Convert server to dict format
+            server_dict = server.to_dict()
+            
+            # Update config
+            config["servers"][server.id] = server_dict
+            
+            # Save config
+            self._save_config(config)
         
         self.logger.info(f"Updated MCP server in config: {server.id} ({server.name})")
     
     def remove_server(self, server_id: str) -> None:
         """Remove an MCP server from configuration"""
-        config = self._load_config()
-        
-        if server_id not in config["servers"]:
-            raise ValueError(f"Server {server_id} not found in configuration")
-        
-        # Remove from config
-        del config["servers"][server_id]
-        
-        # Save config
-        self._save_config(config)
+        with self._lock:
+            config = self._config_for_update()
+            
+            if server_id not in config["servers"]:
+                raise ValueError(f"Server {server_id} not found in configuration")
+            
+            # Remove from config
+            del config["servers"][server_id]
+            
+            # Save config
+            self._save_config(config)
         
         self.logger.info(f"Removed MCP server from config: {server_id}")
     
-    def get_enabled_servers(self) -> Dict[str, MCPServer]:
-        """Get only enabled MCP servers"""
-        all_servers = self.get_all_servers()
-        return {sid: server for sid, server in all_servers.items() if server.enabled}
+    def get_enabled_servers(self) -> Mapping[str, MCPServer]:
+        """Get only enabled MCP servers (read-only, cached until the next config write)"""
+        self._load_config()  # revalidate against the file mtime
+        enabled = self._enabled_cache
+        if enabled is None:
+            version = self.version
+            enabled = MappingProxyType(self._build_servers(enabled_only=True))
+            # A write in the meantime invalidated what was just built; don't cache it
+            if version == self.version:
+                self._enabled_cache = enabled
+        return enabled
     
     def get_main_page_servers(self) -> Dict[str, MCPServer]:
         """Get enabled MCP servers designated for main page data"""
@@ -291,70 +501,95 @@ class MCPConfigManager:
     
     def get_server_tools(self, server_id: str) -> Dict[str, MCPTool]:
         """Get tools for a specific server"""
-        server = self.get_server(server_id)
-        if server:
-            return server.tools
-        return {}
+        server_data = self._load_config().get("servers", {}).get(server_id)
+        if not server_data:
+            return {}
+        return self._build_tools(server_data)
     
     def get_all_enabled_tools(self) -> Dict[str, Dict[str, MCPTool]]:
         """Get all tools from all enabled servers"""
-        enabled_servers = self.get_enabled_servers()
-        all_tools = {}
-        
-        for server_id, server in enabled_servers.items():
-            if server.tools:
-                all_tools[server_id] = server.tools
-        
-        return all_tools
+        return {
+            server_id: server.tools
+            for server_id, server in self.get_enabled_servers().items()
+            if server.tools
+        }
+    
+    def tools_snapshot(self) -> List[Dict[str, Any]]:
+        """Get a flat list of tools on enabled servers, cached until the next config write"""
+        self._load_config()  # revalidate against the file mtime
+        tools = self._tools_cache
+        if tools is None:
+            version = self.version
+            tools = [
+                tool._api_repr
+                for server in self.get_enabled_servers().values()
+                for tool in server.tools.values()
+            ]
+            if version == self.version:
+                self._tools_cache = tools
+        return tools
     
     def enable_server(self, server_id: str) -> None:
         """Enable a server"""
-        server = self.get_server(server_id)
-        if server:
-            server.enabled = True
-            self.update_server(server)
-            self.logger.info(f"Enabled MCP server: {server_id}")
+        with self._lock:
+            config = self._config_for_update()
+            server_data = config.get("servers", {}).get(server_id)
+            if server_data is None:
+                return
+            server_data["enabled"] = True
+            self._save_config(config)
+        self.logger.info(f"Enabled MCP server: {server_id}")
     
     def disable_server(self, server_id: str) -> None:
         """Disable a server"""
-        server = self.get_server(server_id)
-        if server:
-            server.enabled = False
-            self.update_server(server)
-            self.logger.info(f"Disabled MCP server: {server_id}")
+        with self._lock:
+            config = self._config_for_update()
+            server_data = config.get("servers", {}).get(server_id)
+            if server_data is None:
+                return
+            server_data["enabled"] = False
+            self._save_config(config)
+        self.logger.info(f"Disabled MCP server: {server_id}")
     
     def get_safe_config(self) -> Dict[str, Any]:
-        """Get configuration without sensitive data (API keys)"""
-        config = self._load_config()
-        safe_config = config.copy()
+        """Get configuration without sensitive data (API keys), cached until the next config write"""
+        config = self._load_config()  # also revalidates against the file mtime
+        if self._safe_config_cache is not None:
+            return self._safe_config_cache
+        version = self.version
         
-        # Remove API keys from server configurations
-        for server_id in safe_config.get("servers", {}):
-            if "api_key" in safe_config["servers"][server_id]:
-                safe_config["servers"][server_id]["api_key"] = "***" if safe_config["servers"][server_id]["api_key"] else None
+        # Remove API keys from server configurations in one pass; each redacted server is
+        # a new dict, so the cached config keeps its keys
+        safe_config = {
+            **config,
+            "servers": {
+                server_id: {**server_data, "api_key": "***" if server_data.get("api_key") else None}
+                for server_id, server_data in config.get("servers", {}).items()
+            }
+        }
         
+        if version == self.version:
+            self._safe_config_cache = safe_config
         return safe_config
     
     def export_config(self, file_path: Path) -> None:
         """Export configuration to a file"""
         config = self._load_config()
         
-        with open(file_path, 'w') as f:
-            json.dump(config, f, indent=2, sort_keys=True)
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(config, option=_EXPORT_OPTIONS))
         
         self.logger.info(f"Exported MCP configuration to {file_path}")
     
     def import_config(self, file_path: Path) -> None:
         """Import configuration from a file"""
-        with open(file_path, 'r') as f:
-            config = json.load(f)
+        config = _load_json_file(file_path)
         
-        # Validate config structure
-        if "servers" not in config:
-            raise ValueError("Invalid configuration format: missing 'servers' key")
+        # Validate config structure before it replaces the current one
+        _validate_config(config)
         
-        # Save imported config
-        self._save_config(config)
+        # Save imported config; the source file still exists, so skip the fsync
+        self._save_config(config, durable=False)
         
         self.logger.info(f"Imported MCP configuration from {file_path}")
 
@@ -3,27 +3,124 @@ Negative news alerts service for querying designated MCP servers
 to find accounts with positions in negative sentiment news/reports.
 """
 
+import asyncio
+import heapq
 import logging
-import json
-from typing import Dict, List, Any, Optional
+import re
+import time
+import orjson
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Union
 from mcp_config import config_manager
 from mcp_client import mcp_manager
 from es_data_client import es_data_client
 
 logger = logging.getLogger(__name__)
 
+# How long the list of servers offering neg_news_reports_with_pos is reused; config writes invalidate it sooner
+ELIGIBLE_SERVERS_TTL_SECONDS = 5.0
+
+# Severity keywords, matched as substrings of the lowercased title and summary in a single scan each
+_HIGH_SEVERITY_RE = re.compile("fraud|lawsuit|investigation|bankruptcy|scandal|criminal")
+_MEDIUM_SEVERITY_RE = re.compile("decline|loss|warning|concern|risk|downturn")
+
+
+@dataclass(slots=True)
+class Alert:
+    """One account exposure to a negative news item, as parsed from a tool response"""
+    account_id: str
+    account_name: str
+    symbol: str
+    company_name: str
+    position_value: float
+    news_title: str
+    news_summary: str
+    sentiment: str
+    published_date: str
+    news_source: str
+    document_id: str
+    severity: str
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """dict-style access, so parsed alerts and alerts passed through as plain dicts group the same way"""
+        return getattr(self, key, default)
+
+
+# ES|QL columns read by the alert row parser
+_ALERT_COLUMNS = (
+    "account_id", "account", "symbol", "ticker", "title", "news_title", "summary", "news_summary",
+    "account_name", "account_holder_name", "company_name", "position_value", "sentiment",
+    "published_date", "source", "news_source", "document_id", "_id",
+)
+
+
+def _alert_columns(col_map: Dict[str, int]) -> Dict[str, int]:
+    """Resolve the position (or -1) of every column the row parser reads, once per response"""
+    cols = {name: col_map.get(name, -1) for name in _ALERT_COLUMNS}
+    # Severity reads whichever title/summary column exists, even when its value is empty
+    cols["severity_title"] = col_map.get("title", col_map.get("news_title", -1))
+    cols["severity_summary"] = col_map.get("summary", col_map.get("news_summary", -1))
+    return cols
+
+
+def _cell(row: List[Any], idx: int, default: Any = "") -> Any:
+    """Get an ES|QL row value by column position, with default for missing columns and nulls"""
+    if 0 <= idx < len(row):
+        value = row[idx]
+        return value if value is not None else default
+    return default
+
+
+def _truncate(s: Any, n: int = 200, default: str = "No summary available") -> str:
+    """Shorten text to n characters, adding an ellipsis only when something was cut"""
+    if not s:
+        return default
+    s = str(s)
+    return s[:n] + "..." if len(s) > n else s
+
+
+def _to_float(value: Any) -> float:
+    """Convert an ES|QL cell to float, treating empty or non-numeric values as 0"""
+    if not value:
+        return 0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0
+
 
 class NegativeNewsAlertsService:
     """Service for fetching negative news alerts from designated MCP servers"""
     
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.NegativeNewsAlertsService")
+        # (built_at, config version, main page servers, servers among them that have the tool)
+        self._eligible_cache: Optional[Tuple[float, int, Dict[str, Any], List[Tuple[str, Any]]]] = None
+    
+    def _eligible_servers(self) -> Tuple[Dict[str, Any], List[Tuple[str, Any]]]:
+        """Get the main page servers and those offering neg_news_reports_with_pos, briefly cached"""
+        now = time.monotonic()
+        cached = self._eligible_cache
+        if cached and cached[1] == config_manager.version and now - cached[0] < ELIGIBLE_SERVERS_TTL_SECONDS:
+            return cached[2], cached[3]
+        
+        main_page_servers = config_manager.get_main_page_servers()
+        eligible = []
+        for server_id, server in main_page_servers.items():
+            # Check if server has the required tool
+            if "neg_news_reports_with_pos" not in server.tools:
+                self.logger.warning(f"Server {server_id} does not have neg_news_reports_with_pos tool")
+                continue
+            eligible.append((server_id, server))
+        
+        self._eligible_cache = (now, config_manager.version, main_page_servers, eligible)
+        return main_page_servers, eligible
     
     async def get_negative_news_alerts(self, time_period: int, time_unit: str) -> Dict[str, Any]:
         """Get negative news alerts for accounts with positions in negative sentiment news/reports"""
         try:
             # Get servers designated for main page data
-            main_page_servers = config_manager.get_main_page_servers()
+            main_page_servers, eligible_servers = self._eligible_servers()
             
             if not main_page_servers:
                 return {
@@ -34,33 +131,32 @@ class NegativeNewsAlertsService:
             
             self.logger.info(f"Found {len(main_page_servers)} servers designated for main page data")
             
-            # Try to get negative news alerts from each designated server
-            for server_id, server in main_page_servers.items():
+            # Query every designated server that has the tool concurrently; the first
+            # non-empty answer wins and the slower calls are cancelled
+            async def fetch(server_id: str, server):
                 try:
-                    # Check if server has the required tool
-                    if "neg_news_reports_with_pos" not in server.tools:
-                        self.logger.warning(f"Server {server_id} does not have neg_news_reports_with_pos tool")
-                        continue
-                    
-                    # Get alerts from this server
-                    alerts = await self._get_alerts_from_server(server_id, server, time_period, time_unit)
+                    return server, await self._get_alerts_from_server(server_id, server, time_period, time_unit)
+                except Exception as e:
+                    self.logger.warning(f"Failed to get negative news alerts from server {server_id}: {e}")
+                    return server, []
+            
+            tasks = [asyncio.create_task(fetch(server_id, server)) for server_id, server in eligible_servers]
+            
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    server, alerts = await next_done
                     if alerts:
                         return {
                             "status": "success",
                             "server_used": server.name,
                             "alerts": alerts
                         }
-                except Exception as e:
-                    self.logger.warning(f"Failed to get negative news alerts from server {server_id}: {e}")
-                    continue
+            finally:
+                for task in tasks:
+                    task.cancel()
             
             # Check if any server had the required tool
-            has_required_tool = any(
-                "neg_news_reports_with_pos" in server.tools 
-                for server in main_page_servers.values()
-            )
-            
-            if not has_required_tool:
+            if not eligible_servers:
                 return {
                     "status": "tool_not_available",
                     "message": "Connected MCP servers do not support negative news analysis tool (neg_news_reports_with_pos)",
@@ -95,27 +191,21 @@ class NegativeNewsAlertsService:
         }
         
         try:
-            async for result in mcp_manager.execute_tool(server_id, "neg_news_reports_with_pos", arguments):
-                if result["type"] == "tool_result":
-                    content = result["content"]
-                    if isinstance(content, dict) and "text" in content:
-                        try:
-                            data = json.loads(content["text"])
-                            self.logger.info(f"Parsed neg_news_reports_with_pos data: {json.dumps(data, indent=2)}")
-                            
-                            # Parse the alerts from the response
-                            alerts = await self._parse_alerts_response(data)
-                            
-                            if alerts:
-                                self.logger.info(f"Successfully parsed {len(alerts)} negative news alerts")
-                                return alerts
-                                
-                        except json.JSONDecodeError as e:
-                            self.logger.warning(f"Could not parse neg_news_reports_with_pos response as JSON: {e}")
-                    break
-                elif result["type"] == "error":
-                    self.logger.error(f"Error from neg_news_reports_with_pos tool: {result.get('error', 'Unknown error')}")
-                    break
+            # Single decoded result (structuredContent or joined text, parsed with orjson)
+            result = await mcp_manager.call_tool_once(server_id, "neg_news_reports_with_pos", arguments, decode_json=True)
+            if result["type"] == "error":
+                self.logger.error(f"Error from neg_news_reports_with_pos tool: {result.get('error', 'Unknown error')}")
+                return alerts
+            
+            data = result["content"]
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Parsed neg_news_reports_with_pos data: %s", orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+            
+            # Parse the alerts from the response
+            alerts = await self._parse_alerts_response(data)
+            
+            if alerts:
+                self.logger.info(f"Successfully parsed {len(alerts)} negative news alerts")
                     
         except Exception as e:
             self.logger.error(f"Error executing neg_news_reports_with_pos tool on server {server_id}: {e}")
@@ -130,12 +220,23 @@ class NegativeNewsAlertsService:
             # The response format may vary depending on the MCP server implementation
             # Try different response formats
             
+            # Malformed entries are skipped one at a time; only a broken envelope
+            # is caught once for the whole response below
+            
             # Format 1: Standard ES response with hits
             if "result" in data and "hits" in data["result"]:
                 hits = data["result"]["hits"]["hits"]
                 for hit in hits:
-                    source = hit.get("_source", {})
-                    alert = await self._create_alert_from_source(source, hit.get("_id", ""))
+                    if not isinstance(hit, dict):
+                        continue
+                    source = hit.get("_source")
+                    if not isinstance(source, dict):
+                        continue
+                    try:
+                        alert = await self._create_alert_from_source(source, hit.get("_id", ""))
+                    except Exception as e:
+                        self.logger.warning(f"Skipping malformed alert {hit.get('_id', '')}: {e}")
+                        continue
                     if alert:
                         raw_alerts.append(alert)
             
@@ -144,145 +245,144 @@ class NegativeNewsAlertsService:
                 columns = data["result"].get("columns", [])
                 values = data["result"].get("values", [])
                 
-                # Map column names to indices for easier access
+                # Map column names to indices once for the whole response
                 col_map = {col.get("name", f"col_{i}"): i for i, col in enumerate(columns)}
+                cols = _alert_columns(col_map)
                 
                 for row in values:
-                    alert = await self._create_alert_from_esql_row(row, col_map)
+                    if not isinstance(row, list):
+                        continue
+                    try:
+                        alert = await self._create_alert_from_esql_row(row, cols)
+                    except Exception as e:
+                        self.logger.warning(f"Skipping malformed alert row: {e}")
+                        continue
                     if alert:
                         raw_alerts.append(alert)
             
             # Format 3: Custom format with alerts array
             elif "alerts" in data:
-                raw_alerts = data["alerts"]
+                raw_alerts = [alert for alert in data["alerts"] if isinstance(alert, dict)]
             
             # Format 4: Direct array response
             elif isinstance(data, list):
-                raw_alerts = data
+                raw_alerts = [alert for alert in data if isinstance(alert, dict)]
                 
         except Exception as e:
-            self.logger.error(f"Error parsing alerts response: {e}")
+            self.logger.warning(f"Malformed neg_news_reports_with_pos response, using {len(raw_alerts)} alerts parsed before the error: {e}")
         
         # Group alerts by news title and create grouped news stories
         return await self._group_alerts_by_news_title(raw_alerts[:50])  # Limit to top 50 raw alerts
     
-    async def _create_alert_from_source(self, source: Dict[str, Any], doc_id: str) -> Optional[Dict[str, Any]]:
+    async def _create_alert_from_source(self, source: Dict[str, Any], doc_id: str) -> Optional[Alert]:
         """Create an alert object from Elasticsearch document source"""
-        try:
-            return {
-                "account_id": source.get("account_id", ""),
-                "account_name": source.get("account_name", source.get("account_holder_name", "")),
-                "symbol": source.get("symbol", ""),
-                "company_name": source.get("company_name", ""),
-                "position_value": source.get("position_value", 0),
-                "news_title": source.get("news_title", source.get("title", "")),
-                "news_summary": source.get("news_summary", source.get("summary", ""))[:200] + "..." if source.get("news_summary", source.get("summary", "")) else "No summary available",
-                "sentiment": source.get("sentiment", "negative"),
-                "published_date": source.get("published_date", ""),
-                "news_source": source.get("news_source", source.get("source", "")),
-                "document_id": doc_id,
-                "severity": self._calculate_severity(source)
-            }
-        except Exception as e:
-            self.logger.warning(f"Error creating alert from source: {e}")
-            return None
-    
-    async def _create_alert_from_esql_row(self, row: List[Any], col_map: Dict[str, int]) -> Optional[Dict[str, Any]]:
-        """Create an alert object from ES|QL query result row"""
-        try:
-            def get_col_value(col_name: str, default: Any = "") -> Any:
-                """Get column value by name with fallback"""
-                idx = col_map.get(col_name, -1)
-                if idx >= 0 and idx < len(row):
-                    return row[idx] if row[idx] is not None else default
-                return default
-            
-            # Map common column patterns
-            account_id = get_col_value("account_id") or get_col_value("account")
-            symbol = get_col_value("symbol") or get_col_value("ticker")
-            title = get_col_value("title") or get_col_value("news_title")
-            summary = get_col_value("summary") or get_col_value("news_summary")
-            
-            if not account_id and not symbol:
-                return None  # Skip invalid rows
-            
-            return {
-                "account_id": str(account_id),
-                "account_name": str(get_col_value("account_name", get_col_value("account_holder_name"))),
-                "symbol": str(symbol),
-                "company_name": str(get_col_value("company_name")),
-                "position_value": float(get_col_value("position_value", 0)) if get_col_value("position_value") else 0,
-                "news_title": str(title),
-                "news_summary": str(summary)[:200] + "..." if str(summary) and len(str(summary)) > 200 else str(summary),
-                "sentiment": str(get_col_value("sentiment", "negative")),
-                "published_date": str(get_col_value("published_date")),
-                "news_source": str(get_col_value("source", get_col_value("news_source"))),
-                "document_id": str(get_col_value("document_id", get_col_value("_id"))),
-                "severity": self._calculate_severity_from_row(row, col_map)
-            }
-        except Exception as e:
-            self.logger.warning(f"Error creating alert from ES|QL row: {e}")
-            return None
+        get = source.get
+        account_id = get("account_id") or ""
+        symbol = get("symbol") or ""
+        if not account_id and not symbol:
+            return None  # Skip documents that can't be tied to a position
+        
+        # Raw title/summary feed both the field fallbacks and the severity check
+        title = get("title") or ""
+        raw_summary = get("summary") or ""
+        position_value = _to_float(get("position_value"))
+        summary = get("news_summary") or raw_summary
+        return Alert(
+            account_id=account_id,
+            account_name=get("account_name", get("account_holder_name", "")),
+            symbol=symbol,
+            company_name=get("company_name", ""),
+            position_value=position_value,
+            news_title=get("news_title", title),
+            news_summary=_truncate(summary),
+            sentiment=get("sentiment", "negative"),
+            published_date=get("published_date", ""),
+            news_source=get("news_source", get("source", "")),
+            document_id=doc_id,
+            severity=self._calculate_severity(title, raw_summary, position_value)
+        )
     
-    def _calculate_severity(self, source: Dict[str, Any]) -> str:
-        """Calculate alert severity based on source data"""
-        # Simple severity calculation based on keywords and position value
-        title = (source.get("title", "") + " " + source.get("summary", "")).lower()
-        position_value = source.get("position_value", 0)
+    async def _create_alert_from_esql_row(self, row: List[Any], cols: Dict[str, int]) -> Optional[Alert]:
+        """Create an alert object from ES|QL query result row, given column positions from _alert_columns"""
+        # Map common column patterns
+        account_id = _cell(row, cols["account_id"]) or _cell(row, cols["account"])
+        symbol = _cell(row, cols["symbol"]) or _cell(row, cols["ticker"])
+        title = _cell(row, cols["title"]) or _cell(row, cols["news_title"])
+        summary = _cell(row, cols["summary"]) or _cell(row, cols["news_summary"])
         
-        # High severity keywords
-        high_keywords = ["fraud", "lawsuit", "investigation", "bankruptcy", "scandal", "criminal"]
-        # Medium severity keywords  
-        medium_keywords = ["decline", "loss", "warning", "concern", "risk", "downturn"]
+        if not account_id and not symbol:
+            return None  # Skip invalid rows
         
-        if any(keyword in title for keyword in high_keywords):
+        position_value = _to_float(_cell(row, cols["position_value"], 0))
+        
+        return Alert(
+            account_id=str(account_id),
+            account_name=str(_cell(row, cols["account_name"], _cell(row, cols["account_holder_name"]))),
+            symbol=str(symbol),
+            company_name=str(_cell(row, cols["company_name"])),
+            position_value=position_value,
+            news_title=str(title),
+            news_summary=_truncate(summary),
+            sentiment=str(_cell(row, cols["sentiment"], "negative")),
+            published_date=str(_cell(row, cols["published_date"])),
+            news_source=str(_cell(row, cols["source"], _cell(row, cols["news_source"]))),
+            document_id=str(_cell(row, cols["document_id"], _cell(row, cols["_id"]))),
+            severity=self._calculate_severity_from_row(row, cols)
+        )
+    
+    def _calculate_severity(self, title: str, summary: str, position_value: float) -> str:
+        """Calculate alert severity from a document's title, summary and position value"""
+        # Simple severity calculation based on keywords and position value.
+        # Keywords contain no spaces, so a high-severity headline decides it without the summary
+        title = str(title or "").lower()
+        if _HIGH_SEVERITY_RE.search(title):
             return "high"
-        elif any(keyword in title for keyword in medium_keywords) or position_value > 100000:
+        summary = str(summary or "").lower()
+        if _HIGH_SEVERITY_RE.search(summary):
+            return "high"
+        elif position_value > 100000 or _MEDIUM_SEVERITY_RE.search(title) or _MEDIUM_SEVERITY_RE.search(summary):
             return "medium"
         else:
             return "low"
     
-    def _calculate_severity_from_row(self, row: List[Any], col_map: Dict[str, int]) -> str:
+    def _calculate_severity_from_row(self, row: List[Any], cols: Dict[str, int]) -> str:
         """Calculate alert severity from ES|QL row"""
-        try:
-            # Get title and summary for keyword analysis
-            title_idx = col_map.get("title", col_map.get("news_title", -1))
-            summary_idx = col_map.get("summary", col_map.get("news_summary", -1))
-            position_idx = col_map.get("position_value", -1)
-            
-            title = ""
-            if title_idx >= 0 and title_idx < len(row) and row[title_idx]:
-                title += str(row[title_idx]).lower()
-            if summary_idx >= 0 and summary_idx < len(row) and row[summary_idx]:
-                title += " " + str(row[summary_idx]).lower()
-            
-            position_value = 0
-            if position_idx >= 0 and position_idx < len(row) and row[position_idx]:
-                try:
-                    position_value = float(row[position_idx])
-                except (ValueError, TypeError):
-                    position_value = 0
-            
-            # High severity keywords
-            high_keywords = ["fraud", "lawsuit", "investigation", "bankruptcy", "scandal", "criminal"]
-            # Medium severity keywords  
-            medium_keywords = ["decline", "loss", "warning", "concern", "risk", "downturn"]
-            
-            if any(keyword in title for keyword in high_keywords):
+        # Get title and summary for keyword analysis
+        title_idx = cols["severity_title"]
+        summary_idx = cols["severity_summary"]
+        position_idx = cols["position_value"]
+        
+        title = ""
+        if title_idx >= 0 and title_idx < len(row) and row[title_idx]:
+            title = str(row[title_idx]).lower()
+            # A high-severity headline decides it without looking at the summary or position
+            if _HIGH_SEVERITY_RE.search(title):
                 return "high"
-            elif any(keyword in title for keyword in medium_keywords) or position_value > 100000:
-                return "medium"
-            else:
-                return "low"
-                
-        except Exception as e:
-            self.logger.warning(f"Error calculating severity: {e}")
+        if summary_idx >= 0 and summary_idx < len(row) and row[summary_idx]:
+            title += " " + str(row[summary_idx]).lower()
+        
+        position_value = 0
+        if position_idx >= 0 and position_idx < len(row) and row[position_idx]:
+            position_value = _to_float(row[position_idx])
+        
+        if _HIGH_SEVERITY_RE.search(title):
+            return "high"
+        elif position_value > 100000 or _MEDIUM_SEVERITY_RE.search(title):
+            return "medium"
+        else:
             return "low"
     
-    async def _group_alerts_by_news_title(self, raw_alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _group_alerts_by_news_title(self, raw_alerts: List[Union[Alert, Dict[str, Any]]]) -> List[Dict[str, Any]]:
         """Group raw alerts by news title and add position details"""
         grouped_stories = {}
         
+        # Fetch position details for every distinct (account, symbol) in one Elasticsearch round trip
+        positions = await es_data_client.get_position_details_bulk(
+            (account_id, symbol)
+            for alert in raw_alerts
+            if (account_id := alert.get("account_id")) and (symbol := alert.get("symbol"))
+        )
+        
         for alert in raw_alerts:
             news_title = alert.get("news_title", "Unknown News")
             
@@ -308,9 +408,7 @@ class NegativeNewsAlertsService:
             account_id = alert.get("account_id", "")
             symbol = alert.get("symbol", "")
             
-            position_details = None
-            if account_id and symbol:
-                position_details = await es_data_client.get_position_details(account_id, symbol)
+            position_details = positions.get((account_id, symbol))
             
             # Create account entry with position details
             account_info = {
@@ -336,7 +434,7 @@ class NegativeNewsAlertsService:
                 exposure = position_details.get("current_value", 0)
             else:
                 # Fallback to basic position value
-                exposure = alert.get("position_value", 0)
+                exposure = _to_float(alert.get("position_value", 0))
             
             story["affected_accounts"].append(account_info)
             story["total_accounts_affected"] += 1
@@ -348,12 +446,10 @@ class NegativeNewsAlertsService:
                 (alert_severity == "medium" and story["severity"] == "low")):
                 story["severity"] = alert_severity
         
-        # Convert to list and sort by total exposure (highest first)
-        result = list(grouped_stories.values())
-        result.sort(key=lambda x: x["total_exposure"], reverse=True)
+        self.logger.info(f"Grouped {len(raw_alerts)} alerts into {len(grouped_stories)} news stories")
         
-        self.logger.info(f"Grouped {len(raw_alerts)} alerts into {len(result)} news stories")
-        return result[:10]  # Limit to top 10 stories
+        # Top 10 stories by total exposure (highest first)
+        return heapq.nlargest(10, grouped_stories.values(), key=lambda x: x["total_exposure"])
 
 
 # Global instance
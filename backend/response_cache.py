@@ -0,0 +1,149 @@
+"""
+Response cache for endpoints that serve immutable Elasticsearch documents.
+Uses Redis when REDIS_URL is configured so every worker shares the cache,
+otherwise falls back to a bounded in-process TTL store.
+"""
+
+import os
+import time
+import logging
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Negative-cache entries are stored with a prefix that valid JSON can never start with
+_NOT_FOUND_PREFIX = b"!404:"
+
+
+class DocumentNotFound(HTTPException):
+    """404 for a confirmed miss; the only error @cached stores (other 404s may be transient)"""
+
+    def __init__(self, detail: str):
+        super().__init__(status_code=404, detail=detail)
+
+
+class ResponseCache:
+    """Key/value byte cache backed by Redis or a local LRU dictionary"""
+
+    def __init__(self, redis_url: Optional[str] = None, max_local_entries: int = 1024):
+        self.redis_url = redis_url
+        self.redis = None
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # Shared state that must never be evicted, kept apart from the LRU
+        self._persistent: Dict[str, bytes] = {}
+
+    async def connect(self) -> None:
+        """Connect to Redis if a URL is configured"""
+        if not self.redis_url:
+            logger.info("REDIS_URL not set, using in-process response cache")
+            return
+
+        import redis.asyncio as aioredis
+
+        # The eviction policy is left to the Redis operator (see README: volatile-lru expected)
+        self.redis = aioredis.from_url(self.redis_url)
+        logger.info(f"Response cache connected to Redis at {self.redis_url}")
+
+    async def close(self) -> None:
+        """Close the Redis connection"""
+        if self.redis is not None:
+            await self.redis.aclose()
+            self.redis = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a cached value, or None on miss"""
+        if self.redis is not None:
+            try:
+                return await self.redis.get(key)
+            except Exception as e:
+                logger.warning(f"Redis GET failed for {key}: {e}")
+                return None
+
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        """Store a value with a TTL in seconds (None keeps it until evicted)"""
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, value, ex=ttl)
+            except Exception as e:
+                logger.warning(f"Redis SET failed for {key}: {e}")
+            return
+
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        self._local[key] = (expires_at, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+
+    async def get_persistent(self, key: str) -> Optional[bytes]:
+        """Get a value stored with set_persistent, or None if it was never set"""
+        if self.redis is not None:
+            try:
+                return await self.redis.get(key)
+            except Exception as e:
+                logger.warning(f"Redis GET failed for {key}: {e}")
+        return self._persistent.get(key)
+
+    async def set_persistent(self, key: str, value: bytes) -> None:
+        """Store shared state that is never evicted to make room for cached responses"""
+        # Kept locally too, so this worker still has it if Redis is unreachable
+        self._persistent[key] = value
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, value)
+            except Exception as e:
+                logger.warning(f"Redis SET failed for {key}: {e}")
+
+
+# Global cache instance
+response_cache = ResponseCache(REDIS_URL)
+
+
+def cached(key: Callable[..., str], ttl: int = 3600, negative_ttl: int = 60):
+    """
+    Cache the JSON result of an async endpoint under key(**endpoint_kwargs).
+    DocumentNotFound is cached for negative_ttl seconds so repeated lookups of
+    missing ids don't all fall through to Elasticsearch. Other errors, including
+    plain 404s and upstream failures, are never cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            cache_key = key(*args, **kwargs)
+
+            hit = await response_cache.get(cache_key)
+            if hit is not None:
+                if hit.startswith(_NOT_FOUND_PREFIX):
+                    raise DocumentNotFound(hit[len(_NOT_FOUND_PREFIX):].decode())
+                return orjson.loads(hit)
+
+            try:
+                result = await func(*args, **kwargs)
+            except DocumentNotFound as e:
+                await response_cache.set(cache_key, _NOT_FOUND_PREFIX + str(e.detail).encode(), negative_ttl)
+                raise
+
+            await response_cache.set(cache_key, orjson.dumps(result), ttl)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -9,27 +9,54 @@ Usage:
 """
 
 import json
+import orjson
+import re
+import asyncio
 import time
 import os
 import random
+import functools
+import hashlib
+import shelve
+import atexit
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Generator
+from typing import Dict, Any, Optional, List, Generator, Tuple, Union, TYPE_CHECKING
 import warnings
-from urllib3.exceptions import InsecureRequestWarning
 
 # Third-party imports
-import google.generativeai as genai
-from elasticsearch import Elasticsearch, helpers
+# google.generativeai and elasticsearch are imported inside the functions that use
+# them, so callers that only need the data utilities don't pay for loading them
 from tqdm import tqdm
 
-# Local imports
-from config import GEMINI_CONFIG, ES_CONFIG
+if TYPE_CHECKING:
+    from elasticsearch import Elasticsearch
 
-# Suppress SSL warnings for development
-warnings.filterwarnings('ignore', category=InsecureRequestWarning)
+# Local imports
+from config import GEMINI_CONFIG, ES_CONFIG, PRICE_SETTINGS
 
 # --- Gemini API Functions ---
 
+# On-disk cache of parsed Gemini responses, opened on first use
+_gemini_cache = None
+
+def _get_gemini_cache():
+    """
+    Open the on-disk Gemini response cache, creating the cache directory if needed.
+    
+    Returns:
+        shelve.Shelf: Parsed responses keyed by a hash of model name and prompt
+    """
+    global _gemini_cache
+    if _gemini_cache is None:
+        os.makedirs(GEMINI_CONFIG['cache_dir'], exist_ok=True)
+        _gemini_cache = shelve.open(os.path.join(GEMINI_CONFIG['cache_dir'], 'responses'))
+        atexit.register(_gemini_cache.close)
+    return _gemini_cache
+
+def _gemini_cache_key(prompt: str) -> str:
+    """Build the response cache key for a prompt sent to the configured model."""
+    return hashlib.sha256(f"{GEMINI_CONFIG['model_name']}\0{prompt}".encode()).hexdigest()
+
 def configure_gemini():
     """
     Configure and return a Gemini AI model instance.
@@ -43,13 +70,46 @@ def configure_gemini():
     if not GEMINI_CONFIG['api_key']:
         raise ValueError("GEMINI_API_KEY environment variable not set. Please set it to your Gemini API key.")
     
+    import google.generativeai as genai
     genai.configure(api_key=GEMINI_CONFIG['api_key'])
     return genai.GenerativeModel(GEMINI_CONFIG['model_name'])
 
+def _is_rate_limit_error(error: Exception) -> bool:
+    """
+    Check whether a Gemini API error is a 429 rate-limit/quota response.
+    
+    Args:
+        error (Exception): Exception raised by the Gemini client
+        
+    Returns:
+        bool: True if the request should be retried after backing off
+    """
+    from google.api_core import exceptions as google_exceptions
+    # ResourceExhausted (quota exceeded) is a TooManyRequests subclass
+    return isinstance(error, google_exceptions.TooManyRequests)
+
+def _rate_limit_backoff(rate_limited: int) -> float:
+    """
+    Exponential backoff with jitter for the nth consecutive 429 response.
+    
+    Args:
+        rate_limited (int): Number of 429 responses so far for this prompt (1-based)
+        
+    Returns:
+        float: Seconds to wait before retrying
+    """
+    backoff = min(GEMINI_CONFIG['rate_limit_backoff_seconds'] * 2 ** (rate_limited - 1),
+                  GEMINI_CONFIG['rate_limit_max_backoff_seconds'])
+    # Jitter keeps concurrent workers that were throttled together from retrying in lockstep
+    return backoff * random.uniform(0.5, 1.0)
+
 def call_gemini_api(prompt: str, model, max_retries: Optional[int] = None, delay: Optional[float] = None) -> Optional[Dict[str, Any]]:
     """
     Call Gemini API with retry logic and rate limiting.
     
+    Successful responses are cached on disk (see GEMINI_CONFIG['cache_enabled']),
+    so reruns with the same prompt and model skip the API call.
+    
     Args:
         prompt (str): The prompt to send to Gemini
         model: The Gemini model instance
@@ -62,7 +122,15 @@ def call_gemini_api(prompt: str, model, max_retries: Optional[int] = None, delay
     max_retries = max_retries or GEMINI_CONFIG['max_retries']
     delay = delay or GEMINI_CONFIG['request_delay_seconds']
     
-    for attempt in range(max_retries):
+    cache = _get_gemini_cache() if GEMINI_CONFIG['cache_enabled'] else None
+    if cache is not None:
+        cache_key = _gemini_cache_key(prompt)
+        if cache_key in cache:
+            return cache[cache_key]
+    
+    import google.generativeai as genai
+    attempt, rate_limited = 0, 0
+    while attempt < max_retries:
         try:
             response = model.generate_content(
                 prompt,
@@ -72,23 +140,121 @@ def call_gemini_api(prompt: str, model, max_retries: Optional[int] = None, delay
                 safety_settings=GEMINI_CONFIG['safety_settings']
             )
             content_text = response.text
-            return json.loads(content_text)
+            parsed = json.loads(content_text)
+            if cache is not None:
+                cache[cache_key] = parsed
+            return parsed
         except json.JSONDecodeError as e:
-            print(f"JSON decode error on attempt {attempt + 1}: {e}. Response: {response.text}")
-            time.sleep(delay * (attempt + 1))
+            attempt += 1
+            print(f"JSON decode error on attempt {attempt}: {e}. Response: {response.text}")
+            time.sleep(delay * attempt)
         except Exception as e:
-            print(f"Gemini API error on attempt {attempt + 1}: {e}")
-            time.sleep(delay * (attempt + 1))
+            if _is_rate_limit_error(e) and rate_limited < GEMINI_CONFIG['rate_limit_retries']:
+                rate_limited += 1
+                backoff = _rate_limit_backoff(rate_limited)
+                print(f"Gemini rate limit hit, retrying in {backoff:.1f}s: {e}")
+                time.sleep(backoff)
+                continue
+            attempt += 1
+            print(f"Gemini API error on attempt {attempt}: {e}")
+            time.sleep(delay * attempt)
+    
+    print(f"Failed to get valid JSON response from Gemini after {max_retries} attempts.")
+    return None
+
+async def call_gemini_api_async(prompt: str, model, semaphore: asyncio.Semaphore,
+                                max_retries: Optional[int] = None, delay: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Async variant of call_gemini_api; at most the semaphore's limit of requests run at once.
+    
+    Args:
+        prompt (str): The prompt to send to Gemini
+        model: The Gemini model instance
+        semaphore (asyncio.Semaphore): Bounds the number of in-flight requests
+        max_retries (int, optional): Number of retry attempts. Defaults to config value.
+        delay (float, optional): Base backoff delay between retries. Defaults to config value.
+            429 responses back off exponentially instead (see GEMINI_CONFIG['rate_limit_*']).
+        
+    Returns:
+        dict or None: Parsed JSON response from Gemini, or None if failed
+    """
+    max_retries = max_retries or GEMINI_CONFIG['max_retries']
+    delay = delay or GEMINI_CONFIG['request_delay_seconds']
+    
+    cache = _get_gemini_cache() if GEMINI_CONFIG['cache_enabled'] else None
+    if cache is not None:
+        cache_key = _gemini_cache_key(prompt)
+        if cache_key in cache:
+            return cache[cache_key]
+    
+    import google.generativeai as genai
+    async with semaphore:
+        attempt, rate_limited = 0, 0
+        while attempt < max_retries:
+            try:
+                response = await model.generate_content_async(
+                    prompt,
+                    generation_config=genai.types.GenerationConfig(
+                        response_mime_type=GEMINI_CONFIG['response_mime_type']
+                    ),
+                    safety_settings=GEMINI_CONFIG['safety_settings']
+                )
+                parsed = json.loads(response.text)
+                if cache is not None:
+                    cache[cache_key] = parsed
+                return parsed
+            except json.JSONDecodeError as e:
+                attempt += 1
+                print(f"JSON decode error on attempt {attempt}: {e}. Response: {response.text}")
+                await asyncio.sleep(delay * attempt)
+            except Exception as e:
+                if _is_rate_limit_error(e) and rate_limited < GEMINI_CONFIG['rate_limit_retries']:
+                    # Back off while holding the slot, so throttled workers also slow the others down
+                    rate_limited += 1
+                    backoff = _rate_limit_backoff(rate_limited)
+                    print(f"Gemini rate limit hit, retrying in {backoff:.1f}s: {e}")
+                    await asyncio.sleep(backoff)
+                    continue
+                attempt += 1
+                print(f"Gemini API error on attempt {attempt}: {e}")
+                await asyncio.sleep(delay * attempt)
     
     print(f"Failed to get valid JSON response from Gemini after {max_retries} attempts.")
     return None
 
+def call_gemini_api_concurrently(prompts: List[str], model, description: str = "Processing") -> List[Optional[Dict[str, Any]]]:
+    """
+    Call Gemini for many prompts at once, bounded by GEMINI_CONFIG['max_concurrency'].
+    
+    Args:
+        prompts (list): Prompts to send to Gemini
+        model: The Gemini model instance
+        description (str): Description for the progress bar
+        
+    Returns:
+        list: Parsed responses (or None for failures) in the same order as prompts
+    """
+    async def run_all():
+        semaphore = asyncio.Semaphore(GEMINI_CONFIG['max_concurrency'])
+        with tqdm(total=len(prompts), desc=description) as progress:
+            async def run_one(prompt):
+                result = await call_gemini_api_async(prompt, model, semaphore)
+                progress.update(1)
+                return result
+            return await asyncio.gather(*(run_one(prompt) for prompt in prompts))
+    
+    return asyncio.run(run_all())
+
 # --- File Operations ---
 
+@functools.lru_cache(maxsize=32)
 def load_prompt_template(filepath: str) -> Optional[str]:
     """
     Load a prompt template from a text file.
     
+    Templates are cached per path for the life of the process, including a
+    missing file's None result.
+    
     Args:
         filepath (str): Path to the prompt template file
         
@@ -140,8 +306,6 @@ def get_random_price(instrument_type: str) -> float:
     Returns:
         float: Random price appropriate for the instrument type
     """
-    from config import PRICE_SETTINGS
-    
     if instrument_type == 'Stock':
         min_price, max_price = PRICE_SETTINGS['stock_price_range']
     elif instrument_type == 'ETF':
@@ -153,6 +317,59 @@ def get_random_price(instrument_type: str) -> float:
     
     return round(random.uniform(min_price, max_price), 2)
 
+def generate_random_datetimes(start_date: datetime, end_date: datetime, count: int) -> List[str]:
+    """
+    Generate many random datetimes between start_date and end_date.
+    
+    Args:
+        start_date (datetime): Start of the range
+        end_date (datetime): End of the range
+        count (int): Number of datetimes to generate
+        
+    Returns:
+        list: ISO formatted datetime strings
+    """
+    total_seconds = int((end_date - start_date).total_seconds())
+    randint = random.randint
+    return [(start_date + timedelta(seconds=randint(0, total_seconds))).isoformat(timespec='seconds')
+            for _ in range(count)]
+
+def get_random_prices(instrument_types: List[str]) -> List[float]:
+    """
+    Generate realistic random prices for many instruments at once.
+    
+    Args:
+        instrument_types (list): Instrument type of each price ('Stock', 'ETF', 'Bond')
+        
+    Returns:
+        list: Random prices in the same order, 100.00 for unknown types
+    """
+    price_ranges = {
+        'Stock': PRICE_SETTINGS['stock_price_range'],
+        'ETF': PRICE_SETTINGS['etf_price_range'],
+        'Bond': PRICE_SETTINGS['bond_price_range'],
+    }
+    uniform = random.uniform
+    prices = []
+    for instrument_type in instrument_types:
+        price_range = price_ranges.get(instrument_type)
+        prices.append(round(uniform(*price_range), 2) if price_range else 100.00)
+    return prices
+
+def batch_choice(population, k: int, rng: Optional[random.Random] = None) -> List[Any]:
+    """
+    Pick k random elements (with replacement) from population in a single call.
+    
+    Args:
+        population: Sequence to choose from
+        k (int): Number of picks
+        rng (random.Random, optional): Random generator to use. Defaults to the random module.
+        
+    Returns:
+        list: k randomly chosen elements
+    """
+    return (rng or random).choices(population, k=k)
+
 def format_date_for_display(date_string: str) -> str:
     """
     Format a date string for display purposes.
@@ -181,9 +398,13 @@ def get_current_timestamp() -> str:
 
 # --- Elasticsearch Functions ---
 
-def create_elasticsearch_client() -> Elasticsearch:
+@functools.lru_cache(maxsize=1)
+def create_elasticsearch_client() -> "Elasticsearch":
     """
-    Create and return an Elasticsearch client instance.
+    Create and return the shared Elasticsearch client instance.
+    
+    The client is created (and its connection checked) once per process; later calls
+    return the same instance, so every ingest_data_to_es call reuses its connections.
     
     Returns:
         Elasticsearch: Configured ES client
@@ -191,12 +412,23 @@ def create_elasticsearch_client() -> Elasticsearch:
     Raises:
         ValueError: If connection fails
     """
+    # Suppress SSL warnings for development
+    from urllib3.exceptions import InsecureRequestWarning
+    warnings.filterwarnings('ignore', category=InsecureRequestWarning)
+    
+    from elasticsearch import Elasticsearch
+    from elasticsearch.serializer import OrjsonSerializer
     try:
         es_client = Elasticsearch(
             ES_CONFIG['endpoint_url'],
             api_key=ES_CONFIG['api_key'],
             request_timeout=ES_CONFIG['request_timeout'],
-            verify_certs=ES_CONFIG['verify_certs']
+            verify_certs=ES_CONFIG['verify_certs'],
+            serializer=OrjsonSerializer(),  # Faster encoding of bulk request bodies
+            # Enough pooled keep-alive connections for every parallel bulk thread
+            connections_per_node=ES_CONFIG['parallel_threads'] * 2,
+            http_compress=True,  # Gzip bulk bodies, the bulk of ingestion traffic
+            sniff_on_start=False
         )
         
         # Test connection
@@ -210,10 +442,34 @@ def create_elasticsearch_client() -> Elasticsearch:
         print(f"ERROR: Could not connect to Elasticsearch. Please check your Endpoint URL and API Key. Error: {e}")
         raise
 
-def _read_and_chunk_from_file(filepath: str, index_name: str, id_key_in_doc: str, batch_size: int) -> Generator[Dict[str, Any], None, None]:
+def close_elasticsearch_client() -> None:
+    """
+    Close the shared Elasticsearch client, if one was created.
+    """
+    if create_elasticsearch_client.cache_info().currsize:
+        create_elasticsearch_client().close()
+        create_elasticsearch_client.cache_clear()
+
+def _count_lines(filepath: str) -> int:
+    """
+    Count the lines in a file by scanning it in 1 MiB blocks.
+    
+    Args:
+        filepath (str): Path to the file
+        
+    Returns:
+        int: Number of newline-terminated lines
+    """
+    with open(filepath, 'rb') as f:
+        return sum(block.count(b'\n') for block in iter(lambda: f.read(1 << 20), b''))
+
+def _read_and_chunk_from_file(filepath: str, index_name: str, id_key_in_doc: str, batch_size: int) -> Generator[Tuple[Dict[str, Any], bytes], None, None]:
     """
     Generator to read documents from a JSONL file in chunks for ES ingestion.
     
+    Each document is yielded as its bulk action header plus the raw JSON line,
+    so the source is sent as-is instead of being decoded and re-encoded.
+    
     Args:
         filepath (str): Path to JSONL file
         index_name (str): ES index name
@@ -221,36 +477,42 @@ def _read_and_chunk_from_file(filepath: str, index_name: str, id_key_in_doc: str
         batch_size (int): Number of documents per batch
         
     Yields:
-        dict: Elasticsearch action documents
+        tuple: (bulk action header, raw document bytes)
     """
     current_chunk = []
+    chunk_len = 0
     line_num = 0
 
     try:
-        with open(filepath, 'r') as f:
+        total_lines = _count_lines(filepath)
+        # Large read buffer: fewer read syscalls on multi-hundred-MB files
+        with open(filepath, 'rb', buffering=1 << 20) as f, \
+             tqdm(desc=f"Reading '{filepath}'", total=total_lines, unit=" docs") as progress:
             for line_num, line in enumerate(f, 1):
                 try:
-                    doc = json.loads(line)
-                    action = {
-                        "_index": index_name,
-                        "_id": doc[id_key_in_doc],
-                        "_source": doc,
-                    }
-                    current_chunk.append(action)
-
-                    if len(current_chunk) == batch_size:
-                        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        print(
-                            f"[{timestamp}] - Reading '{filepath}': Preparing batch {line_num // batch_size} (Size: {len(current_chunk)} docs).")
+                    line = line.rstrip()
+                    # Decode only to find the document ID
+                    action = {"index": {"_index": index_name, "_id": orjson.loads(line)[id_key_in_doc]}}
+                    current_chunk.append((action, line))
+                    chunk_len += 1
+
+                    if chunk_len == batch_size:
+                        progress.update(batch_size)
                         yield from current_chunk
                         current_chunk = []
-                except json.JSONDecodeError as e:
+                        chunk_len = 0
+                except orjson.JSONDecodeError as e:
                     print(f"WARNING: Skipping malformed JSON on line {line_num} in '{filepath}': {e}")
                 except KeyError as e:
                     print(
                         f"WARNING: Skipping document on line {line_num} in '{filepath}' due to missing ID field '{id_key_in_doc}': {e}")
                 except Exception as e:
                     print(f"WARNING: An unexpected error occurred on line {line_num} in '{filepath}': {e}")
+
+            # Yield any remaining documents in the last chunk
+            if current_chunk:
+                progress.update(chunk_len)
+                yield from current_chunk
     except FileNotFoundError:
         print(f"ERROR: Data file not found at '{filepath}'. Cannot ingest.")
         return
@@ -258,16 +520,55 @@ def _read_and_chunk_from_file(filepath: str, index_name: str, id_key_in_doc: str
         print(f"ERROR: An error occurred while reading file '{filepath}': {e}")
         return
 
-    # Yield any remaining documents in the last chunk
-    if current_chunk:
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        print(f"[{timestamp}] - Reading '{filepath}': Preparing final batch (Size: {len(current_chunk)} docs).")
-        yield from current_chunk
+def _prebuilt_action(action: Tuple[Dict[str, Any], bytes]) -> Tuple[Dict[str, Any], bytes]:
+    """Bulk helper expand callback for actions already split into header and raw source"""
+    return action
+
+def _tune_index_for_bulk_load(es_client: "Elasticsearch", index_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Turn off refreshes and replicas on an existing index for the duration of a bulk load.
+    
+    Args:
+        es_client (Elasticsearch): ES client instance
+        index_name (str): ES index name
+        
+    Returns:
+        dict or None: Index settings to restore afterwards, or None if the index was left untouched
+    """
+    try:
+        response = es_client.indices.get_settings(index=index_name)
+        current = next(iter(response.values()))['settings']['index']
+        es_client.indices.put_settings(
+            index=index_name,
+            settings={'index': {'refresh_interval': '-1', 'number_of_replicas': 0}}
+        )
+    except Exception as e:
+        # Missing indices are created by the bulk load itself; serverless projects reject these settings
+        print(f"NOTE: Not tuning '{index_name}' for bulk load: {e}")
+        return None
+    # A missing refresh_interval means the default; None resets it to that
+    return {'refresh_interval': current.get('refresh_interval'), 'number_of_replicas': current.get('number_of_replicas', 1)}
+
+def _restore_index_after_bulk_load(es_client: "Elasticsearch", index_name: str, settings: Dict[str, Any]) -> None:
+    """
+    Restore index settings changed by _tune_index_for_bulk_load and merge the freshly written segments.
+    
+    Args:
+        es_client (Elasticsearch): ES client instance
+        index_name (str): ES index name
+        settings (dict): Settings returned by _tune_index_for_bulk_load
+    """
+    try:
+        es_client.indices.put_settings(index=index_name, settings={'index': settings})
+        es_client.indices.forcemerge(index=index_name, max_num_segments=1)
+    except Exception as e:
+        print(f"WARNING: Could not restore settings on '{index_name}' after bulk load: {e}")
 
-def ingest_data_to_es(es_client: Elasticsearch, filepath: str, index_name: str, id_field_in_doc: str, 
-                     batch_size: Optional[int] = None, timeout: Optional[int] = None) -> None:
+def ingest_data_to_es(es_client: "Elasticsearch", filepath: str, index_name: str, id_field_in_doc: str, 
+                     batch_size: Optional[int] = None, timeout: Optional[int] = None,
+                     tune: Optional[bool] = None) -> None:
     """
-    Ingest data from a JSONL file into Elasticsearch using the bulk API.
+    Ingest data from a JSONL file into Elasticsearch using parallel bulk requests.
     
     Args:
         es_client (Elasticsearch): ES client instance
@@ -276,6 +577,9 @@ def ingest_data_to_es(es_client: Elasticsearch, filepath: str, index_name: str,
         id_field_in_doc (str): Field name to use as document ID
         batch_size (int, optional): Batch size for bulk operations
         timeout (int, optional): Request timeout in seconds
+        tune (bool, optional): Pause refresh/replicas and force merge around the load.
+            Defaults to ES_CONFIG['tune_for_bulk_load'] for files with at least
+            ES_CONFIG['tune_min_docs'] lines; pass False for small updates to live indices
     """
     batch_size = batch_size or ES_CONFIG['bulk_batch_size']
     timeout = timeout or ES_CONFIG['request_timeout']
@@ -288,14 +592,28 @@ def ingest_data_to_es(es_client: Elasticsearch, filepath: str, index_name: str,
         return
 
     print(f"\n[{initial_timestamp}] Starting ingestion from '{filepath}' into index '{index_name}'...")
+    from elasticsearch import helpers
+    if tune is None:
+        tune = ES_CONFIG['tune_for_bulk_load'] and _count_lines(filepath) >= ES_CONFIG['tune_min_docs']
+    restore_settings = _tune_index_for_bulk_load(es_client, index_name) if tune else None
     try:
-        success, failed = helpers.bulk(
+        # Keep several bulk requests in flight so ES indexes while the next batches are read and sent
+        success, failed = 0, []
+        for ok, info in helpers.parallel_bulk(
             es_client,
             _read_and_chunk_from_file(filepath, index_name, id_field_in_doc, batch_size),
+            thread_count=ES_CONFIG['parallel_threads'],
             chunk_size=batch_size,
+            expand_action_callback=_prebuilt_action,
+            max_chunk_bytes=ES_CONFIG['max_chunk_bytes'],
+            queue_size=ES_CONFIG['queue_size'],
             request_timeout=timeout,
             raise_on_error=False
-        )
+        ):
+            if ok:
+                success += 1
+            else:
+                failed.append(info)
         final_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         print(f"[{final_timestamp}] Finished ingestion. Successfully ingested {success} documents into '{index_name}'.")
         if failed:
@@ -307,6 +625,9 @@ def ingest_data_to_es(es_client: Elasticsearch, filepath: str, index_name: str,
         final_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         print(
             f"[{final_timestamp}] ERROR: An exception occurred during bulk ingestion from '{filepath}' to '{index_name}': {e}")
+    finally:
+        if restore_settings is not None:
+            _restore_index_after_bulk_load(es_client, index_name, restore_settings)
 
 # --- Progress and Logging Utilities ---
 
@@ -345,19 +666,28 @@ def validate_environment() -> tuple:
     from config import validate_config
     return validate_config()
 
-def safe_get_nested_value(data: Dict[str, Any], key_path: str, default: Any = None) -> Any:
+# Dot-separated key paths already split by safe_get_nested_value
+_PATH_CACHE: Dict[str, Tuple[str, ...]] = {}
+
+def safe_get_nested_value(data: Dict[str, Any], key_path: Union[str, Tuple[str, ...]], default: Any = None) -> Any:
     """
     Safely get a nested value from a dictionary using dot notation.
     
     Args:
         data (dict): Dictionary to search
-        key_path (str): Dot-separated key path (e.g., "user.profile.name")
+        key_path (str or tuple): Dot-separated key path (e.g., "user.profile.name"),
+            or the keys already split (e.g., ("user", "profile", "name")) for hot loops
         default: Default value if key not found
         
     Returns:
         Any: Value at key path or default
     """
-    keys = key_path.split('.')
+    if isinstance(key_path, str):
+        keys = _PATH_CACHE.get(key_path)
+        if keys is None:
+            keys = _PATH_CACHE[key_path] = tuple(key_path.split('.'))
+    else:
+        keys = key_path
     current = data
     
     try:
@@ -402,6 +732,8 @@ def truncate_string(text: str, max_length: int, suffix: str = "...") -> str:
         return text
     return text[:max_length - len(suffix)] + suffix
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
 def clean_json_string(text: str) -> str:
     """
     Clean a string for safe JSON serialization.
@@ -415,8 +747,5 @@ def clean_json_string(text: str) -> str:
     if not isinstance(text, str):
         return str(text)
     
-    # Replace problematic characters
-    text = text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
-    # Remove excessive whitespace
-    text = ' '.join(text.split())
-    return text
\ No newline at end of file
+    # Collapse newlines, tabs and runs of whitespace into single spaces in one pass
+    return _WHITESPACE_RE.sub(' ', text).strip()
\ No newline at end of file
@@ -18,7 +18,12 @@ load_dotenv()
 ES_CONFIG = {
     'endpoint_url': os.getenv("ES_ENDPOINT_URL", "https://localhost:9200"),
     'api_key': os.getenv("ES_API_KEY"),
-    'bulk_batch_size': 100,
+    'bulk_batch_size': 1000,  # Docs per bulk request, still capped by max_chunk_bytes
+    'parallel_threads': 8,  # Concurrent bulk requests during ingestion
+    'max_chunk_bytes': 10 * 1024 * 1024,  # Upper bound on a single bulk request body
+    'queue_size': 4,  # Batches read ahead per ingestion
+    'tune_for_bulk_load': True,  # Pause refresh and replicas while ingesting, then force merge
+    'tune_min_docs': 10000,  # Smaller files are ingested without tuning the index
     'request_timeout': 60,
     'verify_certs': False,
     
@@ -38,7 +43,13 @@ GEMINI_CONFIG = {
     'model_name': 'gemini-2.5-pro',
     'request_delay_seconds': 0.5,
     'max_retries': 3,
+    'max_concurrency': 8,  # In-flight requests when generating content in batches
+    'rate_limit_retries': 6,  # Extra attempts for 429 responses, on top of max_retries
+    'rate_limit_backoff_seconds': 2.0,  # First 429 backoff; doubles on each further 429
+    'rate_limit_max_backoff_seconds': 60.0,
     'response_mime_type': "application/json",
+    'cache_enabled': True,  # Reuse parsed responses for repeated prompts across runs
+    'cache_dir': ".gemini_cache",
     'safety_settings': {
         'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
         'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
@@ -100,53 +111,54 @@ GENERATION_SETTINGS = {
 }
 
 # --- Account Generation Constants ---
+# Lookup pools are tuples: fixed for the run and drawn from in bulk
 ACCOUNT_SETTINGS = {
-    'types': ['Growth', 'Conservative', 'Income-Focused', 'Balanced', 'Aggressive Growth', 'Retirement'],
-    'risk_profiles': ['High', 'Medium', 'Low', 'Very Low'],
-    'contact_preferences': ['email', 'app_notification', 'none'],
-    'us_states': [
+    'types': ('Growth', 'Conservative', 'Income-Focused', 'Balanced', 'Aggressive Growth', 'Retirement'),
+    'risk_profiles': ('High', 'Medium', 'Low', 'Very Low'),
+    'contact_preferences': ('email', 'app_notification', 'none'),
+    'us_states': (
         "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
         "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
         "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
         "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
         "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY"
-    ]
+    )
 }
 
 # --- Content Generation Constants ---
 CONTENT_SETTINGS = {
-    'sentiment_options': ["positive", "negative", "neutral", "mixed"],
+    'sentiment_options': ("positive", "negative", "neutral", "mixed"),
     
-    'news_event_themes': [
+    'news_event_themes': (
         "strong earnings", "new product launch", "regulatory challenge", "economic slowdown",
         "acquisition rumor", "patent dispute", "CEO change", "supply chain disruption",
         "dividend increase", "stock split announcement", "cybersecurity breach", "environmental lawsuit"
-    ],
+    ),
     
-    'general_market_events': [
+    'general_market_events': (
         "inflation data release", "central bank interest rate decision", "global supply chain disruption",
         "energy prices fluctuation", "consumer spending trends", "employment report surprising figures",
         "geopolitical tensions impacting trade", "housing market slowdown", "manufacturing PMI growth"
-    ],
+    ),
     
-    'report_types': [
+    'report_types': (
         "Q1 Earnings Summary", "Q2 Earnings Summary", "Q3 Earnings Summary", "Q4 Earnings Summary",
         "Annual Analyst Report", "Regulatory Filing Update", "Sustainability Report Summary"
-    ],
+    ),
     
-    'report_focus_themes': [
+    'report_focus_themes': (
         "revenue growth", "new product pipeline", "compliance challenges", "market share shifts",
         "sustainability efforts", "cost-cutting measures", "research & development breakthroughs",
         "debt restructuring", "merger and acquisition impact", "divestiture plans"
-    ],
+    ),
     
-    'theme_industries': [
+    'theme_industries': (
         "impact of AI on enterprise software", "future of renewable energy investment",
         "global supply chain resilience", "consumer spending habits in inflationary environment",
         "rise of fintech innovation", "challenges in global semiconductor production",
         "evolution of healthcare technology", "urban development and real estate trends",
         "future of remote work and its economic impact"
-    ]
+    )
 }
 
 # --- Bad Event Configuration (for trigger script) ---
@@ -176,7 +188,7 @@ PRICE_SETTINGS = {
 HOLDINGS_SETTINGS = {
     'stock_quantity_range': (5, 200),
     'etf_quantity_range': (1, 50),
-    'bond_face_values': [1000, 5000, 10000, 25000, 50000],
+    'bond_face_values': (1000, 5000, 10000, 25000, 50000),
     'high_value_threshold': 75000,  # Threshold for marking holdings as high value
     'purchase_date_range_years': 10,  # How far back purchases can go
     'purchase_date_buffer_days': 30   # No purchases in last N days
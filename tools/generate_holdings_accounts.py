@@ -18,9 +18,9 @@ from symbols_config import (
     ALL_ASSET_INFO, get_asset_info
 )
 from common_utils import (
-    create_elasticsearch_client, ingest_data_to_es, clear_file_if_exists,
-    generate_random_datetime, get_random_price, get_current_timestamp,
-    log_with_timestamp, create_progress_bar
+    create_elasticsearch_client, close_elasticsearch_client, ingest_data_to_es, clear_file_if_exists,
+    generate_random_datetimes, get_random_price, get_random_prices, get_current_timestamp,
+    log_with_timestamp, create_progress_bar, batch_choice
 )
 from symbol_manager import SymbolManager
 
@@ -92,6 +92,13 @@ def generate_financial_data(output_accounts_filepath: str, output_holdings_filep
          open(output_holdings_filepath, 'a') as holdings_f, \
          open(output_asset_details_filepath, 'a') as assets_f:
 
+        # Draw account attributes column by column up front instead of field by field per account
+        states = batch_choice(US_STATES, num_accounts)
+        account_types = batch_choice(ACCOUNT_TYPES, num_accounts)
+        risk_profiles = batch_choice(RISK_PROFILES, num_accounts)
+        contact_prefs = batch_choice(CONTACT_PREFS, num_accounts)
+        holdings_counts = batch_choice(range(min_holdings_per_account, max_holdings_per_account + 1), num_accounts)
+
         for i in create_progress_bar(range(num_accounts), "Generating Accounts & Holdings"):
             account_id = f"ACC{i:05d}-{uuid.uuid4().hex[:4]}"  # More unique ID
 
@@ -104,21 +111,26 @@ def generate_financial_data(output_accounts_filepath: str, output_holdings_filep
                 'first_name': first_name,
                 'last_name': last_name,
                 'account_holder_name': f"{first_name} {last_name}",  # For convenience
-                'state': random.choice(US_STATES),
+                'state': states[i],
                 'zip_code': fake.postcode(),
-                'account_type': random.choice(ACCOUNT_TYPES),
-                'risk_profile': random.choice(RISK_PROFILES),
-                'contact_preference': random.choice(CONTACT_PREFS),
+                'account_type': account_types[i],
+                'risk_profile': risk_profiles[i],
+                'contact_preference': contact_prefs[i],
                 'total_portfolio_value': 0.0,  # Will be updated after holdings are added
                 'last_updated': get_current_timestamp()
             }
 
             current_account_holdings_value = 0.0
-            num_holdings = random.randint(min_holdings_per_account, max_holdings_per_account)
+            num_holdings = holdings_counts[i]
+
+            # Draw instrument types, purchase prices and purchase dates for all holdings up front
+            instrument_types = batch_choice(('Stock', 'ETF', 'Bond'), num_holdings)
+            purchase_prices = get_random_prices(instrument_types)  # Purchase price is unique to holding
+            purchase_dates = generate_random_datetimes(start_purchase_date_range, end_purchase_date_range, num_holdings)
 
             for j in range(num_holdings):
                 holding_id = f"{account_id}-H{j:02d}-{uuid.uuid4().hex[:4]}"
-                instrument_type = random.choice(['Stock', 'ETF', 'Bond'])  # Randomly choose instrument type
+                instrument_type = instrument_types[j]
 
                 symbol = None
                 asset_name = ""
@@ -196,9 +208,8 @@ def generate_financial_data(output_accounts_filepath: str, output_holdings_filep
                 else:  # Bond
                     quantity = random.choice(HOLDINGS_SETTINGS['bond_face_values'])
 
-                purchase_price = get_random_price(instrument_type)  # Purchase price is unique to holding
-                purchase_date = generate_random_datetime(start_purchase_date_range,
-                                                         end_purchase_date_range)  # Datetime now
+                purchase_price = purchase_prices[j]
+                purchase_date = purchase_dates[j]
 
                 # Use the current price from asset_details_map for calculating total value
                 asset_current_price_value = asset_details_map[symbol]['current_price']['price']
@@ -296,4 +307,5 @@ if __name__ == "__main__":
     else:
         print("Skipping asset details ingestion as DO_INGEST_ASSET_DETAILS is False.")
 
+    close_elasticsearch_client()
     print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] All data generation and ingestion processes completed.")
\ No newline at end of file
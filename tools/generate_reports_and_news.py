@@ -2,7 +2,6 @@ import random
 from datetime import datetime, timedelta
 import uuid
 import json
-import time
 import os
 import sys
 
@@ -12,15 +11,15 @@ from tqdm import tqdm
 # Local imports
 from config import (
     ES_CONFIG, FILE_PATHS, GENERATION_SETTINGS, CONTENT_SETTINGS,
-    FIELD_NAMES, GEMINI_CONFIG, validate_config
+    FIELD_NAMES, validate_config
 )
 from symbols_config import (
     STOCK_SYMBOLS_AND_INFO, ETF_SYMBOLS_AND_INFO, get_asset_info, ALL_ASSET_SYMBOLS
 )
 from common_utils import (
-    configure_gemini, call_gemini_api, load_prompt_template,
-    create_elasticsearch_client, ingest_data_to_es, clear_file_if_exists,
-    log_with_timestamp, create_progress_bar, get_current_timestamp
+    configure_gemini, call_gemini_api_concurrently, load_prompt_template,
+    create_elasticsearch_client, close_elasticsearch_client, ingest_data_to_es, clear_file_if_exists,
+    log_with_timestamp, get_current_timestamp
 )
 from symbol_manager import SymbolManager
 
@@ -83,7 +82,9 @@ def generate_news_articles(num_specific: int, num_general: int, output_filepath:
             min(NUM_SPECIFIC_ASSETS_FOR_NEWS, len(available_symbols))
         )
 
-        for symbol in create_progress_bar(specific_assets_to_cover, "Specific News"):
+        # Build every prompt first, then generate them concurrently
+        jobs = []
+        for symbol in specific_assets_to_cover:
             current_datetime_str = get_current_timestamp()
             asset_info = get_asset_info(symbol)
             
@@ -98,9 +99,10 @@ def generate_news_articles(num_specific: int, num_general: int, output_filepath:
                 EVENT_THEME=random.choice(NEWS_EVENT_THEMES),
                 CURRENT_DATETIME_STRING=current_datetime_str
             )
-            generated_data = call_gemini_api(prompt, gemini_model)
-            time.sleep(GEMINI_CONFIG['request_delay_seconds'])
+            jobs.append((symbol, asset_info, current_datetime_str, prompt))
 
+        results = call_gemini_api_concurrently([job[-1] for job in jobs], gemini_model, "Specific News")
+        for (symbol, asset_info, current_datetime_str, _), generated_data in zip(jobs, results):
             if generated_data:
                 article = {
                     'article_id': str(uuid.uuid4()),
@@ -121,16 +123,18 @@ def generate_news_articles(num_specific: int, num_general: int, output_filepath:
 
         # Generate general market news
         print("Generating general market news articles...")
-        for i in create_progress_bar(range(num_general), "General News"):
+        jobs = []
+        for i in range(num_general):
             current_datetime_str = get_current_timestamp()
             prompt = general_news_template.format(
                 SENTIMENT=random.choice(SENTIMENT_OPTIONS),
                 MARKET_EVENT=random.choice(GENERAL_MARKET_EVENTS),
                 CURRENT_DATETIME_STRING=current_datetime_str
             )
-            generated_data = call_gemini_api(prompt, gemini_model)
-            time.sleep(GEMINI_CONFIG['request_delay_seconds'])
+            jobs.append((current_datetime_str, prompt))
 
+        results = call_gemini_api_concurrently([job[-1] for job in jobs], gemini_model, "General News")
+        for (current_datetime_str, _), generated_data in zip(jobs, results):
             if generated_data:
                 article = {
                     'article_id': str(uuid.uuid4()),
@@ -174,7 +178,9 @@ def generate_reports(num_specific: int, num_thematic: int, output_filepath: str)
             min(NUM_SPECIFIC_ASSETS_FOR_REPORTS, len(available_symbols))
         )
 
-        for symbol in create_progress_bar(specific_assets_to_cover, "Specific Reports"):
+        # Build every prompt first, then generate them concurrently
+        jobs = []
+        for symbol in specific_assets_to_cover:
             current_datetime_str = get_current_timestamp()
             asset_info = get_asset_info(symbol)
             
@@ -190,9 +196,10 @@ def generate_reports(num_specific: int, num_thematic: int, output_filepath: str)
                 SENTIMENT=random.choice(SENTIMENT_OPTIONS),
                 CURRENT_DATETIME_STRING=current_datetime_str
             )
-            generated_data = call_gemini_api(prompt, gemini_model)
-            time.sleep(GEMINI_CONFIG['request_delay_seconds'])
+            jobs.append((symbol, asset_info, current_datetime_str, prompt))
 
+        results = call_gemini_api_concurrently([job[-1] for job in jobs], gemini_model, "Specific Reports")
+        for (symbol, asset_info, current_datetime_str, _), generated_data in zip(jobs, results):
             if generated_data:
                 report = {
                     'report_id': str(uuid.uuid4()),
@@ -213,7 +220,8 @@ def generate_reports(num_specific: int, num_thematic: int, output_filepath: str)
 
         # Generate thematic reports
         print("Generating thematic industry reports...")
-        for i in create_progress_bar(range(num_thematic), "Thematic Reports"):
+        jobs = []
+        for i in range(num_thematic):
             current_datetime_str = get_current_timestamp()
             prompt = thematic_report_template.format(
                 THEME_INDUSTRY=random.choice(THEME_INDUSTRIES),
@@ -221,9 +229,10 @@ def generate_reports(num_specific: int, num_thematic: int, output_filepath: str)
                 FOCUS_THEME=random.choice(REPORT_FOCUS_THEMES),
                 CURRENT_DATETIME_STRING=current_datetime_str
             )
-            generated_data = call_gemini_api(prompt, gemini_model)
-            time.sleep(GEMINI_CONFIG['request_delay_seconds'])
+            jobs.append((current_datetime_str, prompt))
 
+        results = call_gemini_api_concurrently([job[-1] for job in jobs], gemini_model, "Thematic Reports")
+        for (current_datetime_str, _), generated_data in zip(jobs, results):
             if generated_data:
                 report = {
                     'report_id': str(uuid.uuid4()),
@@ -325,4 +334,5 @@ if __name__ == "__main__":
     else:
         print("Skipping reports ingestion as DO_INGEST_REPORTS is False.")
 
+    close_elasticsearch_client()
     log_with_timestamp("All news and reports generation and ingestion processes completed.")
\ No newline at end of file
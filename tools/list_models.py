@@ -1,21 +1,30 @@
 import google.generativeai as genai
 import os
 
-# Configure your API key
-# Ensure your GEMINI_API_KEY environment variable is set
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not GEMINI_API_KEY:
-    print("ERROR: GEMINI_API_KEY environment variable not set. Please set it to your Gemini API key.")
-    exit(1)
+def main():
+    # Configure your API key
+    # Ensure your GEMINI_API_KEY environment variable is set
+    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-genai.configure(api_key=GEMINI_API_KEY)
+    if not GEMINI_API_KEY:
+        print("ERROR: GEMINI_API_KEY environment variable not set. Please set it to your Gemini API key.")
+        exit(1)
 
-print("Listing available Gemini models that support 'generateContent':")
-for m in genai.list_models():
-    if "generateContent" in m.supported_generation_methods:
-        print(f"- {m.name} (Description: {m.description})")
+    genai.configure(api_key=GEMINI_API_KEY)
 
-print("\nListing ALL available Gemini models (including those not for generateContent):")
-for m in genai.list_models():
-    print(f"- {m.name} (Description: {m.description if hasattr(m, 'description') else 'No description'})")
\ No newline at end of file
+    # Fetch the model list once for both listings
+    models = list(genai.list_models())
+
+    print("Listing available Gemini models that support 'generateContent':")
+    for m in models:
+        if "generateContent" in m.supported_generation_methods:
+            print(f"- {m.name} (Description: {m.description})")
+
+    print("\nListing ALL available Gemini models (including those not for generateContent):")
+    for m in models:
+        print(f"- {m.name} (Description: {m.description if hasattr(m, 'description') else 'No description'})")
+
+
+if __name__ == "__main__":
+    main()
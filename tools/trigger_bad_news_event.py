@@ -19,7 +19,7 @@ from symbols_config import (
 )
 from common_utils import (
     configure_gemini, call_gemini_api, load_prompt_template,
-    create_elasticsearch_client, ingest_data_to_es, clear_file_if_exists,
+    create_elasticsearch_client, close_elasticsearch_client, ingest_data_to_es, clear_file_if_exists,
     log_with_timestamp, create_progress_bar, get_current_timestamp
 )
 from symbol_manager import SymbolManager
@@ -397,16 +397,17 @@ if __name__ == "__main__":
     # 6. Ingest Data into Elasticsearch (if enabled)
     if DO_INGEST_NEWS:
         log_with_timestamp("--- Ingesting Controlled News Articles ---")
-        ingest_data_to_es(es_client, GENERATED_NEWS_FILE, NEWS_INDEX, "article_id")
+        ingest_data_to_es(es_client, GENERATED_NEWS_FILE, NEWS_INDEX, "article_id", tune=False)
     else:
         print("Skipping controlled news ingestion as DO_INGEST_NEWS is False.")
 
     if DO_INGEST_REPORTS:
         log_with_timestamp("--- Ingesting Controlled Reports ---")
-        ingest_data_to_es(es_client, GENERATED_REPORTS_FILE, REPORTS_INDEX, "report_id")
+        ingest_data_to_es(es_client, GENERATED_REPORTS_FILE, REPORTS_INDEX, "report_id", tune=False)
     else:
         print("Skipping controlled reports ingestion as DO_INGEST_REPORTS is False.")
 
+    close_elasticsearch_client()
     log_with_timestamp("All controlled bad news event generation and ingestion processes completed.")
     print(f"\\n🎯 Demo Event Summary:")
     print(f"   📰 Bad News: {BAD_EVENT_TARGET_NEWS_SYMBOL} - {BAD_EVENT_NEWS_THEME}")